@@ -20,7 +20,7 @@ a = Analysis(
         'PIL',
         'natsort',
         'zhconv',
-        'thefuzz',
+        'rapidfuzz',
         'packaging',
     ],
     hookspath=[],
@@ -0,0 +1,162 @@
+"""
+Benchmark: adaptive request rate against a local throttling mock server.
+
+Starts a threaded HTTP server that enforces its own token-bucket limit
+and answers 429 with a Retry-After header when the client goes too fast.
+Several client threads then issue requests through BangumiScraper's
+normal request path, and the script reports how the shared scheduler's
+rate converges, how many 429s it took to get there, and whether every
+Retry-After pause was honored.
+
+Usage:
+    python benchmarks/bench_adaptive_rate.py [--server-rate 20] [--start-rate 5]
+                                             [--requests 400] [--threads 8]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from core.rate_scheduler import request_scheduler
+from core.scraper import BangumiScraper
+
+
+class ThrottlingServer(ThreadingHTTPServer):
+    """Mock API: allows `rate` requests/second, then 429 + Retry-After."""
+
+    daemon_threads = True
+
+    def __init__(self, rate, retry_after):
+        super().__init__(("127.0.0.1", 0), ThrottlingHandler)
+        self.rate = rate
+        self.retry_after = retry_after
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+        self.ok = 0
+        self.throttled = 0
+        self.violations = 0  # Requests that arrived during a Retry-After pause
+
+    def admit(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if now < self.blocked_until:
+                self.violations += 1
+                self.throttled += 1
+                return False
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.ok += 1
+                return True
+            self.throttled += 1
+            self.blocked_until = now + self.retry_after
+            return False
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.server.admit():
+            body = b'{"id": 1}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_response(429)
+            self.send_header("Retry-After", str(self.server.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--server-rate", type=float, default=20, help="Requests/second the mock server allows")
+    parser.add_argument("--start-rate", type=float, default=5, help="Client starting rate (requests/second)")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+
+    # Faster additive increase than production so the run stays short
+    Config.RATE_ADAPT_INCREASE = 60
+    Config.RATE_ADAPT_DECREASE_COOLDOWN = 1
+    # Let the ceiling sit well above the server limit so throttling is exercised
+    Config.RATE_ADAPT_MAX_FACTOR = max(Config.RATE_ADAPT_MAX_FACTOR, 3 * args.server_rate / args.start_rate)
+    request_scheduler.configure(max_requests=args.start_rate * 60, window_seconds=60, burst=1)
+
+    server = ThrottlingServer(args.server_rate, args.retry_after)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v0/subjects/1"
+
+    scraper = BangumiScraper(read_timeout=5)
+    remaining = [args.requests]
+    failures = [0]
+    lock = threading.Lock()
+    samples = []
+
+    def worker():
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            try:
+                ok = scraper._request_with_retry('get', url, max_retries=10) is not None
+            except Exception:
+                ok = False
+            if not ok:
+                with lock:
+                    failures[0] += 1
+
+    def sampler(stop):
+        while not stop.is_set():
+            samples.append((time.perf_counter() - start, request_scheduler.rate))
+            time.sleep(0.5)
+
+    stop = threading.Event()
+    start = time.perf_counter()
+    threading.Thread(target=sampler, args=(stop,), daemon=True).start()
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    server.shutdown()
+
+    print(f"Server limit:      {args.server_rate:.1f} req/s")
+    print(f"Client start rate: {args.start_rate:.1f} req/s")
+    print(f"Completed:         {server.ok} ok, {server.throttled} throttled, {failures[0]} failed")
+    print(f"Throughput:        {server.ok / elapsed:.1f} req/s over {elapsed:.1f}s")
+    print(f"Final rate:        {request_scheduler.rate:.1f} req/s")
+    print(f"Retry-After violations: {server.violations}")
+    print("Rate over time (s: req/s):")
+    for t, rate in samples[::max(1, len(samples) // 12)]:
+        print(f"  {t:5.1f}: {rate:5.1f}")
+
+    checks = [
+        ("all requests succeeded", failures[0] == 0),
+        ("no requests sent during Retry-After", server.violations == 0),
+        ("throughput above starting rate", server.ok / elapsed > args.start_rate),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return 0 if all(ok for _, ok in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Benchmark: preparing a series' scraped covers before embedding.
+
+Generates --volumes distinct Bangumi-'large'-sized PNG covers (noisy
+gradients, so they compress like scans rather than flat fills) and runs
+them through CoverPolicy one after another, then through CoverPreparer's
+worker pool as the apply step does. Reports time for both and the bytes
+that would be embedded before and after the policy.
+
+Usage:
+    python benchmarks/bench_cover_policy.py [--volumes 12] [--size 2400x3400] [--workers 4]
+"""
+
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from core.cover_policy import CoverPolicy, CoverPreparer
+
+
+class FakeFile:
+    """Stands in for ComicFile: no embedded cover, records what would be set."""
+
+    def __init__(self):
+        self.cover = None
+
+    def get_embedded_cover_size(self):
+        return None
+
+    def set_custom_cover(self, data):
+        self.cover = data
+
+
+def make_cover(size, seed):
+    gradient = Image.linear_gradient("L").resize(size)
+    noise = Image.effect_noise(size, 40 + seed % 20)
+    image = Image.merge("RGB", (gradient, noise, gradient.rotate(180)))
+    output = BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--volumes", type=int, default=12)
+    parser.add_argument("--size", default="2400x3400", help="source cover size, WIDTHxHEIGHT")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.lower().split("x"))
+    covers = [make_cover(size, i) for i in range(args.volumes)]
+    policy = CoverPolicy()
+    source_bytes = sum(len(c) for c in covers)
+
+    start = time.perf_counter()
+    prepared = [policy.prepare(c) for c in covers]
+    serial = time.perf_counter() - start
+    prepared_bytes = sum(len(p.data) for p in prepared)
+
+    files = [FakeFile() for _ in covers]
+    start = time.perf_counter()
+    preparer = CoverPreparer(policy, workers=args.workers)
+    for file_obj, cover in zip(files, covers):
+        preparer.add(file_obj, cover)
+    applied, _ = preparer.apply()
+    pooled = time.perf_counter() - start
+
+    print(f"{args.volumes} covers at {size[0]}x{size[1]}, policy "
+          f"{policy.max_width}x{policy.max_height} {policy.image_format} q{policy.quality}")
+    print(f"serial:  {serial:.2f}s")
+    print(f"pooled:  {pooled:.2f}s ({args.workers} workers)")
+    print(f"embedded bytes: {source_bytes / 1e6:.1f} MB -> {prepared_bytes / 1e6:.1f} MB")
+
+    checks = [
+        ("every cover within the size limit", all(policy.fits(p.size) for p in prepared)),
+        ("every cover set", applied == len(covers) and all(f.cover for f in files)),
+        ("embedded bytes at least halved", prepared_bytes * 2 <= source_bytes),
+    ]
+    if (os.cpu_count() or 1) > 1:
+        checks.append(("pool faster than serial", pooled < serial))
+    else:
+        # Nothing to overlap on one core; the pool just mustn't cost much
+        checks.append(("pool overhead under 15% (single core)", pooled < serial * 1.15))
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return 0 if all(ok for _, ok in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Benchmark: rule-table infobox mapping vs the previous hand-written mapper.
+
+Maps Bangumi subject payloads recorded in the HTTP response cache (the
+'subject' entries of the cache file next to settings.json, or --cache) with
+the previous bangumi_to_comicinfo and with the compiled rules, checks that
+both produce the same fields and reports the time per subject. Without a
+cache, a built-in set of payloads in the API's shape is used instead.
+
+Usage:
+    python benchmarks/bench_metadata_mapping.py [--cache http_cache.db] [--rounds 2000]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from core.metadata import MetadataMapper
+from core.settings_manager import settings_manager
+
+SAMPLE_SUBJECTS = [
+    {"id": 1001, "name": "ONE PIECE", "name_cn": "海贼王", "date": "1997-12-24", "platform": "漫画",
+     "summary": "海贼王哥尔·D·罗杰在临死前留下了一句话……",
+     "infobox": [
+         {"key": "中文名", "value": "海贼王"},
+         {"key": "别名", "value": [{"v": "航海王"}, {"v": "ワンピース"}]},
+         {"key": "作者", "value": "尾田栄一郎"},
+         {"key": "出版社", "value": [{"v": "集英社"}, {"v": "浙江人民美术出版社"}]},
+         {"key": "连载杂志", "value": "週刊少年ジャンプ"},
+         {"key": "开始", "value": "1997-07-22"},
+         {"key": "册数", "value": "107"},
+     ],
+     "rating": {"score": 8.6, "total": 9000},
+     "tags": [{"name": "热血", "count": 1200}, {"name": "冒险", "count": 900}, {"name": "x", "count": 1}]},
+    {"id": 1002, "name": "ONE PIECE 1", "name_cn": "", "date": "1997-12-24", "platform": "漫画",
+     "summary": "",
+     "infobox": [
+         {"key": "作者", "value": "尾田栄一郎"},
+         {"key": "出版社", "value": "集英社"},
+         {"key": "ISBN", "value": "4088725093"},
+         {"key": "页数", "value": "208"},
+         {"key": "价格", "value": "¥410"},
+     ],
+     "rating": {"score": 0},
+     "tags": [{"name": "漫画", "count": 3}]},
+    {"id": 1003, "name": "進撃の巨人", "name_cn": "进击的巨人", "date": "2010-03-17", "platform": "漫画",
+     "summary": "",
+     "infobox": [
+         {"key": "作者", "value": "諫山創"},
+         {"key": "出版社", "value": [{"v": "講談社"}]},
+         {"key": "连载杂志", "value": [{"v": "別冊少年マガジン"}]},
+         {"key": "开始", "value": "2009-09-09"},
+         {"key": "结束", "value": "2021-04-09"},
+         {"key": "册数", "value": "34"},
+     ],
+     "rating": {"score": 8.4},
+     "tags": [{"name": "黑暗", "count": 800}, {"name": "巨人", "count": 400}]},
+    {"id": 1004, "name": "某打ち切り作品", "name_cn": "", "date": "2015-1-5", "platform": "小说",
+     "summary": "",
+     "infobox": [
+         {"key": "作者", "value": [{"v": "作者A"}, {"v": "作者B"}]},
+         {"key": "插图", "value": "画师"},
+         {"key": "文库", "value": "电击文库"},
+         {"key": "ISBN-13", "value": "978-4-04-000000-0 "},
+         {"key": "打ち切り", "value": "2016"},
+     ],
+     "rating": None,
+     "tags": []},
+]
+
+
+def legacy_bangumi_to_comicinfo(data):
+    """MetadataMapper.bangumi_to_comicinfo as it was before the rules table."""
+    if not data or not isinstance(data, dict):
+        return {}
+    info = {}
+    info["Series"] = data.get("name_cn") or data.get("name") or ""
+    info["Title"] = info["Series"]
+    info["Summary"] = data.get("summary") or ""
+    subject_id = data.get('id')
+    info["Web"] = f"https://bgm.tv/subject/{subject_id}" if subject_id else ""
+    if data.get("date"):
+        try:
+            parts = data["date"].split("-")
+            if len(parts) >= 1: info["Year"] = int(parts[0])
+            if len(parts) >= 2: info["Month"] = int(parts[1])
+            if len(parts) >= 3: info["Day"] = int(parts[2])
+        except (ValueError, IndexError, TypeError):
+            pass
+
+    infobox = data.get("infobox", [])
+    magazines = []
+    if infobox:
+        for item in infobox:
+            key = item.get("key")
+            val = item.get("value")
+
+            def get_val_str(v):
+                if isinstance(v, list):
+                    if v and isinstance(v[0], dict):
+                        return ",".join([x.get("v", "") for x in v])
+                    return ",".join([str(x) for x in v])
+                return str(v)
+
+            if key == "作者":
+                info["Writer"] = get_val_str(val)
+            elif key == "出版社":
+                if isinstance(val, list) and val:
+                    if isinstance(val[0], dict):
+                        info["Publisher"] = val[0].get("v") or ""
+                    else:
+                        info["Publisher"] = str(val[0]) if val[0] else ""
+                elif val:
+                    info["Publisher"] = str(val)
+            elif "ISBN" in key.upper():
+                info["ISBN"] = get_val_str(val).strip()
+            elif key == "连载杂志":
+                if isinstance(val, list):
+                    if val and isinstance(val[0], dict):
+                        magazines.extend([x.get("v", "") for x in val])
+                    else:
+                        magazines.extend([str(x) for x in val])
+                else:
+                    magazines.append(str(val))
+            if key in ["放送开始", "连载开始"]:
+                pass
+            if key in ["结束", "连载结束", "完结"]:
+                pass
+
+    status = "Ongoing"
+    running_keys = ["放送", "放送（連載）中", "连载"]
+    abandoned_keys = ["打ち切り"]
+    ended_keys = ["完結", "结束", "连载结束"]
+    for item in infobox:
+        key = item.get("key")
+        if key in running_keys:
+            status = "Ongoing"
+        elif key in abandoned_keys:
+            status = "Abandoned"
+            break
+        elif key in ended_keys:
+            status = "Ended"
+            break
+    info["Status"] = status
+    info["Genre"] = ",".join(magazines) if magazines else ""
+
+    platform = data.get("platform")
+    if platform:
+        if platform == "漫画":
+            info["Format"] = "Comic"
+        elif platform == "小说":
+            info["Format"] = "Novel"
+        elif platform == "画集":
+            info["Format"] = "Artbook"
+        else:
+            info["Format"] = platform
+
+    rating = data.get("rating")
+    if rating and isinstance(rating, dict):
+        score = rating.get("score", 0)
+        if score and score > 0:
+            info["CommunityRating"] = score
+
+    tags = data.get("tags", [])
+    info["Tags"] = ",".join(t.get("name", "") for t in tags if t.get("count", 0) >= 3)
+    info["Manga"] = "YesAndRightToLeft"
+    return info
+
+
+def load_recorded(path):
+    """Subject payloads stored in an HTTP cache file."""
+    if not path or not os.path.exists(path):
+        return []
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("SELECT body FROM entries WHERE endpoint = 'subject'").fetchall()
+    finally:
+        conn.close()
+    subjects = []
+    for (body,) in rows:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            continue
+        if isinstance(data, dict) and "infobox" in data:
+            subjects.append(data)
+    return subjects
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cache", default=os.path.join(os.path.dirname(settings_manager.filename),
+                                                        Config.HTTP_CACHE_FILE))
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    subjects = load_recorded(args.cache)
+    source = f"{len(subjects)} recorded subjects from {args.cache}"
+    if not subjects:
+        subjects = SAMPLE_SUBJECTS
+        source = f"{len(subjects)} built-in sample subjects (no recorded cache found)"
+    print(source)
+
+    batch = subjects * max(1, args.rounds // len(subjects))
+    MetadataMapper.compiled_rules()
+
+    start = time.perf_counter()
+    legacy = [legacy_bangumi_to_comicinfo(s) for s in batch]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single = [MetadataMapper.bangumi_to_comicinfo(s) for s in batch]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    many = MetadataMapper.bangumi_to_comicinfo_many(batch)
+    many_time = time.perf_counter() - start
+
+    n = len(batch)
+    print(f"Previous mapper:     {legacy_time / n * 1e6:7.1f} us/subject")
+    print(f"Rules, one by one:   {single_time / n * 1e6:7.1f} us/subject  ({legacy_time / single_time:.2f}x)")
+    print(f"Rules, batch:        {many_time / n * 1e6:7.1f} us/subject  ({legacy_time / many_time:.2f}x)")
+
+    mismatches = [(s.get("id"), a, b) for s, a, b in zip(subjects, legacy, single) if a != b]
+    for sid, a, b in mismatches[:3]:
+        diff = {k: (a.get(k), b.get(k)) for k in set(a) | set(b) if a.get(k) != b.get(k)}
+        print(f"  subject {sid} differs: {diff}")
+
+    checks = [
+        ("same fields as the previous mapper", not mismatches),
+        ("batch API matches single mapping", many == single),
+        ("rules mapper not slower", many_time <= legacy_time * 1.1),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return 0 if all(ok for _, ok in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Benchmark: standard zipfile access vs. the NAS-optimized reader.
+
+Simulates a high-latency network share by wrapping a local file in a raw
+I/O object that sleeps for a fixed latency on every read/seek syscall,
+then compares a metadata load, a cover read and a full repack read pass.
+
+Usage:
+    python benchmarks/bench_nas_io.py [--latency-ms 2] [--pages 200]
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.archive_io import TailCachedReader
+
+
+class SlowRawFile(io.RawIOBase):
+    """Raw file that pays `latency` seconds for every read and seek, like SMB/NFS."""
+
+    def __init__(self, path, latency):
+        super().__init__()
+        self._f = open(path, 'rb', buffering=0)
+        self.latency = latency
+        self.calls = 0
+
+    def _cost(self):
+        self.calls += 1
+        time.sleep(self.latency)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        self._cost()
+        return self._f.readinto(b)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._cost()
+        return self._f.seek(offset, whence)
+
+    def tell(self):
+        return self._f.tell()
+
+    def close(self):
+        self._f.close()
+        super().close()
+
+
+def build_archive(path, pages, page_size):
+    """Create a synthetic comic archive with random page data and a ComicInfo.xml."""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as zf:
+        for i in range(pages):
+            zf.writestr(f"page_{i:04d}.jpg", os.urandom(page_size))
+        zf.writestr("ComicInfo.xml", "<ComicInfo><Series>Bench</Series></ComicInfo>")
+
+
+def workload(zf):
+    """Same access pattern as ComicFile.load + cover read + repack read pass."""
+    names = [info.filename for info in zf.infolist()]
+    zf.read("ComicInfo.xml")
+    zf.read(sorted(n for n in names if n.endswith(".jpg"))[0])
+    for name in names:
+        zf.read(name)
+
+
+def run(label, make_stream):
+    start = time.perf_counter()
+    raw, stream = make_stream()
+    with zipfile.ZipFile(stream, 'r') as zf:
+        workload(zf)
+    stream.close()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed:8.3f}s  {raw.calls:6d} raw calls")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-kb", type=int, default=300)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.cbz")
+        build_archive(path, args.pages, args.page_kb * 1024)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"Archive: {args.pages} pages, {size_mb:.1f} MB, {args.latency_ms} ms per raw call")
+
+        def standard():
+            raw = SlowRawFile(path, latency)
+            return raw, io.BufferedReader(raw, io.DEFAULT_BUFFER_SIZE)
+
+        def nas():
+            raw = SlowRawFile(path, latency)
+            return raw, TailCachedReader(raw)
+
+        base = run("standard", standard)
+        fast = run("nas", nas)
+        print(f"Speedup: {base / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: filename number extraction over a large synthetic library.
+
+Generates realistic comic filenames (scanlation tags, release years,
+CJK volume markers, roman numerals, full-width digits, decimals) with a
+known volume number, then compares the previous regex-per-call
+get_number with the precompiled extract_numbers batch API on speed and
+accuracy.
+
+Usage:
+    python benchmarks/bench_number_extract.py [--files 100000]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.text_utils import extract_numbers
+
+SERIES = ["One Piece", "進撃の巨人", "海贼王", "Dr.STONE", "ハイキュー!!", "鬼灭之刃", "Berserk",
+          "Vinland Saga", "钢之炼金术师", "Spy x Family", "ブルーロック", "Chainsaw Man"]
+GROUPS = ["[Group]", "[汉化组]", "【DMZJ】", "(一般コミック)", "[Digital]"]
+CJK = "〇一二三四五六七八九"
+ROMAN = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X", "XI", "XII"]
+
+
+def cjk_number(n):
+    if n < 10:
+        return CJK[n]
+    tens, ones = divmod(n, 10)
+    return (CJK[tens] if tens > 1 else "") + "十" + (CJK[ones] if ones else "")
+
+
+def make_name(rng):
+    """(filename stem, expected number)"""
+    series = rng.choice(SERIES)
+    n = rng.randint(1, 99)
+    year = rng.randint(1995, 2024)
+    style = rng.randrange(10)
+    if style == 0:
+        return f"{series} Vol.{n:02d}", n
+    if style == 1:
+        return f"{rng.choice(GROUPS)} {series} {n:03d} [{rng.choice(['1080p', 'Digital', 'JPN'])}]", n
+    if style == 2:
+        return f"{series} 第{n}巻", n
+    if style == 3:
+        return f"{series} 卷{cjk_number(n)}", n
+    if style == 4:
+        n = rng.randint(1, 12)
+        return f"{series} Vol.{ROMAN[n - 1]}", n
+    if style == 5:
+        return f"({year}) {series} {n:02d}", n
+    if style == 6:
+        return f"{series.replace(' ', '.')}.v{n:02d}", n
+    if style == 7:
+        return f"{series} ({n})", n
+    if style == 8:
+        full = "".join(chr(ord(c) + 0xFEE0) for c in str(n))
+        return f"{series} 第{full}卷", n
+    return f"{series}_{n:02d}", n
+
+
+def legacy_get_number(s):
+    """get_number as it was before the precompiled extractor."""
+    s = s.replace("-", ".").replace("_", ".")
+    match = re.search(r"vol\.?(\d+(\.\d+)?)|chap\.?(\d+(\.\d+)?)", s, re.IGNORECASE)
+    if match:
+        if match.group(1):
+            return float(match.group(1)), "volume"
+        elif match.group(3):
+            return float(match.group(3)), "chapter"
+    matches = re.findall(r"\d+\.\d+|\d+", s)
+    if matches:
+        return float(matches[-1]), "normal"
+    return None, "none"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    samples = [make_name(rng) for _ in range(args.files)]
+    names = [name for name, _ in samples]
+    print(f"{len(names)} filenames, {len(set(names))} distinct")
+
+    start = time.perf_counter()
+    legacy = [legacy_get_number(name)[0] for name in names]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = [m.number for m in extract_numbers(names)]
+    batch_time = time.perf_counter() - start
+
+    legacy_ok = sum(1 for got, (_, want) in zip(legacy, samples) if got == want)
+    batch_ok = sum(1 for got, (_, want) in zip(batch, samples) if got == want)
+    print(f"Legacy get_number: {legacy_time:6.2f}s  ({len(names) / legacy_time:9.0f}/s)  "
+          f"accuracy {legacy_ok / len(names):6.1%}")
+    print(f"extract_numbers:   {batch_time:6.2f}s  ({len(names) / batch_time:9.0f}/s)  "
+          f"accuracy {batch_ok / len(names):6.1%}")
+
+    misses = [(name, want, got) for got, (name, want) in zip(batch, samples) if got != want]
+    for name, want, got in misses[:5]:
+        print(f"  miss: {name!r} expected {want}, got {got}")
+
+    checks = [
+        ("accuracy at least 99%", batch_ok / len(names) >= 0.99),
+        ("batch extraction faster than legacy", batch_time < legacy_time),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return 0 if all(ok for _, ok in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
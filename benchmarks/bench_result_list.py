@@ -0,0 +1,126 @@
+"""
+Benchmark: populating and scrolling the scraper's search result list.
+
+Fills a SearchResultModel/QListView pair (offscreen) with a few hundred
+Bangumi-shaped results, then scrolls through the whole list page by page
+with a repaint at each step. Cover images are served from the image
+fetcher's memory cache (as on a second search for the same series), so
+the numbers cover decoding, layout and painting but no network. Also
+checks that covers are only requested for rows that were painted.
+
+Usage:
+    python benchmarks/bench_result_list.py [--results 500]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from core.image_fetcher import image_fetcher
+from ui.search_results import SearchResultModel, create_result_view
+from ui.workers.cover_loader import CoverLoader
+
+
+def make_results(count):
+    results = []
+    for i in range(count):
+        results.append({
+            "id": 100000 + i,
+            "name": f"作品タイトル {i}",
+            "name_cn": f"作品标题 {i}" if i % 3 else "",
+            "type_label": "Series" if i % 4 == 0 else "Volume",
+            "platform": ("漫画", "小说", "画集")[i % 3],
+            "date": f"20{i % 24:02d}-0{i % 9 + 1}-1{i % 9}",
+            "images": {"common": f"https://lain.bgm.tv/bench/cover/{i}.jpg"},
+            "rating": {"score": 7.5, "total": 1200 + i, "rank": i + 1},
+            "collection": {"collect": 15000 + i},
+            "infobox": [
+                {"key": "作者", "value": f"作者{i % 17}"},
+                {"key": "出版社", "value": [{"v": "集英社"}]},
+                {"key": "卷数", "value": f"{i % 40 + 1}"},
+            ],
+            "tags": [{"name": "连载中" if i % 2 else "已完结", "count": 10}],
+        })
+    return results
+
+
+def cover_bytes():
+    image = QImage(240, 340, QImage.Format_RGB32)
+    image.fill(QColor("#3b82f6"))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "JPG", 85)
+    return bytes(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--results", type=int, default=500)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    loader = CoverLoader()
+    model = SearchResultModel(loader)
+    view = create_result_view(model)
+    view.resize(600, 700)
+    view.show()
+    app.processEvents()
+
+    results = make_results(args.results)
+    cover = cover_bytes()
+    for res in results:
+        image_fetcher._remember(res["images"]["common"], cover)
+
+    start = time.perf_counter()
+    model.set_results(results)
+    view.viewport().repaint()
+    app.processEvents()
+    populate = time.perf_counter() - start
+    print(f"populate {len(results)} results and paint the first page: {populate * 1000:.1f} ms")
+
+    first_page = sum(1 for row in model._rows if row.cover_requested)
+
+    bar = view.verticalScrollBar()
+    steps = 0
+    start = time.perf_counter()
+    while bar.value() < bar.maximum():
+        bar.setValue(bar.value() + bar.pageStep())
+        view.viewport().repaint()
+        app.processEvents()
+        steps += 1
+    scroll = time.perf_counter() - start
+    print(f"scroll to end: {scroll * 1000:.1f} ms ({steps} pages, {scroll / max(steps, 1) * 1000:.2f} ms/page)")
+    requested = sum(1 for row in model._rows if row.cover_requested)
+    loaded = sum(1 for row in model._rows if row.cover is not None)
+
+    start = time.perf_counter()
+    model.set_results(list(reversed(results)))
+    app.processEvents()
+    reorder = time.perf_counter() - start
+    print(f"reorder (rows reused): {reorder * 1000:.1f} ms")
+    print(f"covers: {first_page} requested on the first page, {requested} after scrolling, {loaded} shown")
+    loader.cancel_all()
+
+    checks = [
+        ("populate under 100 ms", populate < 0.1),
+        ("under 20 ms per scrolled page", scroll / max(steps, 1) < 0.02),
+        ("covers only requested for painted rows", 0 < first_page < len(results)),
+        ("every row's cover shown after scrolling", loaded == len(results)),
+        ("reorder under 50 ms", reorder < 0.05),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return 0 if all(ok for _, ok in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Benchmark: superseded searches and the shared request budget.
+
+Replays a user typing a series name in the scraper dialog: a new search
+starts every --interval seconds, each one a search request plus
+enrichment of the top candidates, all drawing from the global request
+scheduler (fake API with fixed latency, no network). Compares abandoning
+superseded searches with a flag only (their queued requests still go out)
+against cancelling their token (queued requests leave the scheduler), and
+reports requests sent and how long the last query takes to finish.
+
+Usage:
+    python benchmarks/bench_search_cancel.py [--keystrokes 6] [--interval 0.3] [--rate 240]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.rate_scheduler import CancelToken, RequestCancelled, request_scheduler
+from core.scraper import resort_search_list
+
+LATENCY = 0.05
+
+
+class FakeSource:
+    """API stand-in: every call takes a scheduler slot, then LATENCY seconds."""
+
+    def __init__(self):
+        self.sent = 0
+        self._lock = threading.Lock()
+
+    def _request(self):
+        request_scheduler.acquire()
+        with self._lock:
+            self.sent += 1
+        time.sleep(LATENCY)
+
+    def search(self, query):
+        self._request()
+        return [{"id": i, "name": f"{query} {i}", "name_cn": ""} for i in range(15)]
+
+    def get_subject_metadata(self, subject_id):
+        self._request()
+        return {"id": subject_id, "name": f"subject {subject_id}", "name_cn": "", "infobox": []}
+
+
+def run_search(source, query, token, use_token):
+    try:
+        with request_scheduler.cancellation(token if use_token else None):
+            results = source.search(query)
+            resort_search_list(query, results, 0, source)
+    except RequestCancelled:
+        pass
+
+
+def replay(args, use_token):
+    request_scheduler.configure(max_requests=args.rate, window_seconds=60, burst=5)
+    source = FakeSource()
+    query = "Shingeki no Kyojin"
+    threads, tokens = [], []
+    for n in range(1, args.keystrokes + 1):
+        for token in tokens:
+            token.cancel()
+        token = CancelToken()
+        tokens.append(token)
+        thread = threading.Thread(target=run_search, args=(source, query[:4 + n * 2], token, use_token))
+        thread.start()
+        threads.append(thread)
+        if n < args.keystrokes:
+            time.sleep(args.interval)
+    last_started = time.monotonic()
+    threads[-1].join()
+    last_done = time.monotonic() - last_started
+    for thread in threads:
+        thread.join()
+    return source.sent, last_done
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--keystrokes", type=int, default=6, help="searches started while typing")
+    parser.add_argument("--interval", type=float, default=0.3, help="seconds between them")
+    parser.add_argument("--rate", type=int, default=240, help="requests per minute")
+    args = parser.parse_args()
+
+    flag_sent, flag_last = replay(args, use_token=False)
+    token_sent, token_last = replay(args, use_token=True)
+    print(f"Flag only:       {flag_sent:3d} requests sent, last search done after {flag_last:.2f}s")
+    print(f"Cancelled token: {token_sent:3d} requests sent, last search done after {token_last:.2f}s")
+
+    checks = [
+        ("fewer requests sent", token_sent < flag_sent),
+        ("last search finishes sooner", token_last < flag_last),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return 0 if all(ok for _, ok in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,9 @@ class Config:
     # ==================== Cache Settings ====================
     COVER_CACHE_SIZE = 50  # Number of covers to cache in memory
     COVER_CACHE_MAX_MB = 100  # Approximate max memory for cover cache
+    ARCHIVE_POOL_SIZE = 16  # Open memory-mapped archive readers kept for reuse
+    ARCHIVE_POOL_IDLE_SECONDS = 5  # Pooled readers are closed after this long unused (open files can't be renamed on Windows)
+    ARCHIVE_POOL_RELEASE_WAIT = 10  # Seconds a save waits for in-progress reads of the same archive
     
     # ==================== Network Settings ====================
     REQUEST_CONNECT_TIMEOUT = 10  # seconds
@@ -20,6 +23,34 @@ class Config:
     REQUEST_RETRIES = 3
     RATE_LIMIT_MAX_REQUESTS = 90  # Max requests per window
     RATE_LIMIT_WINDOW_SECONDS = 60  # Time window for rate limiting
+    RATE_LIMIT_BURST = 5  # Requests that may go out back to back before pacing starts
+    RATE_LIMIT_MAX_WAIT = 180  # seconds a request waits for a slot before giving up
+    RATE_ADAPT_INCREASE = 0.5  # requests/minute added per healthy response
+    RATE_ADAPT_DECREASE_FACTOR = 0.5  # Rate multiplier on 429/5xx
+    RATE_ADAPT_DECREASE_COOLDOWN = 5  # seconds between successive decreases
+    RATE_ADAPT_MIN_FACTOR = 0.1  # Floor, relative to RATE_LIMIT_MAX_REQUESTS
+    RATE_ADAPT_MAX_FACTOR = 3.0  # Ceiling, relative to RATE_LIMIT_MAX_REQUESTS
+    RATE_ADAPT_LATENCY_FACTOR = 2.0  # Stop increasing once latency exceeds this multiple of its best
+    RATE_ADAPT_DEFAULT_PAUSE = 2  # seconds to pause on a 429 without Retry-After
+    
+    # ==================== HTTP Cache Settings ====================
+    HTTP_CACHE_ENABLED = True  # Persist Bangumi responses and covers between sessions
+    HTTP_CACHE_FILE = "cache/http_cache.sqlite"  # Relative to the settings.json folder
+    HTTP_CACHE_MAX_MB = 500  # Least recently used entries are evicted beyond this
+    HTTP_CACHE_TRIM_INTERVAL = 50  # Check the size limit every N writes
+    HTTP_CACHE_TTL_DAYS = {  # Per-endpoint freshness before revalidation
+        "subject": 30,
+        "related": 14,
+        "search": 1,
+        "cover": 90,
+        "default": 7,
+    }
+    
+    # ==================== Offline Index Settings ====================
+    LOCAL_INDEX_ENABLED = True  # Answer from an imported Bangumi dump when one exists
+    LOCAL_INDEX_FILE = "cache/bangumi_index.sqlite"  # Relative to the settings.json folder
+    LOCAL_INDEX_SEARCH_LIMIT = 50  # Candidates taken from the index before fuzzy ranking
+    LOCAL_INDEX_BATCH_SIZE = 5000  # Rows per insert batch while importing a dump
     
     # ==================== UI Settings ====================
     PROGRESS_UPDATE_THROTTLE = 0.05  # seconds (50ms)
@@ -36,6 +67,14 @@ class Config:
     THUMBNAIL_MAX_HEIGHT = 450
     THUMBNAIL_QUALITY = 85  # JPEG quality (1-100)
     
+    # ==================== Scraped Cover Settings ====================
+    COVER_MAX_WIDTH = 1600  # Scraped covers are scaled down to fit (0 = no limit)
+    COVER_MAX_HEIGHT = 2400  # (0 = no limit)
+    COVER_FORMAT = "JPEG"  # Embedded format: JPEG, WEBP, PNG, or "" to keep the downloaded format
+    COVER_QUALITY = 90  # JPEG/WebP quality for re-encoded covers (1-100)
+    COVER_KEEP_LARGER_EXISTING = True  # Don't replace an embedded cover with a lower-resolution one
+    COVER_TRANSCODE_WORKERS = 4  # Covers prepared in parallel when applying a series
+    
     # ==================== Logging Settings ====================
     LOG_DIR = "logs"
     LOG_MAX_BYTES = 10 * 1024 * 1024  # 10 MB
@@ -45,10 +84,44 @@ class Config:
     # ==================== Threading Settings ====================
     MAX_CONCURRENT_SAVES = 4  # Max parallel save operations
     FILE_LOCK_TIMEOUT = 30  # seconds
+    SAVE_THROUGHPUT_WINDOW = 5.0  # seconds of samples in the moving-average throughput
+    SAVE_REPORT_ENABLED = True  # Write a per-file timing report (JSON) to LOG_DIR after each batch
+
+    # ==================== Save I/O Settings ====================
+    IO_READ_LIMIT_MBPS = 0  # Shared read limit for all save threads (0 = unlimited)
+    IO_WRITE_LIMIT_MBPS = 0  # Shared write limit for all save threads (0 = unlimited)
+    IO_LOW_PRIORITY = False  # Run save threads in the idle I/O class on Linux
+    NAS_IO_MODE = False  # Coalesced reads and large buffers for archives on SMB/NFS shares
+    NAS_TAIL_READ_BYTES = 1024 * 1024  # Archive tail (central directory) fetched in one read
+    NAS_BUFFER_SIZE = 4 * 1024 * 1024  # Sequential read/write buffer in NAS mode
+    DETERMINISTIC_SAVE = False  # Byte-stable repacks (stable order, fixed timestamps) for rsync/dedup
+    DETERMINISTIC_DATE_TIME = (1980, 1, 1, 0, 0, 0)  # Timestamp for generated entries in deterministic mode
+    
+    # ==================== Backup Settings ====================
+    BACKUP_ENABLED = False  # Back up each archive before saving
+    BACKUP_DIR_NAME = ".comicmeta_backup"  # Hidden folder beside the originals
+    BACKUP_KEEP_PER_FILE = 3  # Newest backups kept per archive (0 = unlimited)
+    BACKUP_MAX_AGE_DAYS = 30  # Older backups are removed (0 = never)
     
     # ==================== Search/Scraper Settings ====================
     SCRAPER_FUZZY_THRESHOLD = 60  # Minimum fuzzy match score
+    FUZZY_NGRAM_SIZE = 2  # Character n-grams used to shortlist names without rapidfuzz
+    FUZZY_SHORTLIST_SIZE = 500  # Names scored per query by the n-gram fallback
+    FUZZY_TOP_OVERFETCH = 4  # Names fetched per requested key when ranking top matches
+    TEXT_NORMALIZE_CACHE_SIZE = 65536  # Memoized strings per normalization step
+    NUMBER_MIN_CONFIDENCE = 0.5  # Filename numbers below this aren't used to fill Number automatically
     SCRAPER_MAX_RESULTS = 15
+    SCRAPER_ENRICH_TOP_N = 8  # Top search candidates fetched with full metadata
+    SCRAPER_ENRICH_WORKERS = 8  # Concurrent enrichment requests per search
+    SCRAPER_RESULT_CACHE_SIZE = 64  # Recent searches whose ranked results are kept in memory
+    SCRAPER_SEARCH_DEBOUNCE_MS = 400  # Typing pause before the scraper dialog searches
+    SCRAPER_SEARCH_MIN_CHARS = 2  # Shorter queries only search on Enter
+    SCRAPER_PREFETCH_WORKERS = 8  # Concurrent volume/cover fetches when applying a series
+    IMAGE_FETCH_WORKERS = 6  # Concurrent cover downloads for result lists
+    IMAGE_MEMORY_CACHE_MB = 32  # Downloaded result-list covers kept in memory
+    AUTO_SCRAPE_CONFIDENCE = 85  # Minimum match score to apply a library auto-scrape result unattended
+    AUTO_SCRAPE_MARGIN = 5  # Required lead over the runner-up match, else the group goes to review
+    AUTO_SCRAPE_WORKERS = 4  # Series groups searched/applied at once
     
     # ==================== Update Settings ====================
     GITHUB_REPO_OWNER = "veon0630"
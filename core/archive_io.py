@@ -0,0 +1,467 @@
+"""
+Archive file access helpers.
+
+All zip opens for reading and repacking go through here so that the
+NAS-optimized I/O mode can be switched on in one place. Over SMB/NFS
+every small read or metadata call is a network round trip; in NAS mode
+the tail of the archive (end record + central directory) is fetched in a
+single read, everything else goes through a large sequential buffer,
+and the kernel is told we will read sequentially.
+
+Repeated cover and metadata reads go through ArchiveReaderPool instead,
+which keeps a few archives open between calls (memory-mapped locally,
+through the NAS reader in NAS mode) and closes them once idle.
+"""
+
+import io
+import mmap
+import os
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from config import Config
+from utils.logger import logger
+
+
+def is_nas_mode() -> bool:
+    """Whether the NAS-optimized I/O mode is enabled in settings."""
+    from core.settings_manager import settings_manager
+    return bool(settings_manager.get("nas_io_mode", Config.NAS_IO_MODE))
+
+
+def is_deterministic_mode() -> bool:
+    """Whether repacks should produce byte-stable output."""
+    from core.settings_manager import settings_manager
+    return bool(settings_manager.get("deterministic_save", Config.DETERMINISTIC_SAVE))
+
+
+def _advise_sequential(fileobj):
+    """Hint the kernel to read ahead aggressively (no-op where unsupported)."""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fileobj.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except (OSError, AttributeError, io.UnsupportedOperation):
+            pass
+
+
+class TailCachedReader(io.RawIOBase):
+    """
+    Read-only, seekable file wrapper tuned for high-latency storage.
+
+    The last `tail_size` bytes of the file are read once up front, which
+    covers zipfile's end-of-central-directory probes and the central
+    directory itself for typical comic archives. Reads before the tail go
+    through a large BufferedReader so local headers and member data are
+    fetched in big sequential chunks.
+    """
+
+    def __init__(self, raw, tail_size: int = None, buffer_size: int = None):
+        super().__init__()
+        tail_size = tail_size or Config.NAS_TAIL_READ_BYTES
+        buffer_size = buffer_size or Config.NAS_BUFFER_SIZE
+
+        self._raw = raw
+        self._size = raw.seek(0, io.SEEK_END)
+        self._tail_start = max(0, self._size - tail_size)
+        raw.seek(self._tail_start)
+        self._tail = self._read_exact(raw, self._size - self._tail_start)
+
+        self._buffered = io.BufferedReader(raw, buffer_size)
+        self._buffered_pos = None  # Unknown until first seek
+        self._pos = 0
+
+    @staticmethod
+    def _read_exact(raw, size):
+        chunks = []
+        while size > 0:
+            chunk = raw.read(size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise OSError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def read(self, size=-1):
+        if self._pos >= self._size:
+            return b""
+        if size is None or size < 0:
+            size = self._size - self._pos
+
+        # Entirely inside the cached tail: no I/O at all
+        if self._pos >= self._tail_start:
+            start = self._pos - self._tail_start
+            data = self._tail[start:start + size]
+            self._pos += len(data)
+            return data
+
+        if self._buffered_pos != self._pos:
+            self._buffered.seek(self._pos)
+        data = self._buffered.read(size)
+        self._pos += len(data)
+        self._buffered_pos = self._pos
+        return data
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._buffered.close()
+            self._tail = b""
+        super().close()
+
+
+def open_read_stream(path):
+    """Open `path` for reading, using the NAS reader when the mode is on."""
+    if is_nas_mode():
+        raw = open(path, 'rb', buffering=0)
+        _advise_sequential(raw)
+        try:
+            return TailCachedReader(raw)
+        except Exception:
+            raw.close()
+            raise
+    return open(path, 'rb')
+
+
+@contextmanager
+def open_zip_read(path):
+    """
+    Context manager yielding a read-only ZipFile.
+
+    Raises FileNotFoundError directly instead of probing with exists()
+    first, which saves a round trip on network shares.
+    """
+    if not is_nas_mode():
+        with zipfile.ZipFile(path, 'r') as zf:
+            yield zf
+        return
+
+    stream = open_read_stream(path)
+    try:
+        with zipfile.ZipFile(stream, 'r') as zf:
+            yield zf
+    finally:
+        stream.close()
+
+
+@contextmanager
+def open_zip_write(path, compression=zipfile.ZIP_DEFLATED):
+    """Context manager yielding a new ZipFile, buffered for large sequential writes in NAS mode."""
+    if not is_nas_mode():
+        with zipfile.ZipFile(path, 'w', compression) as zf:
+            yield zf
+        return
+
+    stream = open(path, 'wb', buffering=Config.NAS_BUFFER_SIZE)
+    try:
+        with zipfile.ZipFile(stream, 'w', compression) as zf:
+            yield zf
+    finally:
+        stream.close()
+
+
+def replace_file(src, dst):
+    """Atomically move `src` over `dst` with a single rename (no exists/unlink)."""
+    os.replace(src, dst)
+
+
+def remove_quietly(path):
+    """Delete `path` if it exists, without a separate exists() check."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class _MappedFile:
+    """Minimal seekable file interface over an mmap, as zipfile expects."""
+
+    def __init__(self, mapped):
+        self._map = mapped
+
+    def seekable(self):
+        return True
+
+    def readable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._map.seek(offset, whence)
+        return self._map.tell()
+
+    def tell(self):
+        return self._map.tell()
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            return self._map.read()
+        return self._map.read(size)
+
+    def close(self):
+        self._map.close()
+
+
+class _PooledArchive:
+    """An open archive held by ArchiveReaderPool."""
+
+    def __init__(self, key, fileobj, mapped, zf):
+        self.key = key
+        self.fileobj = fileobj
+        self.mapped = mapped
+        self.zf = zf
+        self.refs = 0
+        self.stale = False
+        self.last_used = time.monotonic()
+
+    def close(self):
+        try:
+            self.zf.close()
+        finally:
+            if self.mapped is not None:
+                self.mapped.close()
+            self.fileobj.close()
+
+
+class ArchiveReaderPool:
+    """
+    Small LRU pool of open archive readers.
+
+    Entries are keyed by path and validated against (mtime, size) on every
+    checkout, so a file changed on disk is re-opened instead of served
+    stale. The parsed central directory is reused across cover and
+    metadata reads. Locally, member data is read straight from a memory
+    mapping; in NAS mode the archive is opened through the tail-cached
+    reader instead, since every page fault on a mapped network file is a
+    round trip.
+
+    Checkouts are reference counted: several threads may read the same
+    archive at once (ZipFile serializes access to the shared handle), and
+    an entry evicted or invalidated while in use is closed when the last
+    reader releases it.
+
+    An open handle or mapping stops the file from being renamed, replaced
+    or deleted on Windows, by this app or by anything else. Entries are
+    therefore closed after `idle_seconds` without use, and writers wrap
+    the replace or rename in released().
+    """
+
+    def __init__(self, max_size: int = None, idle_seconds: float = None):
+        self.max_size = max_size or Config.ARCHIVE_POOL_SIZE
+        self.idle_seconds = Config.ARCHIVE_POOL_IDLE_SECONDS if idle_seconds is None else idle_seconds
+        self._entries = OrderedDict()  # path -> _PooledArchive
+        self._active = {}  # path -> checkouts in progress, including of stale entries
+        self._writers = {}  # path -> thread ident holding released(path)
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._reaper = None
+
+    @staticmethod
+    def _open(path, key):
+        if is_nas_mode():
+            fileobj = open_read_stream(path)
+            try:
+                zf = zipfile.ZipFile(fileobj, 'r')
+            except Exception:
+                fileobj.close()
+                raise
+            return _PooledArchive(key, fileobj, None, zf)
+
+        fileobj = open(path, 'rb')
+        mapped = None
+        try:
+            try:
+                mapped = _MappedFile(mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ))
+            except (ValueError, OSError):
+                # Empty file or filesystem without mmap support
+                mapped = None
+            zf = zipfile.ZipFile(mapped if mapped is not None else fileobj, 'r')
+        except Exception:
+            if mapped is not None:
+                mapped.close()
+            fileobj.close()
+            raise
+        return _PooledArchive(key, fileobj, mapped, zf)
+
+    def _discard_locked(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            entry.stale = True
+            if entry.refs == 0:
+                entry.close()
+
+    def _wait_locked(self, predicate, what) -> bool:
+        deadline = time.monotonic() + Config.ARCHIVE_POOL_RELEASE_WAIT
+        while not predicate():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Timed out waiting for {what}")
+                return False
+            self._cond.wait(remaining)
+        return True
+
+    def _release(self, path, entry):
+        with self._cond:
+            entry.refs -= 1
+            entry.last_used = time.monotonic()
+            if entry.stale and entry.refs == 0:
+                entry.close()
+            self._active[path] -= 1
+            if not self._active[path]:
+                del self._active[path]
+            self._cond.notify_all()
+
+    def _start_reaper_locked(self):
+        if self._reaper is None and self.idle_seconds > 0:
+            self._reaper = threading.Thread(target=self._reap, name="archive-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self):
+        """Close entries idle for `idle_seconds`; exits once the pool is empty."""
+        with self._cond:
+            while self._entries:
+                now = time.monotonic()
+                next_due = now + self.idle_seconds
+                for path, entry in list(self._entries.items()):
+                    if entry.refs:
+                        continue
+                    due = entry.last_used + self.idle_seconds
+                    if due <= now:
+                        self._discard_locked(path)
+                    else:
+                        next_due = min(next_due, due)
+                if self._entries:
+                    self._cond.wait(next_due - now)
+            self._reaper = None
+
+    @contextmanager
+    def checkout(self, path):
+        """
+        Context manager yielding a read-only ZipFile for `path` from the pool.
+
+        Waits while another thread holds released(path). Raises
+        FileNotFoundError / zipfile.BadZipFile like ZipFile would.
+        """
+        path = os.fspath(path)
+        me = threading.get_ident()
+        with self._cond:
+            if self._writers.get(path) == me:
+                unpooled = True
+            else:
+                unpooled = False
+                self._wait_locked(lambda: path not in self._writers, f"a save of {path}")
+
+        if unpooled:
+            # The thread rewriting the file reads it without pooling a handle
+            entry = self._open(path, None)
+            try:
+                yield entry.zf
+            finally:
+                entry.close()
+            return
+
+        st = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+
+        with self._cond:
+            entry = self._entries.get(path)
+            if entry is not None and entry.key != key:
+                self._discard_locked(path)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(path)
+                entry.refs += 1
+                self._active[path] = self._active.get(path, 0) + 1
+
+        if entry is None:
+            new_entry = self._open(path, key)
+            with self._cond:
+                entry = self._entries.get(path)
+                if entry is not None and entry.key == key:
+                    # Another thread opened it first; use theirs
+                    new_entry.close()
+                    self._entries.move_to_end(path)
+                else:
+                    if entry is not None:
+                        self._discard_locked(path)
+                    entry = new_entry
+                    self._entries[path] = entry
+                    while len(self._entries) > self.max_size:
+                        oldest = next(iter(self._entries))
+                        self._discard_locked(oldest)
+                    self._start_reaper_locked()
+                entry.refs += 1
+                self._active[path] = self._active.get(path, 0) + 1
+
+        try:
+            yield entry.zf
+        finally:
+            self._release(path, entry)
+
+    @contextmanager
+    def released(self, path):
+        """
+        Hold `path` out of the pool while it is rewritten, replaced or renamed.
+
+        Closes the pooled reader and waits for reads already in progress to
+        finish before the block runs. Other threads' checkouts of `path`
+        wait until it exits.
+        """
+        path = os.fspath(path)
+        me = threading.get_ident()
+        with self._cond:
+            nested = self._writers.get(path) == me
+            if not nested:
+                self._wait_locked(lambda: path not in self._writers, f"another save of {path}")
+                self._writers[path] = me
+            self._discard_locked(path)
+            self._wait_locked(lambda: not self._active.get(path), f"reads of {path} to finish")
+        try:
+            yield
+        finally:
+            if not nested:
+                with self._cond:
+                    self._writers.pop(path, None)
+                    self._cond.notify_all()
+
+    def invalidate(self, path):
+        """Close the pooled reader for `path`, waiting for reads in progress to finish."""
+        with self.released(path):
+            pass
+
+    def clear(self):
+        with self._cond:
+            for path in list(self._entries):
+                self._discard_locked(path)
+
+
+# Global instance
+archive_pool = ArchiveReaderPool()
@@ -0,0 +1,186 @@
+"""
+Whole-library auto-scrape.
+
+Loaded files are grouped by series (the Series field, else the parent
+folder), each group is searched once, and the best match is applied to the
+whole group when it is unambiguous. Groups whose best match is weak or too
+close to the runner-up are left untouched and queued for manual review.
+Groups run concurrently; every request still goes through the shared
+request scheduler, so the API budget holds however many groups are busy.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import Config
+from core.command_manager import CommandManager
+from core.comic_file import ComicFile
+from utils.logger import logger
+from utils.text_normalizer import text_normalizer
+
+# Every scrape option, as checked by default in the scraper dialog
+ALL_FIELDS = ["Title", "Series", "Number", "Summary", "Writer", "Publisher", "Date",
+              "Genre", "Tags", "CommunityRating", "Status", "ISBN", "Format", "Web", "Cover"]
+
+
+class _RowIndex:
+    """Minimal stand-in for a QModelIndex, as consumed by CommandManager."""
+    __slots__ = ("_row",)
+
+    def __init__(self, row: int):
+        self._row = row
+
+    def row(self) -> int:
+        return self._row
+
+
+class ScrapeGroup:
+    """One series worth of files and the outcome of scraping it."""
+    ACCEPTED = "accepted"
+    REVIEW = "review"
+    NO_MATCH = "no_match"
+    FAILED = "failed"
+
+    def __init__(self, key: str, query: str):
+        self.key = key
+        self.query = query
+        self.rows = []
+        self.status = None
+        self.best = None        # Best candidate (applied if accepted)
+        self.confidence = 0
+        self.candidates = []
+        self.success_count = 0
+        self.failed_list = []
+        self.error = ""
+
+    @property
+    def best_name(self) -> str:
+        if not self.best:
+            return ""
+        return self.best.get("name_cn") or self.best.get("name", "")
+
+
+class LibraryAutoScraper:
+    """
+    Groups files by series and scrapes each group with a single search.
+
+    Args:
+        files: The loaded ComicFile list
+        rows: Rows of `files` to include
+        scraper: BangumiScraper used by every group (thread-safe)
+        options: Scrape options as produced by the scraper dialog
+        threshold: Minimum score to auto-accept (default: Config.AUTO_SCRAPE_CONFIDENCE)
+        workers: Groups processed at once (default: Config.AUTO_SCRAPE_WORKERS)
+        on_group_done: Optional callback receiving each finished ScrapeGroup
+            (called from a worker thread)
+    """
+
+    def __init__(self, files: list[ComicFile], rows: list[int], scraper, options: dict = None,
+                 threshold: int = None, workers: int = None, on_group_done=None):
+        self.files = files
+        self.scraper = scraper
+        self.options = options or {"fields": list(ALL_FIELDS)}
+        self.threshold = threshold if threshold is not None else Config.AUTO_SCRAPE_CONFIDENCE
+        self.workers = workers or Config.AUTO_SCRAPE_WORKERS
+        self.on_group_done = on_group_done
+        self.groups = self.group_files(files, rows)
+
+    @staticmethod
+    def group_files(files: list[ComicFile], rows: list[int]) -> list[ScrapeGroup]:
+        """Group rows by Series field, falling back to the parent folder name."""
+        groups = {}
+        for row in rows:
+            if row >= len(files):
+                continue
+            query = CommandManager.series_group_name(files[row])
+            key = text_normalizer.for_key(query) or query.casefold()
+            if key not in groups:
+                groups[key] = ScrapeGroup(key, query)
+            groups[key].rows.append(row)
+        return list(groups.values())
+
+    def evaluate(self, group: ScrapeGroup, candidates: list) -> str:
+        """
+        Pick the best candidate for a group and decide whether to accept it.
+
+        Multi-file groups only accept Series subjects; a single file may also
+        match a single volume. The best match must reach the threshold and
+        beat the next candidate of the same kind by Config.AUTO_SCRAPE_MARGIN.
+        """
+        group.candidates = candidates
+        if not candidates:
+            return ScrapeGroup.NO_MATCH
+
+        if len(group.rows) > 1:
+            usable = [c for c in candidates if c.get("type_label") == "Series"]
+        else:
+            usable = [c for c in candidates if c.get("type_label") in ("Series", "Volume")]
+        if not usable:
+            # Only unenriched or wrong-kind matches: show the top one for review
+            group.best = candidates[0]
+            group.confidence = candidates[0].get("fuzzScore", 0)
+            return ScrapeGroup.REVIEW
+
+        best = usable[0]
+        group.best = best
+        group.confidence = best.get("fuzzScore", 0)
+        if group.confidence < self.threshold:
+            return ScrapeGroup.REVIEW
+
+        runner_up = next((c for c in usable[1:]
+                          if c.get("id") != best.get("id") and c.get("type_label") == best.get("type_label")), None)
+        if runner_up and group.confidence - runner_up.get("fuzzScore", 0) < Config.AUTO_SCRAPE_MARGIN:
+            return ScrapeGroup.REVIEW
+        return ScrapeGroup.ACCEPTED
+
+    def _process(self, group: ScrapeGroup, is_cancelled) -> ScrapeGroup:
+        try:
+            candidates = self.scraper.search_subjects(group.query) or []
+            group.status = self.evaluate(group, candidates)
+            if group.status != ScrapeGroup.ACCEPTED or is_cancelled():
+                return group
+
+            mode = 'series' if group.best.get("type_label") == "Series" else 'volume'
+            group.success_count, group.failed_list = CommandManager.apply_scraped_data(
+                self.files,
+                [_RowIndex(r) for r in group.rows],
+                group.best,
+                mode,
+                self.options,
+                self.scraper,
+                lambda _done: is_cancelled(),
+            )
+        except Exception as e:
+            logger.error(f"Auto-scrape failed for '{group.query}': {e}")
+            group.status = ScrapeGroup.FAILED
+            group.error = str(e)
+        return group
+
+    def run(self, is_cancelled=lambda: False) -> list[ScrapeGroup]:
+        """
+        Scrape every group. Groups finish in any order; `on_group_done` sees
+        each one as soon as it is applied.
+
+        Returns:
+            list[ScrapeGroup]: Groups that finished (all of them unless cancelled)
+        """
+        finished = []
+        if not self.groups:
+            return finished
+
+        logger.info(f"Auto-scraping {len(self.groups)} series groups")
+        executor = ThreadPoolExecutor(max_workers=min(len(self.groups), self.workers),
+                                      thread_name_prefix="auto-scrape")
+        cancelled = False
+        try:
+            futures = [executor.submit(self._process, group, is_cancelled) for group in self.groups]
+            for future in as_completed(futures):
+                group = future.result()
+                finished.append(group)
+                if self.on_group_done:
+                    self.on_group_done(group)
+                if is_cancelled():
+                    cancelled = True
+                    break
+        finally:
+            executor.shutdown(wait=not cancelled, cancel_futures=True)
+        return finished
@@ -0,0 +1,225 @@
+"""
+Cheap pre-save backups of comic archives.
+
+Backups live in a hidden folder beside the original so they stay on the
+same filesystem, which lets us share data blocks instead of copying them.
+"""
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple, List
+
+from config import Config
+from utils.logger import logger
+
+# Linux ioctl to share all extents of one file with another (btrfs, XFS, bcachefs)
+FICLONE = 0x40049409
+
+
+class BackupManager:
+    """
+    Creates, prunes and restores pre-save backups.
+
+    Methods are tried from cheapest to most expensive:
+    1. reflink (FICLONE): shares extents, costs no data bytes
+    2. hardlink: only when the original is about to be replaced by a new
+       file (repack), so the backup keeps the old inode alive
+    3. copy_file_range: lets the kernel/server copy without user-space
+       buffers (and reflink on filesystems that support it)
+    4. full byte copy
+    """
+
+    TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S-%f"
+
+    @staticmethod
+    def is_enabled() -> bool:
+        from core.settings_manager import settings_manager
+        return bool(settings_manager.get("backup_enabled", Config.BACKUP_ENABLED))
+
+    @staticmethod
+    def get_backup_dir(file_path: Path) -> Path:
+        return Path(file_path).parent / Config.BACKUP_DIR_NAME
+
+    @staticmethod
+    def list_backups(file_path: Path) -> List[Path]:
+        """Return backups of `file_path`, newest first."""
+        file_path = Path(file_path)
+        backup_dir = BackupManager.get_backup_dir(file_path)
+        prefix = file_path.name + "."
+        try:
+            backups = [p for p in backup_dir.iterdir()
+                       if p.name.startswith(prefix) and p.name.endswith(".bak")]
+        except FileNotFoundError:
+            return []
+        # Timestamp suffix sorts lexically
+        return sorted(backups, key=lambda p: p.name, reverse=True)
+
+    @staticmethod
+    def _backup_timestamp(file_path: Path, backup: Path) -> Optional[float]:
+        """Creation time encoded in a backup's file name, or None if unparsable."""
+        stamp = backup.name[len(Path(file_path).name) + 1:-len(".bak")]
+        try:
+            return datetime.strptime(stamp, BackupManager.TIMESTAMP_FORMAT).timestamp()
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _try_reflink(src: Path, dst: Path) -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            import fcntl
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return True
+        except (ImportError, OSError):
+            BackupManager._remove_partial(dst)
+            return False
+
+    @staticmethod
+    def _try_hardlink(src: Path, dst: Path) -> bool:
+        try:
+            os.link(src, dst)
+            return True
+        except (OSError, NotImplementedError, AttributeError):
+            return False
+
+    @staticmethod
+    def _try_copy_file_range(src: Path, dst: Path) -> bool:
+        if not hasattr(os, "copy_file_range"):
+            return False
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining > 0:
+                raise OSError("copy_file_range stopped early")
+            shutil.copystat(src, dst)
+            return True
+        except OSError:
+            BackupManager._remove_partial(dst)
+            return False
+
+    @staticmethod
+    def _remove_partial(path: Path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _clone(src: Path, dst: Path, allow_hardlink: bool) -> str:
+        """Copy `src` to `dst` as cheaply as possible. Returns the method used."""
+        if BackupManager._try_reflink(src, dst):
+            return "reflink"
+        if allow_hardlink and BackupManager._try_hardlink(src, dst):
+            return "hardlink"
+        if BackupManager._try_copy_file_range(src, dst):
+            return "copy_file_range"
+        shutil.copy2(src, dst)
+        return "copy"
+
+    @staticmethod
+    def create_backup(file_path: Path, allow_hardlink: bool = False) -> Tuple[Path, str]:
+        """
+        Back up `file_path` before it is modified.
+
+        Args:
+            file_path: Archive that is about to be saved
+            allow_hardlink: True only if the original will be replaced by a
+                new file rather than modified in place (repack). A hardlink
+                shares the inode, so an in-place append would change the
+                backup too.
+
+        Returns:
+            (backup_path, method)
+        """
+        file_path = Path(file_path)
+        backup_dir = BackupManager.get_backup_dir(file_path)
+        backup_dir.mkdir(exist_ok=True)
+
+        stamp = datetime.now().strftime(BackupManager.TIMESTAMP_FORMAT)
+        backup_path = backup_dir / f"{file_path.name}.{stamp}.bak"
+
+        method = BackupManager._clone(file_path, backup_path, allow_hardlink)
+        logger.info(f"Backed up {file_path.name} ({method})")
+
+        BackupManager.prune(file_path)
+        return backup_path, method
+
+    @staticmethod
+    def prune(file_path: Path, keep: Optional[int] = None, max_age_days: Optional[float] = None) -> int:
+        """
+        Apply retention policy to backups of `file_path`.
+
+        Keeps at most `keep` newest backups and deletes any older than
+        `max_age_days` (the newest one is always kept). Returns the number
+        of backups removed.
+        """
+        from core.settings_manager import settings_manager
+        if keep is None:
+            keep = settings_manager.get("backup_keep", Config.BACKUP_KEEP_PER_FILE)
+        if max_age_days is None:
+            max_age_days = settings_manager.get("backup_max_age_days", Config.BACKUP_MAX_AGE_DAYS)
+
+        backups = BackupManager.list_backups(file_path)
+        cutoff = time.time() - max_age_days * 86400 if max_age_days else None
+        removed = 0
+
+        for i, backup in enumerate(backups):
+            if i == 0:
+                continue
+            expired = keep and i >= keep
+            if not expired and cutoff is not None:
+                # Age comes from the name: a hardlinked backup shares the
+                # original's mtime, which may be much older than the backup
+                created = BackupManager._backup_timestamp(file_path, backup)
+                expired = created is not None and created < cutoff
+            if expired:
+                try:
+                    backup.unlink()
+                    removed += 1
+                except OSError as e:
+                    logger.warning(f"Failed to remove old backup {backup}: {e}")
+        return removed
+
+    @staticmethod
+    def restore_latest(file_path: Path) -> Path:
+        """
+        Restore the newest backup over `file_path`.
+
+        The backup is cloned to a temp file and swapped in with os.replace,
+        so the backup itself is kept and the original is never half-written.
+
+        Returns:
+            Path of the backup that was restored
+
+        Raises:
+            FileNotFoundError: If there is no backup for this file
+        """
+        file_path = Path(file_path)
+        backups = BackupManager.list_backups(file_path)
+        if not backups:
+            raise FileNotFoundError(f"No backup found for {file_path.name}")
+
+        from core.archive_io import archive_pool, replace_file
+        backup = backups[0]
+        temp_path = file_path.with_suffix(f"{Config.TEMP_FILE_PREFIX}.restore")
+        try:
+            # No hardlink: a later in-place append would modify the backup too
+            BackupManager._clone(backup, temp_path, allow_hardlink=False)
+            with archive_pool.released(file_path):
+                replace_file(temp_path, file_path)
+        except Exception:
+            BackupManager._remove_partial(temp_path)
+            raise
+
+        logger.info(f"Restored {file_path.name} from {backup.name}")
+        return backup
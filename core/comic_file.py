@@ -13,8 +13,48 @@ from xml.dom import minidom
 from typing import Optional, Tuple, Dict, Any
 
 from config import Config
+from core.archive_io import (archive_pool, open_zip_read, open_zip_write, replace_file, remove_quietly,
+                             is_deterministic_mode)
+from core.io_qos import io_throttle
 from utils.logger import logger
 
+def _find_cover_entry(zf, explicit_only: bool = False) -> Optional[str]:
+    """Archive member shown as the cover: an explicit cover file, else (unless explicit_only) the first page."""
+    # Helper to decode filename
+    def decode_filename(zinfo):
+        if zinfo.flag_bits & 0x800:
+            return zinfo.filename
+        try:
+            return zinfo.filename.encode('cp437').decode('gbk')
+        except (UnicodeDecodeError, UnicodeEncodeError, AttributeError):
+            return zinfo.filename
+    
+    # Build decoded name map
+    decoded_map = {}
+    for info in zf.infolist():
+        decoded = decode_filename(info)
+        decoded_map[decoded] = info.filename
+    
+    # Find image files
+    image_extensions = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp')
+    all_images = [name for name in decoded_map.keys() if name.lower().endswith(image_extensions)]
+    
+    if not all_images:
+        return None
+    
+    # Priority 1: Explicit cover files
+    cover_names = ['cover', 'folder', 'default', 'poster']
+    for img_name in all_images:
+        basename = Path(img_name).stem.lower()
+        if basename in cover_names:
+            return decoded_map[img_name]
+    if explicit_only:
+        return None
+    
+    # Priority 2: First page (naturally sorted)
+    sorted_images = natsorted(all_images)
+    return decoded_map[sorted_images[0]]
+
 # Global cache for cover images - Module level to avoid memory leaks
 @lru_cache(maxsize=Config.COVER_CACHE_SIZE)
 def _read_cover_from_zip_cached(file_path_str: str) -> Optional[bytes]:
@@ -29,47 +69,30 @@ def _read_cover_from_zip_cached(file_path_str: str) -> Optional[bytes]:
         Cover image data as bytes, or None if not found or error occurred
     """
     try:
-        with zipfile.ZipFile(file_path_str, 'r') as zf:
-            # Helper to decode filename
-            def decode_filename(zinfo):
-                if zinfo.flag_bits & 0x800:
-                    return zinfo.filename
-                try:
-                    return zinfo.filename.encode('cp437').decode('gbk')
-                except (UnicodeDecodeError, UnicodeEncodeError, AttributeError):
-                    return zinfo.filename
-            
-            # Build decoded name map
-            decoded_map = {}
-            for info in zf.infolist():
-                decoded = decode_filename(info)
-                decoded_map[decoded] = info.filename
-            
-            # Find image files
-            image_extensions = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp')
-            all_images = [name for name in decoded_map.keys() if name.lower().endswith(image_extensions)]
-            
-            if not all_images:
+        with archive_pool.checkout(file_path_str) as zf:
+            name = _find_cover_entry(zf)
+            if name is None:
                 return None
-            
-            # Priority 1: Explicit cover files
-            cover_names = ['cover', 'folder', 'default', 'poster']
-            for img_name in all_images:
-                basename = Path(img_name).stem.lower()
-                if basename in cover_names:
-                    with zf.open(decoded_map[img_name]) as f:
-                        return f.read()
-            
-            # Priority 2: First page (naturally sorted)
-            sorted_images = natsorted(all_images)
-            first_img = sorted_images[0]
-            with zf.open(decoded_map[first_img]) as f:
+            with zf.open(name) as f:
                 return f.read()
                 
     except Exception as e:
         logger.error(f"Error reading cover from {file_path_str}: {e}")
         return None
 
+def _read_cover_size_from_zip(file_path_str: str) -> Optional[Tuple[int, int]]:
+    """Pixel size of the archive's explicit cover file, read from the image header rather than the whole entry."""
+    try:
+        with archive_pool.checkout(file_path_str) as zf:
+            name = _find_cover_entry(zf, explicit_only=True)
+            if name is None:
+                return None
+            with zf.open(name) as f, Image.open(f) as img:
+                return img.size
+    except Exception as e:
+        logger.warning(f"Could not read cover size from {file_path_str}: {e}")
+        return None
+
 class ComicFile:
     """
     Represents a comic book archive file (.cbz or .zip).
@@ -154,11 +177,10 @@ class ComicFile:
 
     def load(self):
         """Load metadata from the file. Cover is lazy loaded."""
-        if not self.file_path.exists():
-            raise FileNotFoundError(f"File not found: {self.file_path}")
-
+        # No separate exists() probe: the open itself reports a missing file,
+        # which saves a round trip on network shares
         try:
-            with zipfile.ZipFile(self.file_path, 'r') as zf:
+            with archive_pool.checkout(self.file_path) as zf:
                 # Build name map
                 self.zip_name_map = {}
                 for zinfo in zf.infolist():
@@ -181,9 +203,10 @@ class ComicFile:
                     self.metadata["Series"] = self.file_path.parent.name
                     self.metadata["Title"] = self.file_path.stem
                     
-                    from utils.text_utils import get_number
-                    num_val, _ = get_number(self.file_path.stem)
-                    if num_val is not None:
+                    from utils.text_normalizer import text_normalizer
+                    num_match = text_normalizer.number_match(self.file_path.stem)
+                    num_val = num_match.number
+                    if num_val is not None and num_match.confidence >= Config.NUMBER_MIN_CONFIDENCE:
                         if num_val.is_integer():
                             self.metadata["Number"] = str(int(num_val))
                         else:
@@ -193,6 +216,8 @@ class ComicFile:
 
                 # 2. Cover is NOT loaded here anymore to save memory/time
 
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {self.file_path}")
         except zipfile.BadZipFile:
             logger.error(f"Bad Zip File: {self.file_path}")
             self.metadata = self.default_metadata.copy()
@@ -223,6 +248,15 @@ class ComicFile:
         # Use module-level cached function (avoids lru_cache memory leak)
         return _read_cover_from_zip_cached(str(self.file_path))
     
+    def get_embedded_cover_size(self) -> Optional[Tuple[int, int]]:
+        """
+        (width, height) of the archive's cover file (cover.jpg, folder.png...), or None.
+        
+        This is the image a new custom cover replaces on save; a first page
+        shown as the cover is left in place, so it isn't considered.
+        """
+        return _read_cover_size_from_zip(str(self.file_path))
+    
     def get_cover_thumbnail(self, max_size: Tuple[int, int] = (300, 450), quality: int = 85) -> Optional[bytes]:
         """
         Get cover image as thumbnail to save memory.
@@ -316,6 +350,20 @@ class ComicFile:
             # Fallback to jpg if detection fails
             return 'cover.jpg'
     
+    @staticmethod
+    def _generated_date_time(deterministic: bool) -> tuple:
+        """Timestamp for entries we write ourselves (ComicInfo.xml, cover)."""
+        if deterministic:
+            return Config.DETERMINISTIC_DATE_TIME
+        return datetime.now().timetuple()[:6]
+
+    @staticmethod
+    def _pin_zinfo(zinfo: zipfile.ZipInfo):
+        """Fix header fields that otherwise depend on the platform we save from."""
+        zinfo.create_system = 3  # Unix
+        zinfo.create_version = zipfile.DEFAULT_VERSION
+        zinfo.external_attr = 0o644 << 16
+
     def _save_with_append(self):
         """
         Fast path: append ComicInfo.xml and/or cover to existing zip.
@@ -324,25 +372,31 @@ class ComicFile:
         Note: We don't set UTF-8 flag here to avoid mixed encoding issues.
         ComicInfo.xml and cover.* are ASCII filenames so they don't need UTF-8.
         """
+        generated_date_time = self._generated_date_time(is_deterministic_mode())
         try:
-            with zipfile.ZipFile(self.file_path, 'a', zipfile.ZIP_DEFLATED) as zf:
+            # Keep pooled readers off the archive while it grows
+            with archive_pool.released(self.file_path), \
+                    zipfile.ZipFile(self.file_path, 'a', zipfile.ZIP_DEFLATED) as zf:
                 # Write ComicInfo.xml (ASCII filename, no UTF-8 flag needed)
                 xml_str = self._generate_xml()
                 zinfo = zipfile.ZipInfo(
                     filename='ComicInfo.xml',
-                    date_time=datetime.now().timetuple()[:6]
+                    date_time=generated_date_time
                 )
                 # Don't set UTF-8 flag to avoid mixed encoding with existing files
-                zf.writestr(zinfo, xml_str.encode('utf-8'))
+                xml_bytes = xml_str.encode('utf-8')
+                io_throttle.throttle_write(len(xml_bytes))
+                zf.writestr(zinfo, xml_bytes)
                 
                 # Write custom cover if provided
                 if self.custom_cover_data:
                     cover_filename = self._detect_cover_filename()
                     zinfo_cover = zipfile.ZipInfo(
                         filename=cover_filename,
-                        date_time=datetime.now().timetuple()[:6]
+                        date_time=generated_date_time
                     )
                     # Don't set UTF-8 flag (cover.* is ASCII)
+                    io_throttle.throttle_write(len(self.custom_cover_data))
                     zf.writestr(zinfo_cover, self.custom_cover_data)
                     
                     # Update tracking
@@ -363,14 +417,23 @@ class ComicFile:
         """
         Slow path: repack the entire zip with updated ComicInfo.xml and cover.
         Required when updating existing ComicInfo.xml or replacing cover files.
+
+        In deterministic mode the output depends only on the archive contents:
+        pages keep their original order and timestamps, cover and ComicInfo.xml
+        always go last with a fixed timestamp, and header fields that vary by
+        platform are pinned. Re-saving after a metadata edit then leaves every
+        page at the same offset, so rsync and dedup only see the changed tail.
         """
+        deterministic = is_deterministic_mode()
+        generated_date_time = self._generated_date_time(deterministic)
+
         # Use unique temp file name to avoid concurrent write conflicts
         temp_path = self.file_path.with_suffix(f'.tmp.{uuid.uuid4().hex[:8]}')
         
         try:
             # Copy all files from original zip to new zip
-            with zipfile.ZipFile(self.file_path, 'r') as zin:
-                with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as zout:
+            with open_zip_read(self.file_path) as zin:
+                with open_zip_write(temp_path, zipfile.ZIP_DEFLATED) as zout:
                     # Step 1: Copy all files except ComicInfo.xml and cover.* files
                     cover_extensions = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp')
                     cover_names = ['cover', 'folder', 'default', 'poster']
@@ -378,6 +441,23 @@ class ComicFile:
                     # Calculate total size for progress
                     total_size = sum(item.file_size for item in zin.infolist())
                     current_size = 0
+                    # Existing cover files moved behind the pages (deterministic mode)
+                    deferred = []
+                    
+                    def copy_entry(item, decoded_name):
+                        # Copy with UTF-8 encoding
+                        zinfo_new = zipfile.ZipInfo(
+                            filename=decoded_name,
+                            date_time=item.date_time
+                        )
+                        zinfo_new.compress_type = item.compress_type
+                        zinfo_new.flag_bits |= 0x800  # Set UTF-8 flag
+                        if deterministic:
+                            self._pin_zinfo(zinfo_new)
+                        io_throttle.throttle_read(item.compress_size)
+                        data = zin.read(item.filename)
+                        io_throttle.throttle_write(item.compress_size)
+                        zout.writestr(zinfo_new, data)
                     
                     for i, item in enumerate(zin.infolist()):
                         # Decode the name to check what it is
@@ -388,55 +468,64 @@ class ComicFile:
                             current_size += item.file_size
                             continue
                         
+                        basename = Path(decoded_name).stem.lower()
+                        ext = Path(decoded_name).suffix.lower()
+                        is_cover = basename in cover_names and ext in cover_extensions
+                        
                         # Skip existing cover.* files if we have a custom cover
-                        if self.custom_cover_data:
-                            basename = Path(decoded_name).stem.lower()
-                            ext = Path(decoded_name).suffix.lower()
-                            if basename in cover_names and ext in cover_extensions:
-                                current_size += item.file_size
-                                continue
+                        if self.custom_cover_data and is_cover:
+                            current_size += item.file_size
+                            continue
                         
-                        # Copy all other files with UTF-8 encoding
-                        zinfo_new = zipfile.ZipInfo(
-                            filename=decoded_name,
-                            date_time=item.date_time
-                        )
-                        zinfo_new.compress_type = item.compress_type
-                        zinfo_new.flag_bits |= 0x800  # Set UTF-8 flag
-                        zout.writestr(zinfo_new, zin.read(item.filename))
+                        if deterministic and is_cover:
+                            deferred.append((item, decoded_name))
+                            continue
+                        
+                        # Copy all other files
+                        copy_entry(item, decoded_name)
                         
                         current_size += item.file_size
                         if progress_callback and total_size > 0:
                             # Report progress (0-100)
                             progress_callback(int(current_size / total_size * 100))
                     
-                    # Step 2: Write custom cover if provided
+                    # Step 2: Existing cover files go after the pages
+                    for item, decoded_name in deferred:
+                        copy_entry(item, decoded_name)
+                        current_size += item.file_size
+                        if progress_callback and total_size > 0:
+                            progress_callback(int(current_size / total_size * 100))
+                    
+                    # Step 3: Write custom cover if provided
                     if self.custom_cover_data:
                         cover_filename = self._detect_cover_filename()
                         zinfo_cover = zipfile.ZipInfo(
                             filename=cover_filename,
-                            date_time=datetime.now().timetuple()[:6]
+                            date_time=generated_date_time
                         )
                         zinfo_cover.flag_bits |= 0x800  # Set UTF-8 flag
+                        if deterministic:
+                            self._pin_zinfo(zinfo_cover)
                         zout.writestr(zinfo_cover, self.custom_cover_data)
                         
                         # Update tracking
                         self.cover_filename = cover_filename
                         # self.cover_image_data = self.custom_cover_data # Removed
                     
-                    # Step 3: Write new ComicInfo.xml
+                    # Step 4: Write new ComicInfo.xml
                     xml_str = self._generate_xml()
                     zinfo_xml = zipfile.ZipInfo(
                         filename='ComicInfo.xml',
-                        date_time=datetime.now().timetuple()[:6]
+                        date_time=generated_date_time
                     )
                     zinfo_xml.flag_bits |= 0x800  # Set UTF-8 flag
+                    if deterministic:
+                        self._pin_zinfo(zinfo_xml)
                     zout.writestr(zinfo_xml, xml_str.encode('utf-8'))
             
-            # Replace original file
-            if self.file_path.exists():
-                self.file_path.unlink()
-            temp_path.rename(self.file_path)
+            # Replace original file (single atomic rename, no exists/unlink round trips)
+            with archive_pool.released(self.file_path):
+                replace_file(temp_path, self.file_path)
             
             self.is_dirty = False
             self.original_metadata = self.metadata.copy()
@@ -447,15 +536,20 @@ class ComicFile:
             
         except Exception as e:
             logger.error(f"Error repacking file {self.file_path}: {e}")
-            if temp_path.exists():
-                temp_path.unlink()
+            remove_quietly(temp_path)
             raise e
     
-    def save(self, progress_callback=None):
-        """Save metadata and custom cover back to the file. Thread-safe."""
+    def save(self, progress_callback=None) -> Optional[str]:
+        """
+        Save metadata and custom cover back to the file. Thread-safe.
+
+        Returns:
+            str: The save plan that was used ('append' or 'repack'),
+                 or None if there was nothing to save
+        """
         if not self.is_dirty and not self.custom_cover_data:
-            return
-        
+            return None
+
         logger.info(f"Saving comic file: {self.file_path.name}")
         
         # Acquire file lock to prevent concurrent saves to the same file
@@ -468,12 +562,22 @@ class ComicFile:
         # Perform save with lock
         with file_lock:
             # Decide which save method to use
-            if self._needs_repack():
+            needs_repack = self._needs_repack()
+
+            # Optional safety backup. Repack replaces the file with a new one,
+            # so a hardlink to the old inode is a complete zero-copy backup.
+            from core.backup import BackupManager
+            if BackupManager.is_enabled():
+                BackupManager.create_backup(self.file_path, allow_hardlink=needs_repack)
+
+            if needs_repack:
                 # Slow path: must repack entire zip
                 self._save_with_repack(progress_callback)
+                return "repack"
             else:
                 # Fast path: can append to existing zip
                 self._save_with_append()
+                return "append"
 
     def _generate_xml(self):
         """Generate ComicInfo.xml string from metadata. Optimized version."""
@@ -530,13 +634,30 @@ class ComicFile:
         try:
             # Rename the file
             logger.info(f"Converting {self.file_path.name} to {target_extension}")
-            self.file_path.rename(new_path)
+            with archive_pool.released(self.file_path):
+                self.file_path.rename(new_path)
             self.file_path = new_path
             return True
         except Exception as e:
             logger.error(f"Error converting format: {e}")
             return False
 
+    def restore_backup(self):
+        """
+        Restore the newest pre-save backup and reload metadata from it.
+
+        Returns:
+            Path: The backup file that was restored
+        """
+        from core.backup import BackupManager
+        backup = BackupManager.restore_latest(self.file_path)
+
+        self.custom_cover_data = None
+        self.is_dirty = False
+        _read_cover_from_zip_cached.cache_clear()
+        self.load()
+        return backup
+
     def set_custom_cover(self, cover_data):
         """
         Set a custom cover image (from scraping or manual upload).
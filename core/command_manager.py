@@ -1,9 +1,48 @@
-from utils.text_utils import get_number
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import Config
+from utils.text_normalizer import text_normalizer
+from utils.text_utils import NumberType, clean_series_query
 from utils.logger import logger
 from core.comic_file import ComicFile
+from core.cover_policy import CoverPreparer
 from core.metadata import MetadataMapper
 from core.scraper import BangumiScraper
 
+class NumberingGroup:
+    """Auto-number outcome for one series: the numbers found, missing and repeated."""
+
+    def __init__(self, key: str, name: str):
+        self.key = key
+        self.name = name
+        self.numbers = {}       # number -> rows carrying it
+        self.unnumbered = []    # Rows without a confident number
+
+    @property
+    def rows(self) -> list[int]:
+        return [row for rows in self.numbers.values() for row in rows]
+
+    @property
+    def duplicates(self) -> dict:
+        """Numbers found on more than one file, mapped to their rows."""
+        return {num: rows for num, rows in self.numbers.items() if len(rows) > 1}
+
+    @property
+    def gaps(self) -> list[int]:
+        """Whole numbers missing between the lowest and highest found."""
+        whole = {int(num) for num in self.numbers if num.is_integer()}
+        if not whole:
+            return []
+        return [n for n in range(min(whole), max(whole)) if n not in whole]
+
+    @property
+    def complete_count(self) -> int:
+        """Volume count when the run is 1..N without gaps, else 0."""
+        whole = {int(num) for num in self.numbers if num.is_integer()}
+        if len(whole) < 2 or min(whole) != 1 or len(whole) != max(whole):
+            return 0
+        return max(whole)
+
+
 class CommandManager:
     """
     Centralized manager for business logic commands.
@@ -17,28 +56,96 @@ class CommandManager:
         Returns list of modified files.
         """
         modified_files = []
-        for idx in indexes:
-            if idx.row() < len(files):
-                file_obj = files[idx.row()]
+        indexes = [idx for idx in indexes if idx.row() < len(files)]
+        # Extract numbers from all filenames in one pass
+        matches = text_normalizer.numbers([files[idx.row()].file_path.stem for idx in indexes])
+        for idx, match in zip(indexes, matches):
+            file_obj = files[idx.row()]
+            num = match.number
+            
+            if num is not None and match.confidence >= Config.NUMBER_MIN_CONFIDENCE:
+                # Format: remove .0 if integer
+                num_str = str(int(num)) if num.is_integer() else str(num)
                 
-                # Extract number from filename
-                num, _ = get_number(file_obj.file_path.stem)
+                file_obj.set_metadata("Number", num_str)
                 
-                if num is not None:
-                    # Format: remove .0 if integer
-                    num_str = str(int(num)) if num.is_integer() else str(num)
-                    
-                    file_obj.set_metadata("Number", num_str)
-                    
-                    # Optional: Update title if series name exists
-                    series = file_obj.metadata.get("Series")
-                    if series:
-                        file_obj.set_metadata("Title", f"{series} Vol. {num_str}")
-                    
-                    modified_files.append(file_obj)
+                # Optional: Update title if series name exists
+                series = file_obj.metadata.get("Series")
+                if series:
+                    file_obj.set_metadata("Title", f"{series} Vol. {num_str}")
+                
+                modified_files.append(file_obj)
         
         return modified_files
 
+    @staticmethod
+    def series_group_name(file_obj: ComicFile) -> str:
+        """Series name used to group files: the Series field, else the parent folder."""
+        name = (file_obj.get_metadata("Series") or "").strip()
+        if not name:
+            name = file_obj.file_path.parent.name or file_obj.file_path.stem
+        return clean_series_query(name)
+
+    @staticmethod
+    def auto_number_series(files: list[ComicFile], indexes: list) -> tuple[list[int], list[NumberingGroup]]:
+        """
+        Auto-number selected files series by series.
+
+        Files are grouped by series (see series_group_name), numbers are
+        extracted from all filenames in one batch, and Number is filled in,
+        plus Volume unless the filename marks a chapter. Count is filled where empty when a series holds a complete
+        1..N run. Gaps and duplicate numbers are collected per group.
+
+        Returns (modified_rows, groups).
+        """
+        rows = [idx.row() for idx in indexes if idx.row() < len(files)]
+        matches = text_normalizer.numbers([files[row].file_path.stem for row in rows])
+
+        groups = {}
+        names = {}
+        chapter_rows = set()
+        for row, match in zip(rows, matches):
+            file_obj = files[row]
+            raw = (file_obj.get_metadata("Series") or "").strip() or file_obj.file_path.parent
+            # Many files share a series or folder; clean each name once
+            if raw not in names:
+                name = CommandManager.series_group_name(file_obj)
+                names[raw] = (text_normalizer.for_key(name) or name.casefold(), name)
+            key, name = names[raw]
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = NumberingGroup(key, name)
+
+            if match.number is None or match.confidence < Config.NUMBER_MIN_CONFIDENCE:
+                group.unnumbered.append(row)
+            else:
+                group.numbers.setdefault(match.number, []).append(row)
+                if match.type == NumberType.CHAPTER:
+                    chapter_rows.add(row)
+
+        modified_rows = []
+        for group in groups.values():
+            count = str(group.complete_count or "")
+            for num, num_rows in group.numbers.items():
+                num_str = MetadataMapper._format_number(num)
+                for row in num_rows:
+                    file_obj = files[row]
+                    updates = [("Number", num_str)]
+                    # "Ch.5" / "第5话" number a chapter, not a volume
+                    if row not in chapter_rows:
+                        updates.append(("Volume", num_str))
+                    if count and not file_obj.get_metadata("Count"):
+                        updates.append(("Count", count))
+                    changed = False
+                    for key, value in updates:
+                        if file_obj.get_metadata(key) != value:
+                            file_obj.set_metadata(key, value)
+                            changed = True
+                    if changed:
+                        modified_rows.append(row)
+
+        return sorted(modified_rows), list(groups.values())
+
     @staticmethod
     def convert_format(files: list[ComicFile], indexes: list, target_ext: str) -> tuple[int, list]:
         """
@@ -68,6 +175,64 @@ class CommandManager:
         
         return success_count, failed_list
 
+    @staticmethod
+    def restore_backups(files: list[ComicFile], indexes: list) -> tuple[int, list]:
+        """
+        Restore the newest pre-save backup of each selected file.
+        Returns (success_count, failed_list).
+        failed_list contains tuples of (filename, error_message).
+        """
+        success_count = 0
+        failed_list = []
+
+        for idx in indexes:
+            if idx.row() < len(files):
+                file_obj = files[idx.row()]
+                try:
+                    file_obj.restore_backup()
+                    success_count += 1
+                except Exception as e:
+                    logger.error(f"Failed to restore backup for {file_obj.file_path.name}: {e}")
+                    failed_list.append((file_obj.file_path.name, str(e)))
+
+        return success_count, failed_list
+
+    @staticmethod
+    def _resolve_file_number(file_obj: ComicFile):
+        """Volume number from the Number field, falling back to the filename."""
+        num_str = file_obj.get_metadata("Number")
+        if not num_str:
+            num_val, _ = text_normalizer.number(file_obj.file_path.stem)
+        else:
+            num_val, _ = text_normalizer.number(num_str)
+        return num_val
+
+    @staticmethod
+    def _fetch_volume(scraper: BangumiScraper, vol_id, with_cover: bool):
+        """Fetch one volume's metadata and (optionally) cover. Runs on a prefetch thread."""
+        full_vol = scraper.get_subject_metadata(vol_id)
+        cover_data = None
+        if full_vol and with_cover:
+            # Metadata is already cached, so this only downloads the image
+            cover_data = scraper.get_subject_cover(vol_id)
+        return full_vol, cover_data
+
+    @staticmethod
+    def _build_volume_info(series_info: dict, series_tags: str, full_vol: dict, num_val, total_count: int) -> dict:
+        """Merge a volume's metadata over the series info for one file."""
+        final_info = series_info.copy()
+        vol_info = MetadataMapper.bangumi_to_comicinfo(full_vol)
+        final_info.update(vol_info)
+        final_info["Series"] = series_info["Series"]
+        final_info["Number"] = MetadataMapper._format_number(num_val)
+        final_info["Volume"] = MetadataMapper._format_number(num_val)
+        if total_count > 0:
+            final_info["Count"] = total_count
+        
+        final_info["Genre"] = series_tags
+        final_info["Tags"] = vol_info.get("Tags", "")
+        return final_info
+
     @staticmethod
     def apply_scraped_data(files: list[ComicFile], indexes: list, bangumi_data: dict, 
                           mode: str, options: dict, scraper: BangumiScraper, 
@@ -75,6 +240,10 @@ class CommandManager:
         """
         Apply scraped metadata to files.
         Handles Series and Volume modes, fetching extra data as needed.
+        Refresh mode ignores `bangumi_data` and re-fetches the subject each
+        file already links to in its Web field.
+        Covers are scaled/re-encoded per the cover policy on a worker pool as
+        they arrive, and set on the files before this returns.
         
         Returns:
             tuple: (success_count, failed_list)
@@ -108,6 +277,8 @@ class CommandManager:
                 allowed_keys.update(comic_keys)
 
         should_apply_cover = "Cover" in selected_fields
+        covers = CoverPreparer() if should_apply_cover else None
+        cancelled = False
         success_count = 0
         failed_list = []
 
@@ -127,70 +298,88 @@ class CommandManager:
             
             total_count = len(volume_map) if volume_map else 0
             
-            # 3. Apply to files
-            for i, idx in enumerate(indexes):
-                if progress_callback and progress_callback(i): # Check cancellation
-                    break
-                
+            # 3. Resolve each file's volume up front (numbers parsed in one batch)
+            files_by_volume = {}  # vol_id -> [(file_obj, num_val)]
+            unmatched = []
+            text_normalizer.numbers([files[idx.row()].get_metadata("Number") or files[idx.row()].file_path.stem
+                                     for idx in indexes if idx.row() < len(files)])
+            for idx in indexes:
                 if idx.row() >= len(files): continue
                 file_obj = files[idx.row()]
-                filename = file_obj.file_path.name
-                
                 try:
-                    # Determine number
-                    num_str = file_obj.get_metadata("Number")
-                    if not num_str:
-                        num_val, _ = get_number(file_obj.file_path.stem)
-                    else:
-                        num_val, _ = get_number(num_str)
-                    
-                    # Base info
-                    final_info = series_info.copy()
-                    final_info["Genre"] = series_tags
-                    final_info["Tags"] = ""
-                    
-                    volume_fetched = False
-                    # Match volume
-                    if num_val is not None and num_val in volume_map:
-                        vol_data = volume_map[num_val]
-                        try:
-                            full_vol = scraper.get_subject_metadata(vol_data['id'])
-                            if full_vol:
-                                vol_info = MetadataMapper.bangumi_to_comicinfo(full_vol)
-                                final_info.update(vol_info)
-                                final_info["Series"] = series_info["Series"]
-                                final_info["Number"] = MetadataMapper._format_number(num_val)
-                                final_info["Volume"] = MetadataMapper._format_number(num_val)
-                                if total_count > 0:
-                                    final_info["Count"] = total_count
-                                
-                                final_info["Genre"] = series_tags
-                                final_info["Tags"] = vol_info.get("Tags", "")
-                                volume_fetched = True
-                                
-                                if should_apply_cover:
-                                    cover_data = scraper.get_subject_cover(vol_data['id'])
-                                    if cover_data:
-                                        file_obj.set_custom_cover(cover_data)
-                            else:
-                                # API returned None (rate limit or error)
-                                failed_list.append((filename, "Rate limit or API error"))
-                                logger.warning(f"Failed to fetch metadata for {filename}: API returned None")
-                                continue
-                        except Exception as e:
-                            failed_list.append((filename, f"Volume fetch error: {str(e)}"))
-                            logger.warning(f"Failed to fetch volume details for {filename}: {e}")
-                            continue
-                    
-                    # Apply metadata
-                    for key, val in final_info.items():
-                        if key in allowed_keys and val:
-                            file_obj.set_metadata(key, val)
-                    
+                    num_val = CommandManager._resolve_file_number(file_obj)
+                except Exception as e:
+                    failed_list.append((file_obj.file_path.name, f"Unexpected error: {str(e)}"))
+                    logger.error(f"Unexpected error processing {file_obj.file_path.name}: {e}")
+                    continue
+                if num_val is not None and num_val in volume_map:
+                    files_by_volume.setdefault(volume_map[num_val]['id'], []).append((file_obj, num_val))
+                else:
+                    unmatched.append(file_obj)
+            
+            done = 0
+            
+            def apply_info(file_obj, info):
+                for key, val in info.items():
+                    if key in allowed_keys and val:
+                        file_obj.set_metadata(key, val)
+            
+            # Files without a matching volume only get series info
+            base_info = series_info.copy()
+            base_info["Genre"] = series_tags
+            base_info["Tags"] = ""
+            for file_obj in unmatched:
+                if progress_callback and progress_callback(done): # Check cancellation
+                    cancelled = True
+                    break
+                done += 1
+                try:
+                    apply_info(file_obj, base_info)
                     success_count += 1
                 except Exception as e:
-                    failed_list.append((filename, f"Unexpected error: {str(e)}"))
-                    logger.error(f"Unexpected error processing {filename}: {e}")
+                    failed_list.append((file_obj.file_path.name, f"Unexpected error: {str(e)}"))
+                    logger.error(f"Unexpected error processing {file_obj.file_path.name}: {e}")
+            
+            # 4. Prefetch volume metadata and covers concurrently (shared rate
+            #    budget and request coalescing apply), applying each volume
+            #    to its files as soon as it lands
+            if files_by_volume and not cancelled:
+                executor = ThreadPoolExecutor(max_workers=min(len(files_by_volume), Config.SCRAPER_PREFETCH_WORKERS),
+                                              thread_name_prefix="vol-prefetch")
+                try:
+                    futures = {executor.submit(CommandManager._fetch_volume, scraper, vol_id, should_apply_cover): vol_id
+                               for vol_id in files_by_volume}
+                    for future in as_completed(futures):
+                        vol_id = futures[future]
+                        try:
+                            full_vol, cover_data = future.result()
+                            error = None if full_vol else "Rate limit or API error"
+                        except Exception as e:
+                            full_vol, cover_data, error = None, None, f"Volume fetch error: {str(e)}"
+                        
+                        for file_obj, num_val in files_by_volume[vol_id]:
+                            if progress_callback and progress_callback(done): # Check cancellation
+                                cancelled = True
+                                break
+                            done += 1
+                            filename = file_obj.file_path.name
+                            if error:
+                                failed_list.append((filename, error))
+                                logger.warning(f"Failed to fetch volume details for {filename}: {error}")
+                                continue
+                            try:
+                                apply_info(file_obj, CommandManager._build_volume_info(
+                                    series_info, series_tags, full_vol, num_val, total_count))
+                                if cover_data:
+                                    covers.add(file_obj, cover_data)
+                                success_count += 1
+                            except Exception as e:
+                                failed_list.append((filename, f"Unexpected error: {str(e)}"))
+                                logger.error(f"Unexpected error processing {filename}: {e}")
+                        if cancelled:
+                            break
+                finally:
+                    executor.shutdown(wait=not cancelled, cancel_futures=True)
 
         elif mode == 'volume':
             # 1. Fetch Full Volume Info
@@ -230,7 +419,9 @@ class CommandManager:
             
             # 3. Apply to ALL selected files
             for i, idx in enumerate(indexes):
-                if progress_callback and progress_callback(i): break
+                if progress_callback and progress_callback(i):
+                    cancelled = True
+                    break
                 
                 if idx.row() >= len(files): continue
                 file_obj = files[idx.row()]
@@ -246,11 +437,80 @@ class CommandManager:
                             file_obj.set_metadata(key, val)
                     
                     if cover_data:
-                        file_obj.set_custom_cover(cover_data)
+                        covers.add(file_obj, cover_data)
                         
                     success_count += 1
                 except Exception as e:
                     failed_list.append((filename, f"Apply error: {str(e)}"))
                     logger.error(f"Failed to apply metadata to {filename}: {e}")
 
+        elif mode == 'refresh':
+            # Re-fetch each file's own subject by the id in its Web link:
+            # no search or re-ranking, one request per distinct subject
+            files_by_subject = {}  # subject_id -> [file_obj]
+            for idx in indexes:
+                if idx.row() >= len(files): continue
+                file_obj = files[idx.row()]
+                subject_id = MetadataMapper.parse_subject_id(file_obj.get_metadata("Web"))
+                if subject_id is None:
+                    failed_list.append((file_obj.file_path.name, "No Bangumi link in Web field"))
+                    continue
+                files_by_subject.setdefault(subject_id, []).append(file_obj)
+            
+            done = 0
+            if files_by_subject:
+                executor = ThreadPoolExecutor(max_workers=min(len(files_by_subject), Config.SCRAPER_PREFETCH_WORKERS),
+                                              thread_name_prefix="refresh")
+                try:
+                    futures = {executor.submit(CommandManager._fetch_volume, scraper, subject_id, should_apply_cover): subject_id
+                               for subject_id in files_by_subject}
+                    for future in as_completed(futures):
+                        try:
+                            full_data, cover_data = future.result()
+                            error = None if full_data else "Rate limit or API error"
+                        except Exception as e:
+                            full_data, cover_data, error = None, None, f"Subject fetch error: {str(e)}"
+                        
+                        info = MetadataMapper.bangumi_to_comicinfo(full_data) if full_data else {}
+                        if full_data and full_data.get("series"):
+                            keep_keys = {"Number", "Volume", "Count"}
+                        else:
+                            # A volume's subject doesn't know its series name, numbering or series tags
+                            keep_keys = {"Series", "Number", "Volume", "Count", "Genre"}
+                        
+                        for file_obj in files_by_subject[futures[future]]:
+                            if progress_callback and progress_callback(done): # Check cancellation
+                                cancelled = True
+                                break
+                            done += 1
+                            filename = file_obj.file_path.name
+                            if error:
+                                failed_list.append((filename, error))
+                                logger.warning(f"Failed to refresh {filename}: {error}")
+                                continue
+                            try:
+                                for key, val in info.items():
+                                    if key in allowed_keys and val:
+                                        if key in keep_keys and file_obj.get_metadata(key):
+                                            continue
+                                        file_obj.set_metadata(key, val)
+                                if cover_data:
+                                    covers.add(file_obj, cover_data)
+                                success_count += 1
+                            except Exception as e:
+                                failed_list.append((filename, f"Apply error: {str(e)}"))
+                                logger.error(f"Failed to apply metadata to {filename}: {e}")
+                        if cancelled:
+                            break
+                finally:
+                    executor.shutdown(wait=not cancelled, cancel_futures=True)
+
+        if covers is not None:
+            # All covers are prepared before the caller starts saving
+            if cancelled:
+                covers.cancel()
+            applied, kept = covers.apply()
+            if kept:
+                logger.info(f"Set {applied} scraped cover(s); kept {kept} larger embedded cover(s)")
+
         return success_count, failed_list
@@ -0,0 +1,208 @@
+"""
+Size and format policy for scraped covers.
+
+Bangumi's 'large' image is the original upload, often a multi-megabyte
+PNG. Embedding it as-is bloats the archive and always forces a repack.
+CoverPolicy scales covers down to a maximum size and re-encodes them in
+the configured format and quality, passing images through untouched when
+they already comply. It also refuses to replace an embedded cover with a
+lower-resolution one.
+
+CoverPreparer runs that work on a thread pool (Pillow releases the GIL
+while decoding, resizing and encoding) while the rest of a series is
+still downloading, so every cover is ready before the save starts.
+"""
+
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from io import BytesIO
+from typing import Optional, Tuple
+
+from PIL import Image, ImageOps
+
+from config import Config
+from utils.logger import logger
+
+_ORIENTATION_TAG = 0x0112
+
+
+class PreparedCover:
+    """Cover bytes ready to embed, with their pixel size (None if the image couldn't be decoded)."""
+
+    __slots__ = ("data", "size", "source_size", "transcoded")
+
+    def __init__(self, data: bytes, size: Optional[Tuple[int, int]],
+                 source_size: Optional[Tuple[int, int]], transcoded: bool):
+        self.data = data
+        self.size = size
+        self.source_size = source_size
+        self.transcoded = transcoded
+
+
+class CoverPolicy:
+    """
+    How scraped covers are embedded.
+
+    Args:
+        max_width / max_height: Size limit, 0 for none (default: Config.COVER_MAX_*)
+        image_format: 'JPEG', 'WEBP', 'PNG', or '' to keep the source format
+        quality: JPEG/WebP quality
+        keep_larger_existing: Skip covers smaller than the one already embedded
+    """
+
+    ENCODERS = ("JPEG", "WEBP", "PNG")
+
+    def __init__(self, max_width: int = None, max_height: int = None, image_format: str = None,
+                 quality: int = None, keep_larger_existing: bool = None):
+        self.max_width = Config.COVER_MAX_WIDTH if max_width is None else max_width
+        self.max_height = Config.COVER_MAX_HEIGHT if max_height is None else max_height
+        image_format = Config.COVER_FORMAT if image_format is None else image_format
+        self.image_format = (image_format or "").upper()
+        if self.image_format == "JPG":
+            self.image_format = "JPEG"
+        if self.image_format and self.image_format not in self.ENCODERS:
+            logger.warning(f"Unsupported cover format {image_format!r}, using JPEG")
+            self.image_format = "JPEG"
+        self.quality = Config.COVER_QUALITY if quality is None else quality
+        self.keep_larger_existing = (Config.COVER_KEEP_LARGER_EXISTING if keep_larger_existing is None
+                                     else keep_larger_existing)
+
+    def _limit(self, size: Tuple[int, int]) -> Tuple[int, int]:
+        return (self.max_width or size[0], self.max_height or size[1])
+
+    def fits(self, size: Tuple[int, int]) -> bool:
+        limit = self._limit(size)
+        return size[0] <= limit[0] and size[1] <= limit[1]
+
+    def is_downgrade(self, size: Optional[Tuple[int, int]], existing: Optional[Tuple[int, int]]) -> bool:
+        """Whether embedding a cover of `size` would lower the resolution of the `existing` one."""
+        if not self.keep_larger_existing or not size or not existing:
+            return False
+        return existing[0] * existing[1] > size[0] * size[1]
+
+    def prepare(self, data: bytes) -> PreparedCover:
+        """
+        Scale and re-encode `data` per the policy.
+
+        Images that already fit and are in the target format are returned
+        unchanged, as is a re-encode that came out larger without any
+        scaling. Undecodable data is also returned unchanged, as before
+        the policy existed.
+        """
+        try:
+            with Image.open(BytesIO(data)) as img:
+                source_size = img.size
+                source_format = img.format
+                target = self.image_format or source_format
+                if target not in self.ENCODERS:
+                    target = "JPEG"  # GIF/BMP/... sources
+                fits = self.fits(source_size)
+                if fits and target == source_format:
+                    return PreparedCover(data, source_size, source_size, False)
+
+                if not fits:
+                    limit = self._limit(source_size)
+                    # JPEG decodes straight at a reduced scale when asked for less
+                    img.draft("RGB", limit)
+                    img.thumbnail(limit, Image.Resampling.LANCZOS)
+                image = self._normalize(img, target)
+                size = image.size
+                encoded = self._encode(image, target)
+        except Exception as e:
+            logger.warning(f"Could not process cover image ({e}), embedding it unchanged")
+            return PreparedCover(data, None, None, False)
+
+        if fits and len(encoded) >= len(data):
+            return PreparedCover(data, source_size, source_size, False)
+        return PreparedCover(encoded, size, source_size, True)
+
+    def _encode(self, image: Image.Image, target: str) -> bytes:
+        output = BytesIO()
+        if target == "JPEG":
+            image.save(output, format="JPEG", quality=self.quality, optimize=True)
+        elif target == "WEBP":
+            image.save(output, format="WEBP", quality=self.quality, method=4)
+        else:
+            image.save(output, format="PNG", optimize=True)
+        return output.getvalue()
+
+    @staticmethod
+    def _normalize(img: Image.Image, target: str) -> Image.Image:
+        """Apply EXIF rotation (dropped on re-encode) and convert to a mode `target` can store."""
+        if img.getexif().get(_ORIENTATION_TAG, 1) != 1:
+            img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        if target == "JPEG":
+            if has_alpha:
+                rgba = img.convert("RGBA")
+                flat = Image.new("RGB", rgba.size, (255, 255, 255))
+                flat.paste(rgba, mask=rgba.getchannel("A"))
+                return flat
+            return img if img.mode in ("RGB", "L") else img.convert("RGB")
+        if target == "WEBP":
+            if has_alpha:
+                return img if img.mode == "RGBA" else img.convert("RGBA")
+            return img if img.mode == "RGB" else img.convert("RGB")
+        return img if img.mode in ("RGB", "RGBA", "L", "LA", "P") else img.convert("RGB")
+
+
+class CoverPreparer:
+    """
+    Prepares the scraped covers of one apply batch on a worker pool.
+
+    add() queues work as soon as a cover is downloaded. Each distinct
+    image is transcoded once however many files share it. Each file's
+    embedded cover size is read in parallel, from the image header only.
+    apply() waits for the queued work and sets the covers that pass the
+    policy.
+    """
+
+    def __init__(self, policy: CoverPolicy = None, workers: int = None):
+        self.policy = policy or CoverPolicy()
+        self._executor = ThreadPoolExecutor(max_workers=workers or Config.COVER_TRANSCODE_WORKERS,
+                                            thread_name_prefix="cover-prep")
+        self._transcodes = {}  # id(data) -> (data, future); data kept so the id stays unique
+        self._pending = []  # (file_obj, transcode future, existing size future or None)
+
+    def add(self, file_obj, data: bytes):
+        if not data:
+            return
+        entry = self._transcodes.get(id(data))
+        if entry is None:
+            entry = (data, self._executor.submit(self.policy.prepare, data))
+            self._transcodes[id(data)] = entry
+        existing = None
+        if self.policy.keep_larger_existing:
+            existing = self._executor.submit(file_obj.get_embedded_cover_size)
+        self._pending.append((file_obj, entry[1], existing))
+
+    def cancel(self):
+        """Drop work that hasn't started; apply() then only sets covers that are already prepared."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def apply(self) -> Tuple[int, int]:
+        """
+        Set prepared covers on their files.
+
+        Returns:
+            tuple: (covers set, files whose larger embedded cover was kept)
+        """
+        applied = kept = 0
+        try:
+            for file_obj, prepared_future, existing_future in self._pending:
+                try:
+                    prepared = prepared_future.result()
+                    existing = existing_future.result() if existing_future is not None else None
+                except CancelledError:
+                    continue
+                if self.policy.is_downgrade(prepared.size, existing):
+                    logger.info(f"Keeping the embedded {existing[0]}x{existing[1]} cover of "
+                                f"{file_obj.file_path.name} over a {prepared.size[0]}x{prepared.size[1]} one")
+                    kept += 1
+                    continue
+                file_obj.set_custom_cover(prepared.data)
+                applied += 1
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._pending = []
+            self._transcodes = {}
+        return applied, kept
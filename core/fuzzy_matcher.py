@@ -0,0 +1,157 @@
+"""
+Batch fuzzy name matching.
+
+NameMatcher scores one query against every name and alias of many
+subjects in a single call instead of one fuzz.ratio per pair. Names are
+normalized once through the shared text normalizer (simplified
+Chinese, NFKC width folding, case-folded) when the matcher is built,
+so traditional/simplified and full-width/half-width spellings compare
+equal.
+
+With rapidfuzz the whole choice list is scored in C (process.extract).
+Without it a character n-gram index shortlists the names that share the
+most n-grams with the query and only those are scored with difflib,
+which gives the same ratio as fuzz.ratio.
+"""
+
+import difflib
+import heapq
+from collections import defaultdict
+
+from config import Config
+from utils.logger import logger
+from utils.text_normalizer import text_normalizer
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+    logger.warning("rapidfuzz module not found. Fuzzy matching will use the slower n-gram fallback.")
+
+
+def normalize_name(name: str) -> str:
+    """Comparison form of a name: NFKC width-folded, simplified Chinese, case-folded."""
+    return text_normalizer.for_compare(name) if name else ""
+
+
+def ratio(a: str, b: str) -> float:
+    """fuzz.ratio on two already-normalized strings (0-100)."""
+    if fuzz is not None:
+        return fuzz.ratio(a, b)
+    if not a and not b:
+        return 100.0
+    return difflib.SequenceMatcher(None, a, b).ratio() * 100
+
+
+def best_ratio(query: str, names) -> int:
+    """Best fuzz.ratio of `query` against any of `names` (normalizes both)."""
+    query = normalize_name(query)
+    choices = [n for n in (normalize_name(name) for name in names if name) if n]
+    if not choices:
+        return 0
+    if process is not None:
+        best = process.extractOne(query, choices, scorer=fuzz.ratio)
+        return round(best[1]) if best else 0
+    return round(max(ratio(query, c) for c in choices))
+
+
+def _ngrams(text: str, n: int) -> set:
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class NameMatcher:
+    """
+    Scores queries against a fixed set of (key, names) entries.
+
+    Args:
+        entries: Iterable of (key, names) where names is an iterable of strings
+            (e.g. subject id -> name, name_cn and aliases)
+    """
+
+    def __init__(self, entries=()):
+        self._names = []  # Normalized names, flat
+        self._owners = []  # Key of each name
+        seen = set()
+        for key, names in entries:
+            for name in names:
+                norm = normalize_name(name)
+                if norm and (key, norm) not in seen:
+                    seen.add((key, norm))
+                    self._names.append(norm)
+                    self._owners.append(key)
+
+        self._ngram_index = None
+        if process is None:
+            self._build_ngram_index()
+
+    @classmethod
+    def from_normalized(cls, pairs):
+        """Build from (key, normalized_name) pairs, e.g. rows of an index that stores normalized names."""
+        matcher = cls()
+        for key, name in pairs:
+            if name:
+                matcher._names.append(name)
+                matcher._owners.append(key)
+        if process is None:
+            matcher._build_ngram_index()
+        return matcher
+
+    def __len__(self):
+        return len(self._names)
+
+    def _build_ngram_index(self):
+        n = Config.FUZZY_NGRAM_SIZE
+        index = defaultdict(list)
+        for i, name in enumerate(self._names):
+            for gram in _ngrams(name, n):
+                index[gram].append(i)
+        self._ngram_index = index
+
+    def _shortlist(self, query: str) -> list:
+        """Indexes of the names sharing the most n-grams with the query."""
+        counts = defaultdict(int)
+        for gram in _ngrams(query, Config.FUZZY_NGRAM_SIZE):
+            for i in self._ngram_index.get(gram, ()):
+                counts[i] += 1
+        return heapq.nlargest(Config.FUZZY_SHORTLIST_SIZE, counts, key=counts.get)
+
+    def _name_scores(self, query: str, score_cutoff: float, limit: int = None):
+        """(name index, score) pairs at or above the cutoff, best `limit` names if given."""
+        if process is not None:
+            return [(i, score) for _, score, i in
+                    process.extract(query, self._names, scorer=fuzz.ratio,
+                                    limit=limit, score_cutoff=score_cutoff)]
+        scored = ((i, ratio(query, self._names[i])) for i in self._shortlist(query))
+        scored = [(i, s) for i, s in scored if s >= score_cutoff]
+        return heapq.nlargest(limit, scored, key=lambda p: p[1]) if limit else scored
+
+    def _best_per_key(self, pairs) -> dict:
+        best = {}
+        for i, score in pairs:
+            key = self._owners[i]
+            if score > best.get(key, -1):
+                best[key] = score
+        return best
+
+    def score(self, query: str, score_cutoff: float = 0) -> dict:
+        """Best score per key for one query: {key: score}."""
+        query = normalize_name(query)
+        if not query or not self._names:
+            return {}
+        return self._best_per_key(self._name_scores(query, score_cutoff))
+
+    def top(self, query: str, limit: int = 10, score_cutoff: float = 0) -> list:
+        """The `limit` best keys for a query: [(key, score)], best first."""
+        query = normalize_name(query)
+        if not query or not self._names:
+            return []
+        # Keys own several names: over-fetch so `limit` distinct keys survive,
+        # without materializing a score for every name
+        fetch = limit * Config.FUZZY_TOP_OVERFETCH
+        pairs = self._name_scores(query, score_cutoff, fetch)
+        best = self._best_per_key(pairs)
+        if len(best) < limit and len(pairs) == fetch:
+            best = self._best_per_key(self._name_scores(query, score_cutoff))
+        return heapq.nlargest(limit, best.items(), key=lambda kv: kv[1])
@@ -0,0 +1,267 @@
+"""
+Persistent HTTP response cache for Bangumi API calls and cover downloads.
+
+Responses are stored in a single SQLite file next to settings.json so they
+survive restarts. Each entry has a TTL chosen per endpoint; once it expires
+the scraper revalidates it with If-None-Match / If-Modified-Since and a
+304 reply simply extends the TTL. Total size is capped by evicting the
+least recently used entries.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from config import Config
+from utils.logger import logger
+
+
+class CacheEntry:
+    """A cached response body plus the validators needed to revalidate it."""
+
+    __slots__ = ("key", "body", "etag", "last_modified", "expires_at")
+
+    def __init__(self, key, body, etag, last_modified, expires_at):
+        self.key = key
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def conditional_headers(self) -> dict:
+        """Request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    Thread-safe SQLite-backed response cache.
+
+    Keys are strings chosen by the caller, e.g. "subject:12345" or
+    "cover:https://...". `endpoint` names the TTL class of an entry
+    ('subject', 'related', 'search', 'cover').
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            endpoint TEXT NOT NULL,
+            body BLOB NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access);
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = None):
+        self.path = path
+        self.max_bytes = max_bytes or Config.HTTP_CACHE_MAX_MB * 1024 * 1024
+        self._conn = None
+        self._lock = threading.Lock()
+        self._writes_since_trim = 0
+
+    # ==================== Connection ====================
+
+    def _default_path(self) -> str:
+        from core.settings_manager import settings_manager
+        base_path = os.path.dirname(settings_manager.filename)
+        return os.path.join(base_path, Config.HTTP_CACHE_FILE)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use. Caller must hold the lock."""
+        if self._conn is None:
+            if self.path is None:
+                self.path = self._default_path()
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    @staticmethod
+    def is_enabled() -> bool:
+        from core.settings_manager import settings_manager
+        return bool(settings_manager.get("http_cache_enabled", Config.HTTP_CACHE_ENABLED))
+
+    @staticmethod
+    def ttl_for(endpoint: str) -> float:
+        """TTL in seconds for an endpoint class."""
+        days = Config.HTTP_CACHE_TTL_DAYS.get(endpoint, Config.HTTP_CACHE_TTL_DAYS["default"])
+        return days * 86400
+
+    # ==================== Entries ====================
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for `key` (fresh or stale), or None."""
+        with self._lock:
+            try:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT body, etag, last_modified, expires_at FROM entries WHERE key = ?",
+                    (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"HTTP cache read failed for {key}: {e}")
+                return None
+        return CacheEntry(key, row[0], row[1], row[2], row[3])
+
+    def put(self, key: str, endpoint: str, body: bytes, etag: str = None,
+            last_modified: str = None, ttl: float = None):
+        """Store a response body, replacing any previous entry for `key`."""
+        now = time.time()
+        ttl = self.ttl_for(endpoint) if ttl is None else ttl
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries "
+                    "(key, endpoint, body, etag, last_modified, fetched_at, expires_at, last_access, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, endpoint, sqlite3.Binary(body), etag, last_modified,
+                     now, now + ttl, now, len(body)))
+                conn.commit()
+                self._writes_since_trim += 1
+                if self._writes_since_trim >= Config.HTTP_CACHE_TRIM_INTERVAL:
+                    self._trim_locked()
+            except sqlite3.Error as e:
+                logger.warning(f"HTTP cache write failed for {key}: {e}")
+
+    def refresh(self, key: str, endpoint: str, etag: str = None, last_modified: str = None):
+        """Extend the TTL of an entry after a 304 Not Modified."""
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "UPDATE entries SET expires_at = ?, last_access = ?, "
+                    "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+                    "WHERE key = ?",
+                    (now + self.ttl_for(endpoint), now, etag, last_modified, key))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"HTTP cache refresh failed for {key}: {e}")
+
+    def _trim_locked(self):
+        """Evict least recently used entries until under the size limit."""
+        self._writes_since_trim = 0
+        conn = self._connection()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Trim to 90% so we don't evict again on the very next write
+        target = self.max_bytes * 0.9
+        removed = 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            if total <= target:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            removed += 1
+        conn.commit()
+        logger.info(f"HTTP cache trimmed {removed} entries")
+
+    def trim(self):
+        with self._lock:
+            try:
+                self._trim_locked()
+            except sqlite3.Error as e:
+                logger.warning(f"HTTP cache trim failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM entries")
+            conn.commit()
+            conn.execute("VACUUM")
+        logger.info("HTTP cache cleared")
+
+    def stats(self) -> dict:
+        """Entry count and total body size, overall and per endpoint."""
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(
+                "SELECT endpoint, COUNT(*), COALESCE(SUM(size), 0) FROM entries GROUP BY endpoint").fetchall()
+        endpoints = {endpoint: {"entries": count, "bytes": size} for endpoint, count, size in rows}
+        return {
+            "entries": sum(e["entries"] for e in endpoints.values()),
+            "bytes": sum(e["bytes"] for e in endpoints.values()),
+            "endpoints": endpoints,
+        }
+
+    # ==================== Export / Import ====================
+
+    def export_bundle(self, path: str) -> int:
+        """
+        Write the whole cache to a standalone SQLite file.
+
+        Returns:
+            int: Number of entries exported
+        """
+        if os.path.exists(path):
+            os.remove(path)
+        with self._lock:
+            conn = self._connection()
+            target = sqlite3.connect(path)
+            try:
+                conn.backup(target)
+                count = target.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            finally:
+                target.close()
+        logger.info(f"Exported {count} HTTP cache entries to {path}")
+        return count
+
+    def import_bundle(self, path: str) -> int:
+        """
+        Merge entries from a bundle written by export_bundle.
+
+        An imported entry only replaces an existing one if it was fetched
+        more recently. Returns the number of entries imported.
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("ATTACH DATABASE ? AS bundle", (path,))
+            try:
+                before = conn.total_changes
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries "
+                    "SELECT b.key, b.endpoint, b.body, b.etag, b.last_modified, "
+                    "b.fetched_at, b.expires_at, b.last_access, b.size "
+                    "FROM bundle.entries b LEFT JOIN main.entries m ON m.key = b.key "
+                    "WHERE m.key IS NULL OR b.fetched_at > m.fetched_at")
+                conn.commit()
+                count = conn.total_changes - before
+            finally:
+                conn.execute("DETACH DATABASE bundle")
+            self._trim_locked()
+        logger.info(f"Imported {count} HTTP cache entries from {path}")
+        return count
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global instance
+http_cache = HttpCache()
@@ -0,0 +1,204 @@
+"""
+Shared cover image fetching for the UI.
+
+Result lists used to start a thread with a bare requests.get for every
+cover. ImageFetcher runs all image downloads on one bounded worker pool,
+keeps a keep-alive session per worker, and answers repeats from an
+in-memory LRU and the persistent HTTP cache (under the same "cover:<url>"
+keys the scraper uses, so a cover seen in the search dialog is not
+downloaded again when it is applied). Requests can be cancelled until
+their download starts; a cancelled request never calls back.
+
+Covers come from the image CDN, not the API, so they don't draw from the
+API request budget.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+from core.http_cache import http_cache
+from core.single_flight import request_flights
+from utils.logger import logger
+
+
+def normalize_image_url(url: str) -> str:
+    """Bangumi returns protocol-relative image links in some payloads."""
+    if url and url.startswith("//"):
+        return "https:" + url
+    return url or ""
+
+
+class ImageRequest:
+    """Handle for one fetch() call."""
+
+    __slots__ = ("url", "callback", "cancelled", "future")
+
+    def __init__(self, url: str, callback: Callable[[Optional[bytes]], None]):
+        self.url = url
+        self.callback = callback
+        self.cancelled = False
+        self.future = None
+
+    def cancel(self):
+        """Drop the request; skipped if not started, its callback suppressed if it was."""
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class ImageFetcher:
+    """
+    Thread-safe image downloader with a bounded pool and two cache levels.
+
+    Args:
+        workers: Concurrent downloads (default: Config.IMAGE_FETCH_WORKERS)
+        memory_mb: In-memory cache budget (default: Config.IMAGE_MEMORY_CACHE_MB)
+    """
+
+    def __init__(self, workers: int = None, memory_mb: int = None):
+        self.workers = workers or Config.IMAGE_FETCH_WORKERS
+        self.memory_limit = (memory_mb or Config.IMAGE_MEMORY_CACHE_MB) * 1024 * 1024
+        self._executor = None
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # url -> bytes, least recently used first
+        self._memory_bytes = 0
+        self._local = threading.local()
+
+    # ==================== Sessions ====================
+
+    def _session(self) -> requests.Session:
+        """One keep-alive session per worker thread (Session isn't thread-safe)."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = "DAZAO/ComicMetaEditor"
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=2)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._local.session = session
+        return session
+
+    # ==================== Memory Cache ====================
+
+    def cached(self, url: str) -> Optional[bytes]:
+        """Image bytes if they are in the memory cache."""
+        with self._lock:
+            data = self._memory.get(url)
+            if data is not None:
+                self._memory.move_to_end(url)
+            return data
+
+    def _remember(self, url: str, data: bytes):
+        if not data or len(data) > self.memory_limit:
+            return
+        with self._lock:
+            old = self._memory.pop(url, None)
+            if old is not None:
+                self._memory_bytes -= len(old)
+            self._memory[url] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.memory_limit:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    # ==================== Fetching ====================
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Download (or look up) an image on the calling thread."""
+        url = normalize_image_url(url)
+        if not url:
+            return None
+        data = self.cached(url)
+        if data is not None:
+            return data
+        return request_flights.do(f"cover:{url}", self._load, url)
+
+    def _load(self, url: str) -> Optional[bytes]:
+        data = self.cached(url)
+        if data is not None:
+            return data
+
+        key = f"cover:{url}"
+        use_cache = http_cache.is_enabled()
+        entry = http_cache.get(key) if use_cache else None
+        if entry is not None and entry.is_fresh:
+            data = entry.body
+        else:
+            headers = entry.conditional_headers() if entry is not None else {}
+            try:
+                response = self._session().get(url, headers=headers, timeout=Config.get_request_timeout())
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                if entry is None:
+                    raise
+                logger.warning(f"Network unavailable, using stale cached image {url}")
+                data = entry.body
+            else:
+                if response.status_code == 304 and entry is not None:
+                    http_cache.refresh(key, "cover", response.headers.get("ETag"),
+                                       response.headers.get("Last-Modified"))
+                    data = entry.body
+                else:
+                    response.raise_for_status()
+                    data = response.content
+                    if use_cache:
+                        http_cache.put(key, "cover", data, response.headers.get("ETag"),
+                                       response.headers.get("Last-Modified"))
+
+        self._remember(url, data)
+        return data
+
+    def fetch(self, url: str, callback: Callable[[Optional[bytes]], None]) -> ImageRequest:
+        """
+        Fetch an image in the background.
+
+        `callback(data)` receives the bytes (None on failure) on a worker
+        thread, or immediately on the calling thread for a memory cache hit.
+        """
+        url = normalize_image_url(url)
+        request = ImageRequest(url, callback)
+        data = self.cached(url) if url else None
+        if data is not None or not url:
+            callback(data)
+            return request
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image-fetch")
+            executor = self._executor
+        request.future = executor.submit(self._run, request)
+        return request
+
+    def _run(self, request: ImageRequest):
+        if request.cancelled:
+            return
+        try:
+            data = self.get(request.url)
+        except Exception as e:
+            logger.warning(f"Failed to load image {request.url}: {e}")
+            data = None
+        if not request.cancelled:
+            request.callback(data)
+
+    # ==================== Maintenance ====================
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def shutdown(self):
+        """Stop the pool (queued downloads are dropped). A later fetch() starts a new one."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global instance
+image_fetcher = ImageFetcher()
@@ -0,0 +1,136 @@
+import ctypes
+import os
+import platform
+import sys
+import threading
+import time
+
+from config import Config
+from utils.logger import logger
+
+# ioprio_set(2) has no libc wrapper; syscall numbers per architecture
+_IOPRIO_SET_SYSCALL = {
+    "x86_64": 251, "amd64": 251,
+    "i386": 289, "i686": 289,
+    "aarch64": 30, "arm64": 30, "riscv64": 30,
+    "armv7l": 314, "armv6l": 314,
+    "ppc64le": 273, "ppc64": 273,
+}
+_IOPRIO_WHO_PROCESS = 1  # A thread id counts as a "process" here
+_IOPRIO_CLASS_IDLE = 3
+_IOPRIO_CLASS_SHIFT = 13
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket measured in bytes.
+
+    Callers "borrow" tokens: acquire() always deducts immediately and then
+    sleeps for exactly as long as the debt takes to refill, so concurrent
+    savers share the budget fairly without busy waiting.
+    """
+
+    def __init__(self, rate_bytes_per_sec: float = 0, burst_seconds: float = 1.0):
+        self._lock = threading.Lock()
+        self.burst_seconds = burst_seconds
+        self.set_rate(rate_bytes_per_sec)
+
+    def set_rate(self, rate_bytes_per_sec: float):
+        """Change the refill rate. A rate of 0 disables throttling."""
+        with self._lock:
+            self.rate = max(0.0, float(rate_bytes_per_sec or 0))
+            self.capacity = self.rate * self.burst_seconds
+            self.tokens = self.capacity
+            self.last_refill = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def acquire(self, amount: int):
+        """Consume `amount` bytes of budget, sleeping if the bucket is in debt."""
+        if amount <= 0 or not self.enabled:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            self.tokens -= amount
+            wait_time = -self.tokens / self.rate if self.tokens < 0 else 0
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+class IOThrottle:
+    """
+    Process-wide I/O quality-of-service for background saves.
+
+    One read bucket and one write bucket are shared by every SaveRunnable,
+    so the configured MB/s is the total for the batch, not per thread.
+    """
+
+    def __init__(self):
+        self.read_bucket = TokenBucket()
+        self.write_bucket = TokenBucket()
+        self.low_priority = False
+        self.configure(Config.IO_READ_LIMIT_MBPS, Config.IO_WRITE_LIMIT_MBPS, Config.IO_LOW_PRIORITY)
+
+    def configure(self, read_mbps: float = 0, write_mbps: float = 0, low_priority: bool = False):
+        """
+        Args:
+            read_mbps: Read limit in MB/s (0 = unlimited)
+            write_mbps: Write limit in MB/s (0 = unlimited)
+            low_priority: Lower the I/O priority of save threads (Linux only)
+        """
+        self.read_bucket.set_rate((read_mbps or 0) * 1024 * 1024)
+        self.write_bucket.set_rate((write_mbps or 0) * 1024 * 1024)
+        self.low_priority = bool(low_priority)
+
+    def configure_from_settings(self):
+        """Load limits from settings.json, falling back to Config defaults."""
+        from core.settings_manager import settings_manager
+        self.configure(
+            settings_manager.get("io_read_limit_mbps", Config.IO_READ_LIMIT_MBPS),
+            settings_manager.get("io_write_limit_mbps", Config.IO_WRITE_LIMIT_MBPS),
+            settings_manager.get("io_low_priority", Config.IO_LOW_PRIORITY),
+        )
+        if self.read_bucket.enabled or self.write_bucket.enabled or self.low_priority:
+            logger.info(f"Save I/O limits: read={self.read_bucket.rate / 1024 / 1024:.1f} MB/s, "
+                        f"write={self.write_bucket.rate / 1024 / 1024:.1f} MB/s, low_priority={self.low_priority}")
+
+    def throttle_read(self, num_bytes: int):
+        self.read_bucket.acquire(num_bytes)
+
+    def throttle_write(self, num_bytes: int):
+        self.write_bucket.acquire(num_bytes)
+
+    def apply_thread_priority(self):
+        """
+        Put the calling thread in the idle I/O class (like `ionice -c3`).
+
+        Linux scopes I/O priority per thread, so this only affects the save
+        worker that calls it. Calls ioprio_set directly, so no extra package
+        is needed; does nothing on other platforms.
+        """
+        if not self.low_priority or not sys.platform.startswith("linux"):
+            return
+        syscall_nr = _IOPRIO_SET_SYSCALL.get(platform.machine().lower())
+        if syscall_nr is None:
+            logger.warning(f"Low I/O priority is not supported on {platform.machine()}")
+            return
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            result = libc.syscall(syscall_nr, _IOPRIO_WHO_PROCESS, threading.get_native_id(),
+                                  _IOPRIO_CLASS_IDLE << _IOPRIO_CLASS_SHIFT)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"Failed to lower I/O priority: {e}")
+            return
+        if result != 0:
+            errno = ctypes.get_errno()
+            logger.warning(f"Failed to lower I/O priority: {os.strerror(errno)}")
+
+
+# Global instance
+io_throttle = IOThrottle()
@@ -0,0 +1,420 @@
+"""
+Offline Bangumi subject index built from the Bangumi Archive dumps.
+
+The archive (https://github.com/bangumi/Archive) publishes periodic zip
+files holding one JSON object per line for every subject and subject
+relation. import_dump() loads the book subjects and their relations into
+a SQLite file next to settings.json. LocalBangumiScraper then answers
+searches, subject metadata and related subjects from disk, and only falls
+back to the online API for subjects newer than the dump and for covers
+(the dump has no image URLs).
+"""
+
+import io
+import json
+import os
+import sqlite3
+import threading
+import zipfile
+from typing import Optional
+
+from config import Config
+from core.fuzzy_matcher import NameMatcher, normalize_name
+from core.rate_scheduler import RequestPriority
+from core.scraper import (BangumiScraper, SubjectPlatform, SubjectRelation,
+                          resort_search_list, parse_series_volumes)
+from utils.logger import logger
+from utils.text_normalizer import text_normalizer
+
+SUBJECT_TYPE_BOOK = 1
+
+SUBJECTS_MEMBER = "subject.jsonlines"
+RELATIONS_MEMBER = "subject-relations.jsonlines"
+
+# Relation codes as the API names them (books); unknown codes keep their number
+_RELATION_NAMES = {
+    SubjectRelation.SERIES.value: SubjectRelation.SERIES.cn,
+    SubjectRelation.OFFPRINT.value: SubjectRelation.OFFPRINT.cn,
+    SubjectRelation.ALBUM.value: SubjectRelation.ALBUM.cn,
+    1005: "前传",
+    1006: "续集",
+    1007: "番外篇",
+}
+
+
+# ==================== Dump Conversion ====================
+
+def parse_wiki_infobox(wiki: str) -> list:
+    """
+    Parse a raw wiki infobox ("{{Infobox ...|key= value ...}}") into the
+    list form the API returns: [{"key": ..., "value": str | [{"k"?, "v"}]}].
+    """
+    if not wiki:
+        return []
+
+    items = []
+    current_list = None
+    for raw in wiki.replace("\r", "").split("\n"):
+        line = raw.strip()
+        if current_list is not None:
+            if line == "}":
+                current_list = None
+            elif line.startswith("[") and line.endswith("]"):
+                inner = line[1:-1]
+                if "|" in inner:
+                    k, v = inner.split("|", 1)
+                    current_list.append({"k": k.strip(), "v": v.strip()})
+                else:
+                    current_list.append({"v": inner.strip()})
+            continue
+
+        if not line.startswith("|") or "=" not in line:
+            continue
+        key, value = line[1:].split("=", 1)
+        key, value = key.strip(), value.strip()
+        if value == "{":
+            current_list = []
+            items.append({"key": key, "value": current_list})
+        elif value:
+            items.append({"key": key, "value": value})
+    return items
+
+
+def subject_from_dump(record: dict) -> dict:
+    """Convert one archive subject line into the shape of /v0/subjects/{id}."""
+    platform = SubjectPlatform.parse(record.get("platform"))
+    return {
+        "id": record["id"],
+        "type": record.get("type"),
+        "name": record.get("name") or "",
+        "name_cn": record.get("name_cn") or "",
+        "summary": record.get("summary") or "",
+        "date": record.get("date") or None,
+        "platform": platform.cn if platform else record.get("platform"),
+        "infobox": parse_wiki_infobox(record.get("infobox")),
+        "tags": record.get("tags") or [],
+        "rating": {"score": record.get("score") or 0, "rank": record.get("rank") or 0},
+        "nsfw": bool(record.get("nsfw")),
+        "series": bool(record.get("series")),
+        "images": None,
+    }
+
+
+def _subject_names(subject: dict) -> set:
+    names = {subject["name"], subject["name_cn"]}
+    for item in subject["infobox"]:
+        if item["key"] in ("别名", "中文名"):
+            value = item["value"]
+            if isinstance(value, list):
+                names.update(v.get("v", "") for v in value)
+            else:
+                names.add(value)
+    return {normalize_name(n) for n in names if n}
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# ==================== Index ====================
+
+class LocalSubjectIndex:
+    """Thread-safe SQLite store of dumped book subjects, names and relations."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS subjects (
+            id INTEGER PRIMARY KEY,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS names (
+            subject_id INTEGER NOT NULL,
+            name TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_names_name ON names(name);
+        CREATE TABLE IF NOT EXISTS relations (
+            subject_id INTEGER NOT NULL,
+            related_id INTEGER NOT NULL,
+            relation INTEGER NOT NULL,
+            ord INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_relations_subject ON relations(subject_id);
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._subject_count = None
+        self._matcher = None  # NameMatcher over every indexed name, built on first search
+
+    def _default_path(self) -> str:
+        from core.settings_manager import settings_manager
+        base_path = os.path.dirname(settings_manager.filename)
+        return os.path.join(base_path, Config.LOCAL_INDEX_FILE)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use. Caller must hold the lock."""
+        if self._conn is None:
+            if self.path is None:
+                self.path = self._default_path()
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    @staticmethod
+    def is_enabled() -> bool:
+        from core.settings_manager import settings_manager
+        return bool(settings_manager.get("local_index_enabled", Config.LOCAL_INDEX_ENABLED))
+
+    def has_data(self) -> bool:
+        """True once a dump has been imported. Does not create the file otherwise."""
+        if self._subject_count is None:
+            path = self.path or self._default_path()
+            if not os.path.exists(path):
+                return False
+            self._subject_count = self.stats()["subjects"]
+        return self._subject_count > 0
+
+    # ==================== Import ====================
+
+    @staticmethod
+    def _iter_member(source, member: str):
+        """Yield JSON objects from a dump member in a zip, a folder, or a plain file."""
+        if zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as zf:
+                name = next((n for n in zf.namelist() if n.endswith(member)), None)
+                if name is None:
+                    return
+                with zf.open(name) as raw:
+                    for line in io.TextIOWrapper(raw, encoding="utf-8"):
+                        if line.strip():
+                            yield json.loads(line)
+            return
+
+        path = os.path.join(source, member) if os.path.isdir(source) else source
+        if not os.path.exists(path) or not path.endswith(member):
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def import_dump(self, source: str, progress_callback=None) -> tuple[int, int]:
+        """
+        Replace the index with the book subjects and relations of a dump.
+
+        Args:
+            source: Archive zip, extracted folder, or a subject.jsonlines file
+            progress_callback: Optional callable(subjects, relations) called
+                every batch; returning True cancels the import (nothing is
+                changed)
+
+        Returns:
+            tuple: (subject_count, relation_count)
+        """
+        batch_size = Config.LOCAL_INDEX_BATCH_SIZE
+        book_ids = set()
+        relation_count = 0
+
+        with self._lock:
+            conn = self._connection()
+            try:
+                conn.execute("BEGIN")
+                for table in ("subjects", "names", "relations"):
+                    conn.execute(f"DELETE FROM {table}")
+
+                subjects, names = [], []
+                for record in self._iter_member(source, SUBJECTS_MEMBER):
+                    if record.get("type") != SUBJECT_TYPE_BOOK:
+                        continue
+                    subject = subject_from_dump(record)
+                    book_ids.add(subject["id"])
+                    subjects.append((subject["id"], json.dumps(subject, ensure_ascii=False)))
+                    names.extend((subject["id"], n) for n in _subject_names(subject))
+                    if len(subjects) >= batch_size:
+                        conn.executemany("INSERT OR REPLACE INTO subjects VALUES (?, ?)", subjects)
+                        conn.executemany("INSERT INTO names VALUES (?, ?)", names)
+                        subjects, names = [], []
+                        if progress_callback and progress_callback(len(book_ids), 0):
+                            raise InterruptedError
+                conn.executemany("INSERT OR REPLACE INTO subjects VALUES (?, ?)", subjects)
+                conn.executemany("INSERT INTO names VALUES (?, ?)", names)
+                if not book_ids:
+                    raise ValueError(f"No book subjects found in {source}")
+
+                relations = []
+                for record in self._iter_member(source, RELATIONS_MEMBER):
+                    subject_id = record.get("subject_id")
+                    related_id = record.get("related_subject_id")
+                    if subject_id not in book_ids or related_id not in book_ids:
+                        continue
+                    relations.append((subject_id, related_id, record.get("relation_type", 0),
+                                      record.get("order", 0)))
+                    if len(relations) >= batch_size:
+                        conn.executemany("INSERT INTO relations VALUES (?, ?, ?, ?)", relations)
+                        relation_count += len(relations)
+                        relations = []
+                        if progress_callback and progress_callback(len(book_ids), relation_count):
+                            raise InterruptedError
+                conn.executemany("INSERT INTO relations VALUES (?, ?, ?, ?)", relations)
+                relation_count += len(relations)
+
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self._subject_count = None
+                self._matcher = None
+
+        logger.info(f"Imported Bangumi dump: {len(book_ids)} subjects, {relation_count} relations")
+        return len(book_ids), relation_count
+
+    # ==================== Queries ====================
+
+    def get_subject(self, subject_id) -> Optional[dict]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT data FROM subjects WHERE id = ?", (int(subject_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_related(self, subject_id) -> list:
+        """Related book subjects in /v0/subjects/{id}/subjects form."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT r.relation, s.data FROM relations r JOIN subjects s ON s.id = r.related_id "
+                "WHERE r.subject_id = ? ORDER BY r.ord, r.related_id", (int(subject_id),)).fetchall()
+        related = []
+        for relation, data in rows:
+            subject = json.loads(data)
+            related.append({
+                "id": subject["id"],
+                "type": subject["type"],
+                "name": subject["name"],
+                "name_cn": subject["name_cn"],
+                "images": None,
+                "relation": _RELATION_NAMES.get(relation, str(relation)),
+            })
+        return related
+
+    def _name_matcher(self) -> NameMatcher:
+        """Matcher over all indexed names. Caller must hold the lock."""
+        if self._matcher is None:
+            rows = self._connection().execute("SELECT subject_id, name FROM names")
+            self._matcher = NameMatcher.from_normalized(rows)
+        return self._matcher
+
+    def search(self, query: str, limit: int = None) -> list:
+        """
+        Candidate subjects for a query: names or aliases containing it, the
+        closest names by fuzzy ratio, and names contained in the query
+        (filenames carry extra words).
+        """
+        limit = limit or Config.LOCAL_INDEX_SEARCH_LIMIT
+        needle = normalize_name(query)
+        if not needle:
+            return []
+        with self._lock:
+            conn = self._connection()
+            ids = [r[0] for r in conn.execute(
+                "SELECT DISTINCT subject_id FROM names WHERE name LIKE ? ESCAPE '\\' LIMIT ?",
+                (f"%{_escape_like(needle)}%", limit))]
+            seen = set(ids)
+            for subject_id, _ in self._name_matcher().top(needle, limit, Config.SCRAPER_FUZZY_THRESHOLD):
+                if subject_id not in seen:
+                    seen.add(subject_id)
+                    ids.append(subject_id)
+            if len(ids) < limit:
+                for (subject_id,) in conn.execute(
+                        "SELECT DISTINCT subject_id FROM names "
+                        "WHERE length(name) > 1 AND instr(?, name) > 0 LIMIT ?", (needle, limit)):
+                    if subject_id not in seen:
+                        seen.add(subject_id)
+                        ids.append(subject_id)
+            placeholders = ",".join("?" * len(ids))
+            rows = conn.execute(f"SELECT data FROM subjects WHERE id IN ({placeholders})", ids).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def stats(self) -> dict:
+        with self._lock:
+            conn = self._connection()
+            subjects = conn.execute("SELECT COUNT(*) FROM subjects").fetchone()[0]
+            relations = conn.execute("SELECT COUNT(*) FROM relations").fetchone()[0]
+        return {"subjects": subjects, "relations": relations}
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            for table in ("subjects", "names", "relations"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.commit()
+            conn.execute("VACUUM")
+            self._subject_count = 0
+            self._matcher = None
+
+
+# Global instance
+local_index = LocalSubjectIndex()
+
+
+# ==================== Data Source ====================
+
+class LocalBangumiScraper:
+    """
+    BangumiScraper-compatible data source backed by the local index.
+
+    Anything the dump doesn't know (newer subjects, covers, searches with
+    no local match) is delegated to an online BangumiScraper. Without an
+    access token, NSFW subjects are left out of search results, as the
+    online search does.
+    """
+
+    def __init__(self, index: LocalSubjectIndex = None, access_token=None,
+                 priority=RequestPriority.INTERACTIVE):
+        self.index = index or local_index
+        self.online = BangumiScraper(access_token=access_token, priority=priority)
+        self.authorized = bool(access_token)
+
+    def search_subjects(self, query, threshold=60, on_partial=None):
+        query_cn = text_normalizer.for_search(query)
+        results = self.index.search(query_cn)
+        if not self.authorized:
+            # Online search hides NSFW subjects from anonymous users
+            results = [r for r in results if not r.get("nsfw")]
+        # Enrichment reads the same local rows, so this never touches the network
+        ranked = resort_search_list(query_cn, results, threshold, self, on_partial)
+        if ranked:
+            logger.info(f"Local index answered search for: {query} ({len(ranked)} results)")
+            return ranked
+        logger.info(f"No local match for '{query}', searching online")
+        return self.online.search_subjects(query, threshold, on_partial)
+
+    def get_subject_metadata(self, subject_id):
+        subject = self.index.get_subject(subject_id)
+        if subject is not None:
+            return subject
+        return self.online.get_subject_metadata(subject_id)
+
+    def get_related_subjects(self, subject_id):
+        if self.index.get_subject(subject_id) is not None:
+            return self.index.get_related(subject_id)
+        return self.online.get_related_subjects(subject_id)
+
+    def get_series_volumes(self, subject_id):
+        return parse_series_volumes(self.get_related_subjects(subject_id))
+
+    def get_cover_image(self, url):
+        return self.online.get_cover_image(url)
+
+    def get_subject_cover(self, subject_id, size='large'):
+        # The dump has no image URLs; the online metadata (HTTP-cached) does
+        return self.online.get_subject_cover(subject_id, size)
+
+
+def create_scraper(access_token=None, priority=RequestPriority.INTERACTIVE):
+    """Scraper for UI and workers: the local index when one is imported and enabled, else online."""
+    if LocalSubjectIndex.is_enabled() and local_index.has_data():
+        return LocalBangumiScraper(access_token=access_token, priority=priority)
+    return BangumiScraper(access_token=access_token, priority=priority)
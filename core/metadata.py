@@ -1,5 +1,158 @@
 # Mapping from Bangumi fields to ComicInfo fields
-from typing import Dict, Any, Optional
+import copy
+import re
+import threading
+from typing import Dict, Any, List, Optional
+
+from core.settings_manager import settings_manager
+from utils.logger import logger
+
+# Subject links as written to the Web field (and the site's mirror domains)
+_SUBJECT_URL_RE = re.compile(r"(?:bgm\.tv|bangumi\.tv|chii\.in)/subject/(\d+)", re.IGNORECASE)
+
+_FORMAT_NAMES = {"漫画": "Comic", "小说": "Novel", "画集": "Artbook"}
+
+# Infobox key -> ComicInfo field rules.
+#   keys:     exact infobox keys this rule handles
+#   contains: or, a case-insensitive substring of the key
+#   field:    target ComicInfo field (None ignores the keys)
+#   value:    "join" (all values, comma separated), "first" (first value),
+#             "items" (each value separately) or "const" (use `const`)
+#   combine:  "replace" (last occurrence wins), "keep" (first occurrence wins)
+#             or "append" (collect every occurrence, comma separated)
+# Users can add or override rules with the "metadata_mapping_rules" setting;
+# a user rule takes over the keys it names.
+DEFAULT_INFOBOX_RULES = [
+    {"keys": ["作者"], "field": "Writer", "value": "join", "combine": "replace"},
+    {"keys": ["出版社"], "field": "Publisher", "value": "first", "combine": "replace"},
+    {"contains": "ISBN", "field": "ISBN", "value": "join", "combine": "replace"},
+    {"keys": ["连载杂志"], "field": "Genre", "value": "items", "combine": "append"},
+    # Status: the first finishing key wins; no such key means Ongoing
+    {"keys": ["打ち切り"], "field": "Status", "value": "const", "const": "Abandoned", "combine": "keep"},
+    {"keys": ["完結", "结束", "连载结束"], "field": "Status", "value": "const", "const": "Ended", "combine": "keep"},
+]
+
+# Fields always present in the result, even when no infobox key matched
+_INFOBOX_DEFAULTS = {"Status": "Ongoing", "Genre": ""}
+
+
+def _item_text(item: Any) -> str:
+    return item.get("v", "") if isinstance(item, dict) else str(item)
+
+
+def _value_items(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return [_item_text(x) for x in value]
+    return [str(value)]
+
+
+def _value_join(value: Any) -> str:
+    return ",".join(_value_items(value)).strip()
+
+
+def _value_first(value: Any) -> str:
+    if isinstance(value, list):
+        return (_item_text(value[0]) or "") if value else ""
+    return str(value) if value else ""
+
+
+_VALUE_EXTRACTORS = {"join": _value_join, "first": _value_first, "items": _value_items}
+_COMBINE_MODES = ("replace", "keep", "append")
+
+
+class InfoboxRules:
+    """
+    Mapping rules compiled into a dispatch dict for single-pass infobox mapping.
+
+    Exact keys resolve with one dict lookup; keys that only match a
+    `contains` rule are resolved once and then memoized in the same dict.
+    """
+
+    def __init__(self, rules: List[dict]):
+        self.exact = {}
+        self.contains = []
+        self.append_fields = set()
+        for rule in rules:
+            compiled = self._compile(rule)
+            if compiled is False:
+                continue
+            if compiled is not None and compiled[2] == "append":
+                self.append_fields.add(compiled[0])
+            for key in rule.get("keys") or []:
+                self.exact.setdefault(key, compiled)
+            if rule.get("contains"):
+                self.contains.append((str(rule["contains"]).upper(), compiled))
+        self._resolved = dict(self.exact)
+        self._resolved[None] = None
+        # Fields every result starts with (append fields start empty)
+        self.defaults = dict(_INFOBOX_DEFAULTS)
+        self.defaults.update((field, "") for field in self.append_fields)
+
+    @staticmethod
+    def _compile(rule: dict):
+        """(field, extract, combine), None for an ignore rule, False if invalid."""
+        if not isinstance(rule, dict) or not (rule.get("keys") or rule.get("contains")):
+            logger.warning(f"Ignoring mapping rule without keys: {rule}")
+            return False
+        field = rule.get("field")
+        if not field:
+            return None
+        value = rule.get("value", "join")
+        combine = rule.get("combine", "replace")
+        if value == "const":
+            const = rule.get("const", "")
+            extract = lambda _v: const
+        else:
+            extract = _VALUE_EXTRACTORS.get(value)
+        if extract is None or combine not in _COMBINE_MODES:
+            logger.warning(f"Ignoring mapping rule with unknown value/combine: {rule}")
+            return False
+        return field, extract, combine
+
+    def _resolve(self, key) -> Optional[tuple]:
+        """Rule for a key without an exact entry; memoized (None if nothing matches)."""
+        upper = str(key).upper()
+        rule = next((r for needle, r in self.contains if needle in upper), None)
+        self._resolved[key] = rule
+        return rule
+
+    def apply(self, infobox: List[dict]) -> Dict[str, Any]:
+        """Map an infobox list to ComicInfo fields."""
+        info = dict(self.defaults)
+        lists = None
+        kept = set()
+        resolved = self._resolved
+        for item in infobox:
+            key = item.get("key")
+            rule = resolved.get(key, _UNRESOLVED)
+            if rule is _UNRESOLVED:
+                rule = self._resolve(key)
+            if rule is None:
+                continue
+            field, extract, combine = rule
+            value = extract(item.get("value"))
+            if combine == "replace":
+                info[field] = value
+            elif combine == "append":
+                if lists is None:
+                    lists = {}
+                items = lists.setdefault(field, [])
+                if isinstance(value, list):
+                    items.extend(value)
+                else:
+                    items.append(value)
+            elif field not in kept:
+                info[field] = value
+                kept.add(field)
+        if lists:
+            for field, items in lists.items():
+                info[field] = ",".join(items)
+        return info
+
+
+_UNRESOLVED = object()
+_rules_lock = threading.Lock()
+_rules_cache = (None, None)  # (user rules they were compiled from, InfoboxRules)
 
 class MetadataMapper:
     """
@@ -31,7 +184,55 @@ class MetadataMapper:
             return str(value)
     
     @staticmethod
-    def bangumi_to_comicinfo(data: Dict[str, Any]) -> Dict[str, Any]:
+    def parse_subject_id(web: str) -> Optional[int]:
+        """
+        Bangumi subject id from a Web field value.
+        Args:
+            web: Web field, possibly holding several URLs
+        Returns:
+            int or None if no Bangumi subject link is present
+        """
+        if not web:
+            return None
+        match = _SUBJECT_URL_RE.search(str(web))
+        return int(match.group(1)) if match else None
+    
+    @staticmethod
+    def compiled_rules() -> InfoboxRules:
+        """
+        Infobox rules (user overrides first, then the defaults), compiled once
+        and recompiled only when the "metadata_mapping_rules" setting changes.
+        """
+        global _rules_cache
+        user_rules = settings_manager.get("metadata_mapping_rules") or []
+        source, rules = _rules_cache
+        if rules is not None and source == user_rules:
+            return rules
+        with _rules_lock:
+            source, rules = _rules_cache
+            if rules is None or source != user_rules:
+                overrides = user_rules
+                if not isinstance(overrides, list):
+                    logger.warning("metadata_mapping_rules must be a list of rules; using defaults")
+                    overrides = []
+                rules = InfoboxRules(overrides + DEFAULT_INFOBOX_RULES)
+                _rules_cache = (copy.deepcopy(user_rules), rules)
+        return rules
+    
+    @staticmethod
+    def bangumi_to_comicinfo_many(subjects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert many Bangumi subjects at once (same result as mapping each).
+        Args:
+            subjects: Bangumi subject payloads
+        Returns:
+            List of ComicInfo dicts, in the same order
+        """
+        rules = MetadataMapper.compiled_rules()
+        return [MetadataMapper.bangumi_to_comicinfo(subject, rules) for subject in subjects]
+    
+    @staticmethod
+    def bangumi_to_comicinfo(data: Dict[str, Any], rules: InfoboxRules = None) -> Dict[str, Any]:
         """
         Convert Bangumi metadata to ComicInfo format with validation.
         
@@ -39,6 +240,7 @@ class MetadataMapper:
             data: Dictionary containing Bangumi subject metadata
                  Expected keys: name_cn, name, summary, date, infobox,
                  rating, tags, platform, etc.
+            rules: Infobox rules to use (default: compiled_rules())
         
         Returns:
             Dictionary with ComicInfo.xml compatible fields:
@@ -74,94 +276,14 @@ class MetadataMapper:
                 # Invalid date format, skip
                 pass
 
-        # Infobox parsing
-        infobox = data.get("infobox", [])
-        publishers = []
-        magazines = []
-        
-        if infobox:
-            for item in infobox:
-                key = item.get("key")
-                val = item.get("value")
-                
-                # Helper to get string value
-                def get_val_str(v: Any) -> str:
-                    if isinstance(v, list):
-                        # Check if list of dicts or strings
-                        if v and isinstance(v[0], dict):
-                            return ",".join([x.get("v", "") for x in v])
-                        return ",".join([str(x) for x in v])
-                    return str(v)
-
-                if key == "作者":
-                    info["Writer"] = get_val_str(val)
-                elif key == "出版社":
-                    # BangumiKomga takes the first publisher
-                    if isinstance(val, list) and val:
-                        if isinstance(val[0], dict):
-                            info["Publisher"] = val[0].get("v") or ""
-                        else:
-                            info["Publisher"] = str(val[0]) if val[0] else ""
-                    elif val:
-                        info["Publisher"] = str(val)
-                elif "ISBN" in key.upper():
-                    info["ISBN"] = get_val_str(val).strip()
-                elif key == "连载杂志":
-                    if isinstance(val, list):
-                        if val and isinstance(val[0], dict):
-                             magazines.extend([x.get("v", "") for x in val])
-                        else:
-                             magazines.extend([str(x) for x in val])
-                    else:
-                        magazines.append(str(val))
-                
-                # Status Mapping
-                # runningLang = ["放送", "放送（連載）中"]
-                # abandonedLang = ["打ち切り"]
-                # endedLang = ["完結", "结束", "连载结束"]
-                if key in ["放送开始", "连载开始"]:
-                     pass # Just date
-                
-                if key in ["结束", "连载结束", "完结"]:
-                     pass
-
-        # Status Logic (Iterate again to find status keys)
-        status = "Ongoing" # Default
-        running_keys = ["放送", "放送（連載）中", "连载"]
-        abandoned_keys = ["打ち切り"]
-        ended_keys = ["完結", "结束", "连载结束"]
-        
-        for item in infobox:
-            key = item.get("key")
-            if key in running_keys:
-                status = "Ongoing"
-            elif key in abandoned_keys:
-                status = "Abandoned"
-                break # Priority
-            elif key in ended_keys:
-                status = "Ended"
-                break
-        info["Status"] = status
-
-        # Genre - Only magazines (platform and score removed)
-        genres = []
-        
-        # Add magazines to genre
-        genres.extend(magazines)
-        
-        info["Genre"] = ",".join(genres) if genres else ""
+        # Infobox: one pass through the compiled rules
+        rules = rules or MetadataMapper.compiled_rules()
+        info.update(rules.apply(data.get("infobox") or []))
         
         # Format (separate from Genre)
         platform = data.get("platform")
         if platform:
-            if platform == "漫画":
-                info["Format"] = "Comic"
-            elif platform == "小说":
-                info["Format"] = "Novel"
-            elif platform == "画集":
-                info["Format"] = "Artbook"
-            else:
-                info["Format"] = platform
+            info["Format"] = _FORMAT_NAMES.get(platform, platform)
 
         # Rating (stored separately, not in Genre)
         rating = data.get("rating")
@@ -0,0 +1,323 @@
+"""
+Process-wide request scheduler for Bangumi traffic.
+
+Every BangumiScraper instance and thread draws from one token bucket, so
+the configured request rate holds for the whole application. Waiting
+requests are served by priority class, then in arrival order, and each
+waiter sleeps exactly until the next token is due instead of backing off
+in fixed steps.
+
+The rate adapts to the server (AIMD): every healthy response nudges it
+up additively, a 429 or 5xx halves it, and Retry-After / rate-limit reset
+headers pause the whole bucket for exactly as long as the server asks.
+
+Work that may become pointless (a search the user has already replaced)
+runs inside a cancellation() block; cancelling its token removes its
+requests from the queue at once, so they never take a slot.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Optional
+
+from config import Config
+from utils.logger import logger
+
+
+class RequestPriority(IntEnum):
+    """Lower value is served first."""
+    INTERACTIVE = 0  # User is waiting on the result (search, volume list)
+    BATCH = 1        # Candidate enrichment and batch apply
+    PREFETCH = 2     # Speculative fetches nobody is waiting on yet
+
+
+class RequestCancelled(Exception):
+    """Raised in a request whose CancelToken was cancelled before it got a slot."""
+
+
+class CancelToken:
+    """Cancellation flag for a group of requests (e.g. one search)."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback):
+        """Call `callback()` when the token is cancelled (at once if it already is)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise RequestCancelled()
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta seconds or HTTP date) into seconds.
+    Returns None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def parse_rate_limit_reset(headers) -> Optional[float]:
+    """
+    Seconds until the server's rate limit window resets, if the response
+    says the window is exhausted (X-RateLimit-Remaining: 0). The reset
+    header may be delta seconds or an epoch timestamp.
+    """
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None:
+        return None
+    try:
+        if int(float(remaining)) > 0:
+            return None
+        reset = float(reset)
+    except ValueError:
+        return None
+    # Large values are absolute epoch seconds rather than a delta
+    if reset > 1e9:
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+class RequestScheduler:
+    """
+    Thread-safe token bucket with priority-ordered waiters.
+
+    Tokens refill continuously at `max_requests / window_seconds` per
+    second up to `burst`. Only the highest-priority waiter may take a
+    token; everyone else waits on the condition until the queue head
+    changes.
+    """
+
+    def __init__(self, max_requests: int = None, window_seconds: float = None, burst: int = None):
+        self._cond = threading.Condition()
+        self._waiters = []  # heap of (priority, seq)
+        self._seq = itertools.count()
+        self._local = threading.local()
+        self.configure(max_requests, window_seconds, burst)
+
+    def configure(self, max_requests: int = None, window_seconds: float = None, burst: int = None):
+        """Set the starting request rate and reset adaptive state. The bucket starts full."""
+        max_requests = max_requests or Config.RATE_LIMIT_MAX_REQUESTS
+        window_seconds = window_seconds or Config.RATE_LIMIT_WINDOW_SECONDS
+        with self._cond:
+            self.base_rate = max_requests / window_seconds  # tokens per second
+            self.rate = self.base_rate
+            self.min_rate = self.base_rate * Config.RATE_ADAPT_MIN_FACTOR
+            self.max_rate = self.base_rate * Config.RATE_ADAPT_MAX_FACTOR
+            self.capacity = float(burst or Config.RATE_LIMIT_BURST)
+            self._tokens = self.capacity
+            self._updated = time.monotonic()
+            self._paused_until = 0.0
+            self._last_decrease = 0.0
+            self._latency_avg = None
+            self._latency_floor = None
+            self._cond.notify_all()
+
+    def _refill(self, now: float):
+        # Nothing accrues while paused, so a pause never ends in a burst
+        elapsed = now - max(self._updated, self._paused_until)
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = max(self._updated, now)
+
+    # ==================== Priority Context ====================
+
+    @contextmanager
+    def priority(self, priority: RequestPriority):
+        """Run requests made by this thread inside the block at `priority`."""
+        previous = getattr(self._local, "priority", None)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def current_priority(self, default: RequestPriority = RequestPriority.INTERACTIVE) -> RequestPriority:
+        """Priority set by an enclosing priority() block on this thread, else `default`."""
+        priority = getattr(self._local, "priority", None)
+        return default if priority is None else priority
+
+    @contextmanager
+    def cancellation(self, token: Optional[CancelToken]):
+        """Requests made by this thread inside the block are abandoned once `token` is cancelled."""
+        previous = getattr(self._local, "cancel_token", None)
+        self._local.cancel_token = token
+        try:
+            yield
+        finally:
+            self._local.cancel_token = previous
+
+    def current_cancel_token(self) -> Optional[CancelToken]:
+        """Token set by an enclosing cancellation() block on this thread, if any."""
+        return getattr(self._local, "cancel_token", None)
+
+    def _wake(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    # ==================== Acquire ====================
+
+    def acquire(self, priority: RequestPriority = None, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a request slot is available.
+
+        Args:
+            priority: Request class (defaults to the thread's current priority)
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if a slot was taken, False on timeout
+
+        Raises:
+            RequestCancelled: The thread's cancellation() token was cancelled
+                before a slot was taken
+        """
+        if priority is None:
+            priority = self.current_priority()
+        token = self.current_cancel_token()
+        if token is not None:
+            token.raise_if_cancelled()
+            token.on_cancel(self._wake)
+        ticket = (int(priority), next(self._seq))
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    if token is not None and token.cancelled:
+                        self._waiters.remove(ticket)
+                        heapq.heapify(self._waiters)
+                        raise RequestCancelled()
+                    now = time.monotonic()
+                    self._refill(now)
+                    is_head = self._waiters[0] == ticket
+                    paused = now < self._paused_until
+
+                    if is_head and not paused and self._tokens >= 1:
+                        self._tokens -= 1
+                        heapq.heappop(self._waiters)
+                        return True
+
+                    # Head sleeps until its token is due (or the pause ends);
+                    # others until the head changes
+                    if not is_head:
+                        wait = None
+                    elif paused:
+                        wait = self._paused_until - now
+                    else:
+                        wait = (1 - self._tokens) / self.rate
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            self._waiters.remove(ticket)
+                            heapq.heapify(self._waiters)
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                # Queue head may have changed: let the next waiter re-check
+                self._cond.notify_all()
+
+    # ==================== Adaptive Control ====================
+
+    def _pause_locked(self, seconds: float):
+        """Stop handing out tokens for `seconds`; no burst is saved up meanwhile."""
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens = 0.0
+        self._paused_until = max(self._paused_until, now + seconds)
+
+    def _decrease_locked(self, reason: str):
+        """Multiplicative decrease, at most once per cooldown (in-flight requests report too)."""
+        now = time.monotonic()
+        if now - self._last_decrease < Config.RATE_ADAPT_DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate * Config.RATE_ADAPT_DECREASE_FACTOR)
+        logger.info(f"Request rate lowered to {self.rate * 60:.0f}/min ({reason})")
+
+    def report_success(self, latency: float, headers=None):
+        """
+        Record a healthy response.
+
+        Raises the rate by RATE_ADAPT_INCREASE requests/minute unless
+        latency is climbing (a sign the server is starting to struggle).
+        Honors X-RateLimit-Remaining/Reset if the server sends them.
+        """
+        reset = parse_rate_limit_reset(headers) if headers is not None else None
+        with self._cond:
+            if self._latency_avg is None:
+                self._latency_avg = latency
+            else:
+                self._latency_avg += (latency - self._latency_avg) * 0.2
+            if self._latency_floor is None or self._latency_avg < self._latency_floor:
+                self._latency_floor = self._latency_avg
+
+            if reset is not None:
+                self._pause_locked(reset)
+            elif self._latency_avg <= self._latency_floor * Config.RATE_ADAPT_LATENCY_FACTOR:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + Config.RATE_ADAPT_INCREASE / 60)
+            self._cond.notify_all()
+
+    def report_throttled(self, retry_after: Optional[float] = None):
+        """Record a 429: pause for Retry-After (or a default) and halve the rate."""
+        pause = Config.RATE_ADAPT_DEFAULT_PAUSE if retry_after is None else retry_after
+        with self._cond:
+            self._pause_locked(pause)
+            self._decrease_locked("429 Too Many Requests")
+            self._cond.notify_all()
+
+    def report_server_error(self, retry_after: Optional[float] = None):
+        """Record a 5xx: halve the rate, and pause if the server asked us to."""
+        with self._cond:
+            if retry_after is not None:
+                self._pause_locked(retry_after)
+            self._decrease_locked("server error")
+            self._cond.notify_all()
+
+    def pending(self) -> int:
+        """Number of requests currently waiting for a slot."""
+        with self._cond:
+            return len(self._waiters)
+
+
+# Global instance
+request_scheduler = RequestScheduler()
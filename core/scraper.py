@@ -1,29 +1,26 @@
 import requests
 import time
+import json
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
-from collections import deque
-from functools import wraps
 from urllib.parse import quote_plus
-from zhconv import convert
-from utils.text_utils import get_number
-
-from utils.text_utils import get_number
-from utils.text_utils import get_number
+from utils.text_normalizer import text_normalizer
 from utils.logger import logger
+from config import Config
+from core.http_cache import http_cache
+from core.rate_scheduler import request_scheduler, RequestPriority, RequestCancelled, parse_retry_after
+from core.single_flight import request_flights
+from core.fuzzy_matcher import best_ratio
 
-# Module-level cache to persist across Scraper instances
+# Module-level cache to persist across Scraper instances (in front of the on-disk http_cache)
 # Key: subject_id, Value: dict (metadata)
 _METADATA_CACHE = {}
 # Key: subject_id, Value: list (related subjects)
 _RELATED_CACHE = {}
 
-try:
-    from thefuzz import fuzz
-except ImportError:
-    fuzz = None
-    logger.warning("thefuzz module not found. Fuzzy matching will be disabled.")
-
 # ==================== Enums ====================
 
 class SubjectPlatform(Enum):
@@ -67,152 +64,242 @@ class SubjectRelation(Enum):
                 return member
         return None
 
-# ==================== Rate Limiter ====================
-
-class SlideWindowCounter:
-    def __init__(self, max_requests: int, window_seconds: float):
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self.requests = deque()
-
-    def is_allowed(self) -> bool:
-        current_time = time.time()
-        while self.requests and current_time - self.requests[0] > self.window_seconds:
-            self.requests.popleft()
-        
-        if len(self.requests) < self.max_requests:
-            self.requests.append(current_time)
-            return True
-        return False
-
-def slide_window_rate_limiter(max_requests: int = 60, window_seconds: float = 60, max_retries: int = 5, base_delay: float = 2):
-    """
-    Rate limiter with exponential backoff.
-    
-    Args:
-        max_requests: Maximum requests allowed in the time window (default: 60)
-        window_seconds: Time window in seconds (default: 60)
-        max_retries: Maximum retry attempts (default: 5)
-        base_delay: Base delay in seconds for exponential backoff (default: 2)
-    """
-    def decorator(func):
-        limiter = SlideWindowCounter(max_requests, window_seconds)
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            retries = 0
-            while retries <= max_retries:
-                if limiter.is_allowed():
-                    return func(*args, **kwargs)
-                if retries >= max_retries:
-                    logger.warning(f"Rate limit exceeded after {max_retries} retries.")
-                    return None
-                # Exponential backoff: 2s, 4s, 8s, 16s, 32s
-                wait_time = base_delay * (2 ** retries)
-                logger.info(f"Rate limit reached, waiting {wait_time}s before retry {retries + 1}/{max_retries}...")
-                time.sleep(wait_time)
-                retries += 1
-        return wrapper
-    return decorator
-
 # ==================== Helper Functions ====================
 
 def compute_name_score_by_fuzzy(name: str, name_cn: str, infobox, target: str) -> int:
-    if not fuzz:
-        # Fallback to simple containment check
-        target = target.lower()
-        if target in name.lower() or (name_cn and target in name_cn.lower()):
-            return 100
-        return 0
-
-    target = target.lower()
-    score = fuzz.ratio(name.lower(), target)
-    if name_cn:
-        score = max(score, fuzz.ratio(name_cn.lower(), target))
-    
+    """Best match of `target` against a subject's name, Chinese name and aliases (0-100)."""
+    names = [name, name_cn]
     if infobox:
         for item in infobox:
             if item["key"] == "别名":
                 val = item["value"]
                 if isinstance(val, list):
                     for alias in val:
-                        v = alias.get("v", "") if isinstance(alias, dict) else str(alias)
-                        score = max(score, fuzz.ratio(v.lower(), target))
+                        names.append(alias.get("v", "") if isinstance(alias, dict) else str(alias))
                 else:
-                    score = max(score, fuzz.ratio(str(val).lower(), target))
-    return score
-
-def resort_search_list(query, results, threshold, data_source):
-    if not results:
-        return []
-    
-    # Phase 1: Preliminary scoring based on basic info (No extra API calls)
-    pre_sorted = []
+                    names.append(str(val))
+    # All names are scored in one batch, compared in normalized form
+    return best_ratio(target, names)
+
+def score_enriched_metadata(manga_metadata, query):
+    """Label a full metadata dict as Series/Volume and score it against `query` (in place)."""
+    # Determine type label
+    if manga_metadata.get("series"):
+        manga_metadata["type_label"] = "Series"
+    else:
+        manga_metadata["type_label"] = "Volume"
+
+    # Re-compute score with full metadata (including infobox/aliases)
+    manga_metadata["fuzzScore"] = compute_name_score_by_fuzzy(
+        manga_metadata.get("name", ""),
+        manga_metadata.get("name_cn", ""),
+        manga_metadata.get("infobox", []),
+        query,
+    )
+    return manga_metadata
+
+def prescore_search_results(query, results):
+    """Phase 1 of result ranking: score on name/name_cn only (no API calls), best first."""
     for result in results:
         # Basic score using name and name_cn
-        score = compute_name_score_by_fuzzy(
+        result["temp_score"] = compute_name_score_by_fuzzy(
             result.get("name", ""),
             result.get("name_cn", ""),
             None, # No infobox yet
             query,
         )
-        result["temp_score"] = score
-        pre_sorted.append(result)
+    return sorted(results, key=lambda x: x["temp_score"], reverse=True)
+
+def as_basic_result(result):
+    """Use an un-enriched search result as-is, marked with its preliminary score."""
+    result["fuzzScore"] = result["temp_score"]
+    result["type_label"] = "Unknown" # We didn't fetch details
+    return result
+
+def _enrich_candidate(result, query, data_source, cancel_token=None):
+    """
+    Fetch full metadata for one search result and re-score it.
+    Returns the enriched metadata dict, or None if it could not be fetched.
+    """
+    # This will use cache if available; yields to interactive requests and
+    # is dropped from the queue if the search is cancelled
+    with request_scheduler.priority(RequestPriority.BATCH), request_scheduler.cancellation(cancel_token):
+        manga_metadata = data_source.get_subject_metadata(result["id"])
+    if not manga_metadata:
+        return None
+    return score_enriched_metadata(manga_metadata, query)
+
+def resort_search_list(query, results, threshold, data_source, on_partial=None):
+    """
+    Score search results and enrich the top candidates with full metadata.
+
+    Enrichment requests for the top candidates run concurrently (they still
+    share the global request scheduler), so a search costs about one round
+    trip instead of one per candidate. They run under the caller's
+    cancellation token, if any.
+
+    Args:
+        query: Normalized search query
+        results: Raw search results from the API
+        threshold: Minimum fuzzy score to keep a result
+        data_source: Object providing get_subject_metadata(subject_id)
+        on_partial: Optional callback receiving sorted results found so far:
+            first the un-enriched candidates, then again each time an
+            enriched candidate arrives
+
+    Returns:
+        list: Results that meet the threshold, best match first
+
+    Raises:
+        RequestCancelled: The caller's cancellation token was cancelled
+    """
+    if not results:
+        return []
     
-    # Sort by preliminary score
-    pre_sorted.sort(key=lambda x: x["temp_score"], reverse=True)
+    # Phase 1: Preliminary scoring based on basic info (No extra API calls)
+    pre_sorted = prescore_search_results(query, results)
     
     # Phase 2: Fetch full metadata only for top candidates to save API calls
-    # Fetch details for top 8 results (or all if fewer)
-    # This reduces API calls from N+1 to min(N, 8)+1
-    TOP_N = 8
+    # This reduces API calls from N+1 to min(N, TOP_N)+1
+    top_n = Config.SCRAPER_ENRICH_TOP_N
+    candidates = pre_sorted[:top_n]
     final_results = []
     
-    for i, result in enumerate(pre_sorted):
-        # For top items, fetch full metadata
-        if i < TOP_N:
-            manga_id = result["id"]
-            # This will use cache if available
-            manga_metadata = data_source.get_subject_metadata(manga_id)
-            
-            if not manga_metadata:
-                continue
+    # For lower ranked items, use basic info if it meets threshold
+    # But we mark them as "Unknown" type or assume based on context
+    for result in pre_sorted[top_n:]:
+        if result["temp_score"] >= threshold:
+            final_results.append(as_basic_result(result))
+    
+    if candidates and on_partial:
+        # Something to show right away; enriched versions replace these by id
+        preliminary = [dict(result, fuzzScore=result["temp_score"], type_label="Unknown")
+                       for result in candidates if result["temp_score"] >= threshold]
+        on_partial(sorted(final_results + preliminary, key=lambda x: x["fuzzScore"], reverse=True))
+    
+    if candidates:
+        cancel_token = request_scheduler.current_cancel_token()
+        workers = min(len(candidates), Config.SCRAPER_ENRICH_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrich") as executor:
+            futures = {executor.submit(_enrich_candidate, result, query, data_source, cancel_token): result
+                       for result in candidates}
+            for future in as_completed(futures):
+                try:
+                    manga_metadata = future.result()
+                except RequestCancelled:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+                except Exception as e:
+                    # Keep the basic result rather than failing the whole search
+                    logger.warning(f"Enrichment failed for subject {futures[future].get('id')}: {e}")
+                    result = futures[future]
+                    if result["temp_score"] < threshold:
+                        continue
+                    manga_metadata = as_basic_result(result)
                 
-            # Determine type label
-            if manga_metadata.get("series"):
-                manga_metadata["type_label"] = "Series"
-            else:
-                manga_metadata["type_label"] = "Volume"
-
-            # Re-compute score with full metadata (including infobox/aliases)
-            score = compute_name_score_by_fuzzy(
-                manga_metadata.get("name", ""),
-                manga_metadata.get("name_cn", ""),
-                manga_metadata.get("infobox", []),
-                query,
-            )
-            manga_metadata["fuzzScore"] = score
-            
-            if score >= threshold:
+                if not manga_metadata or manga_metadata["fuzzScore"] < threshold:
+                    continue
                 final_results.append(manga_metadata)
-        
-        else:
-            # For lower ranked items, use basic info if it meets threshold
-            # But we mark them as "Unknown" type or assume based on context
-            if result["temp_score"] >= threshold:
-                # Use the basic result but add necessary fields
-                result["fuzzScore"] = result["temp_score"]
-                result["type_label"] = "Unknown" # We didn't fetch details
-                final_results.append(result)
+                
+                if on_partial:
+                    on_partial(sorted(final_results, key=lambda x: x["fuzzScore"], reverse=True))
 
     final_results.sort(key=lambda x: x["fuzzScore"], reverse=True)
     return final_results
 
+def parse_series_volumes(related):
+    """
+    Pick single volumes (Offprint relations) out of a related-subjects list.
+    Returns a list of dicts: {'id': int, 'number': float, 'title': str, 'relation': str}
+    """
+    volumes = []
+    
+    for rel in related or []:
+        # Check if it is a single volume (Offprint)
+        relation_type = SubjectRelation.parse(rel.get("relation"))
+        if relation_type == SubjectRelation.OFFPRINT:
+            name = rel.get("name_cn") or rel.get("name")
+            number, _ = text_normalizer.number(name)
+            
+            if number is not None:
+                volumes.append({
+                    "id": rel.get("id"),
+                    "number": number,
+                    "title": name,
+                    "relation": rel.get("relation")
+                })
+                
+    return volumes
+
+def pick_cover_url(metadata, size='large'):
+    """Cover URL of the requested size from subject metadata, falling back to any size."""
+    if not metadata or 'images' not in metadata or not metadata['images']:
+        return None
+    image_url = metadata['images'].get(size)
+    if not image_url:
+        # Fallback to any available size
+        for fallback_size in ['large', 'common', 'medium', 'small']:
+            image_url = metadata['images'].get(fallback_size)
+            if image_url:
+                break
+    return image_url
+
+def normalize_query(query):
+    """Form of a search query that identifies it for caching and de-duplication."""
+    return " ".join(text_normalizer.for_compare(query or "").split())
+
+class SearchResultCache:
+    """
+    Ranked results of recent searches, keyed by normalized query.
+
+    Sits in front of the HTTP cache: a repeated search (the user typing
+    back to an earlier query, or another group with the same series name)
+    is answered without re-ranking or re-reading every candidate.
+    """
+
+    def __init__(self, size=None):
+        self.size = size or Config.SCRAPER_RESULT_CACHE_SIZE
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(query, threshold, authorized):
+        return (normalize_query(query), threshold, bool(authorized))
+
+    def get(self, key):
+        """A copy of the cached result list, or None."""
+        with self._lock:
+            results = self._entries.get(key)
+            if results is None:
+                return None
+            self._entries.move_to_end(key)
+            return list(results)
+
+    def put(self, key, results):
+        with self._lock:
+            self._entries[key] = list(results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+search_result_cache = SearchResultCache()
+
+def search_cache_key(payload, authorized):
+    """HTTP cache key for a search payload (token holders see NSFW results, so keep them apart)."""
+    auth = "auth" if authorized else "anon"
+    return f"search:{auth}:{json.dumps(payload, sort_keys=True, ensure_ascii=False)}"
+
 # ==================== Scraper Class ====================
 
 class BangumiScraper:
     BASE_URL = "https://api.bgm.tv"
 
-    def __init__(self, access_token=None, connect_timeout=10, read_timeout=30):
+    def __init__(self, access_token=None, connect_timeout=10, read_timeout=30,
+                 priority=RequestPriority.INTERACTIVE):
         """
         Initialize Bangumi scraper with timeout configuration.
         
@@ -220,10 +307,12 @@ class BangumiScraper:
             access_token: Optional access token for authenticated requests
             connect_timeout: Connection timeout in seconds (default: 10)
             read_timeout: Read timeout in seconds (default: 30)
+            priority: Default scheduler class for this scraper's requests
         """
         self.connect_timeout = connect_timeout
         self.read_timeout = read_timeout
         self.timeout = (connect_timeout, read_timeout)
+        self.priority = priority
         
         self.session = requests.Session()
         self.session.headers.update({
@@ -234,50 +323,138 @@ class BangumiScraper:
 
     def _request_with_retry(self, method, url, max_retries=3, **kwargs):
         """
-        Make HTTP request with automatic retry on 429 (rate limit) errors.
+        Make HTTP request with automatic retry on 429 (rate limit) and 503 errors.
+        
+        Outcomes are reported to the global request scheduler, which adapts
+        the request rate and pauses for as long as Retry-After asks; the
+        retry then simply waits for its next slot.
         
         Args:
             method: 'get' or 'post'
             url: Request URL
-            max_retries: Maximum retry attempts for 429 errors
+            max_retries: Maximum retry attempts for 429/503 errors
             **kwargs: Additional arguments passed to requests
         
         Returns:
-            Response object
+            Response object, or None if no request slot became free within
+            Config.RATE_LIMIT_MAX_WAIT seconds
         """
         kwargs.setdefault('timeout', self.timeout)
+        priority = request_scheduler.current_priority(self.priority)
         
         for attempt in range(max_retries + 1):
-            try:
-                if method == 'get':
-                    response = self.session.get(url, **kwargs)
+            # Every attempt, retries included, draws from the global budget
+            if not request_scheduler.acquire(priority, timeout=Config.RATE_LIMIT_MAX_WAIT):
+                logger.warning(f"No request slot within {Config.RATE_LIMIT_MAX_WAIT}s, giving up on {url}")
+                return None
+            
+            start = time.monotonic()
+            if method == 'get':
+                response = self.session.get(url, **kwargs)
+            else:
+                response = self.session.post(url, **kwargs)
+            latency = time.monotonic() - start
+            
+            status = response.status_code
+            if status == 429 or status >= 500:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if status == 429:
+                    request_scheduler.report_throttled(retry_after)
                 else:
-                    response = self.session.post(url, **kwargs)
-                
-                if response.status_code == 429:
-                    if attempt < max_retries:
-                        wait_time = 2 ** (attempt + 1)  # 2, 4, 8 seconds
-                        logger.warning(f"Rate limit (429) hit, waiting {wait_time}s before retry {attempt + 1}/{max_retries}...")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        logger.error("Rate limit (429) exceeded after all retries")
-                        response.raise_for_status()
+                    request_scheduler.report_server_error(retry_after)
                 
-                response.raise_for_status()
-                return response
-                
-            except requests.exceptions.HTTPError:
-                if response.status_code == 429 and attempt < max_retries:
+                if status in (429, 503) and attempt < max_retries:
+                    logger.warning(f"HTTP {status} from server, retry {attempt + 1}/{max_retries} "
+                                   f"(Retry-After: {retry_after if retry_after is not None else 'none'})")
                     continue
-                raise
+                if status == 429:
+                    logger.error("Rate limit (429) exceeded after all retries")
+            else:
+                request_scheduler.report_success(latency, response.headers)
+            
+            response.raise_for_status()
+            return response
         
         return response
 
-    @slide_window_rate_limiter()
-    def search_subjects(self, query, threshold=60): # Lowered threshold slightly
+    def _cached_fetch(self, endpoint, key, method, url, **kwargs):
+        """
+        Fetch a response body through the persistent HTTP cache.
+
+        Fresh entries are returned without touching the network or the rate
+        limiter. Expired entries are revalidated with ETag/Last-Modified, and
+        are served stale if the network is unreachable. Network requests go
+        through the global request scheduler at this scraper's priority.
+
+        Args:
+            endpoint: TTL class ('subject', 'related', 'search', 'cover')
+            key: Cache key for this request
+            method: 'get' or 'post'
+            url: Request URL
+
+        Returns:
+            bytes: Response body, or None if the rate limit was exhausted
+        """
+        # Concurrent callers for the same key (another file, the search
+        # dialog's enrichment, a batch worker) share one request
+        return request_flights.do(key, self._fetch_through_cache, endpoint, key, method, url,
+                                  priority=request_scheduler.current_priority(self.priority), **kwargs)
+
+    def _fetch_through_cache(self, endpoint, key, method, url, **kwargs):
+        use_cache = http_cache.is_enabled()
+        entry = http_cache.get(key) if use_cache else None
+        if entry is not None and entry.is_fresh:
+            return entry.body
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry is not None:
+            headers.update(entry.conditional_headers())
+
+        try:
+            response = self._request_with_retry(method, url, headers=headers, **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            if entry is not None:
+                logger.warning(f"Network unavailable, using stale cache for {key}")
+                return entry.body
+            raise
+
+        if response is None:
+            return entry.body if entry is not None else None
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code == 304 and entry is not None:
+            http_cache.refresh(key, endpoint, etag, last_modified)
+            return entry.body
+
+        body = response.content
+        if use_cache:
+            http_cache.put(key, endpoint, body, etag, last_modified)
+        return body
+
+    def search_subjects(self, query, threshold=60, on_partial=None): # Lowered threshold slightly
+        """
+        Search Bangumi for comics matching `query`.
+
+        Args:
+            query: Search text
+            threshold: Minimum fuzzy score to keep a result
+            on_partial: Optional callback receiving sorted partial results
+                while candidates are being enriched (see resort_search_list)
+
+        Raises:
+            RequestCancelled: Run inside request_scheduler.cancellation()
+                and the token was cancelled
+        """
+        authorized = "Authorization" in self.session.headers
+        result_key = SearchResultCache.key(query, threshold, authorized)
+        cached = search_result_cache.get(result_key)
+        if cached is not None:
+            logger.info(f"Search results for '{query}' served from memory ({len(cached)} results)")
+            return cached
+        
         logger.info(f"Scraper searching for: {query}")
-        query_cn = convert(query, "zh-cn")
+        query_cn = text_normalizer.for_search(query)
         
         # Use v0 Search API for better token support (NSFW)
         url = f"{self.BASE_URL}/v0/search/subjects"
@@ -289,20 +466,30 @@ class BangumiScraper:
             "limit": 15
         }
         
+        cache_key = search_cache_key(payload, authorized)
+        
         try:
             # v0 search is POST with retry on 429
-            response = self._request_with_retry('post', url, json=payload)
-            data = response.json()
+            body = self._cached_fetch('search', cache_key, 'post', url, json=payload)
+            if body is None:
+                return None
+            data = json.loads(body)
             
             if "data" in data and data["data"]:
                 results = data["data"]
                 logger.info(f"Search returned {len(results)} raw results for: {query}")
                 # Resort and filter
-                return resort_search_list(query_cn, results, threshold, self)
-            
-            logger.info(f"No results found for: {query}")
-            return []
+                ranked = resort_search_list(query_cn, results, threshold, self, on_partial)
+            else:
+                logger.info(f"No results found for: {query}")
+                ranked = []
+            search_result_cache.put(result_key, ranked)
+            return ranked
             
+        except RequestCancelled:
+            logger.info(f"Search cancelled: {query}")
+            raise
+
         except requests.exceptions.Timeout:
             logger.error(f"Search timed out after {self.connect_timeout + self.read_timeout}s for query: {query}")
             raise Exception(f"Search request timed out. Please check your network connection and try again.")
@@ -316,7 +503,6 @@ class BangumiScraper:
             logger.error(f"Search failed: {e}")
             raise Exception(f"Search failed: {str(e)}")
 
-    @slide_window_rate_limiter()
     def get_subject_metadata(self, subject_id):
         # Check cache first
         if subject_id in _METADATA_CACHE:
@@ -325,12 +511,16 @@ class BangumiScraper:
         logger.info(f"Fetching metadata for subject ID: {subject_id}")
         url = f"{self.BASE_URL}/v0/subjects/{subject_id}"
         try:
-            response = self._request_with_retry('get', url)
-            data = response.json()
+            body = self._cached_fetch('subject', f"subject:{subject_id}", 'get', url)
+            if body is None:
+                return None
+            data = json.loads(body)
             
             # Cache the result
             _METADATA_CACHE[subject_id] = data
             return data
+        except RequestCancelled:
+            raise
         except requests.exceptions.Timeout:
             logger.error(f"Metadata request timed out for subject {subject_id}")
             raise Exception(f"Request timed out while fetching metadata. Please try again.")
@@ -346,7 +536,6 @@ class BangumiScraper:
 
 
 
-    @slide_window_rate_limiter()
     def get_related_subjects(self, subject_id):
         # Check cache first
         if subject_id in _RELATED_CACHE:
@@ -355,12 +544,16 @@ class BangumiScraper:
         logger.info(f"Fetching related subjects for ID: {subject_id}")
         url = f"{self.BASE_URL}/v0/subjects/{subject_id}/subjects"
         try:
-            response = self._request_with_retry('get', url)
-            data = response.json()
+            body = self._cached_fetch('related', f"related:{subject_id}", 'get', url)
+            if body is None:
+                return None
+            data = json.loads(body)
             
             # Cache the result
             _RELATED_CACHE[subject_id] = data
             return data
+        except RequestCancelled:
+            raise
         except requests.exceptions.Timeout:
             logger.error(f"Related subjects request timed out for {subject_id}")
             raise Exception(f"Request timed out while fetching volumes. Please try again.")
@@ -379,31 +572,11 @@ class BangumiScraper:
         Fetch related 'single volume' subjects and parse their numbers.
         Returns a list of dicts: {'id': int, 'number': float, 'title': str}
         """
-        related = self.get_related_subjects(subject_id)
-        volumes = []
-        
-        for rel in related:
-            # Check if it is a single volume (Offprint)
-            relation_type = SubjectRelation.parse(rel.get("relation"))
-            if relation_type == SubjectRelation.OFFPRINT:
-                name = rel.get("name_cn") or rel.get("name")
-                number, _ = get_number(name)
-                
-                if number is not None:
-                    volumes.append({
-                        "id": rel.get("id"),
-                        "number": number,
-                        "title": name,
-                        "relation": rel.get("relation")
-                    })
-                    
-        return volumes
+        return parse_series_volumes(self.get_related_subjects(subject_id))
 
     def get_cover_image(self, url):
         try:
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            return response.content
+            return self._cached_fetch('cover', f"cover:{url}", 'get', url)
         except requests.exceptions.Timeout:
             logger.error(f"Cover image download timed out: {url}")
             return None
@@ -430,14 +603,7 @@ class BangumiScraper:
             return None
             
         try:
-            image_url = metadata['images'].get(size)
-            if not image_url:
-                # Fallback to any available size
-                for fallback_size in ['large', 'common', 'medium', 'small']:
-                    image_url = metadata['images'].get(fallback_size)
-                    if image_url:
-                        break
-            
+            image_url = pick_cover_url(metadata, size)
             if image_url:
                 logger.info(f"Downloading cover image from: {image_url}")
                 return self.get_cover_image(image_url)
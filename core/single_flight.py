@@ -0,0 +1,101 @@
+"""
+Request coalescing ("single-flight").
+
+When several callers ask for the same key at the same time, only the
+first one (the leader) runs the fetch; the others wait for it and get
+the same result or exception. Nothing is cached here: once the leader
+finishes, the next call for that key starts a new flight, and the HTTP
+cache decides whether it touches the network.
+
+A leader whose own work was cancelled (RequestCancelled) doesn't take its
+followers down with it: they start over, and one of them leads the retry.
+A follower whose own cancellation() token is cancelled stops waiting, and
+a caller with a higher scheduler priority than the leader leads its own
+flight rather than queue behind a batch or prefetch slot.
+"""
+
+import threading
+
+from core.rate_scheduler import RequestCancelled, request_scheduler
+
+# Followers re-check their cancel token this often while waiting
+_WAIT_SLICE = 0.1
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "waiters", "priority")
+
+    def __init__(self, priority):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+        self.priority = priority
+
+
+class SingleFlight:
+    """Thread-safe single-flight group."""
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0  # Calls served by another caller's request
+
+    def do(self, key, fn, *args, priority=None, **kwargs):
+        """
+        Run `fn(*args, **kwargs)` once per concurrent group of callers for `key`.
+
+        `priority` is the scheduler class the caller's own request would use
+        (default: the thread's current priority). Returns fn's result, or
+        re-raises its exception, in every caller.
+
+        Raises:
+            RequestCancelled: The caller's cancellation() token was cancelled
+                while it waited on another caller's flight
+        """
+        if priority is None:
+            priority = request_scheduler.current_priority()
+        token = request_scheduler.current_cancel_token()
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                if flight is not None and priority >= flight.priority:
+                    flight.waiters += 1
+                    self.coalesced += 1
+                    leader = False
+                else:
+                    # New key, or the leader's slot is queued behind ours:
+                    # later callers join this flight instead
+                    flight = _Flight(priority)
+                    self._flights[key] = flight
+                    leader = True
+
+            if leader:
+                break
+            while not flight.done.wait(_WAIT_SLICE if token is not None else None):
+                token.raise_if_cancelled()
+            if isinstance(flight.error, RequestCancelled):
+                continue
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn(*args, **kwargs)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+
+# Global instance shared by every BangumiScraper
+request_flights = SingleFlight()
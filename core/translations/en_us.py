@@ -19,7 +19,26 @@ en_US = {
     "Deselect": "Deselect",
     "Invert Selection": "Invert Selection",
     "Scrape": "Scrape",
+    "Auto-Scrape Library": "Auto-Scrape Library",
+    "Refresh from Bangumi": "Refresh from Bangumi",
+    "Auto-scraping {} series...": "Auto-scraping {} series...",
+    "Series matched": "Series matched",
+    "Needs review": "Needs review",
+    "Failed": "Failed",
+    "Review Unmatched Series": "Review Unmatched Series",
+    "{} series could not be matched confidently. Double-click one to search for it manually.": "{} series could not be matched confidently. Double-click one to search for it manually.",
+    "{} ({} files)": "{} ({} files)",
+    "best guess: {} ({}%)": "best guess: {} ({}%)",
+    "no results": "no results",
     "Auto Number": "Auto Number",
+    "Auto Number by Series": "Auto Number by Series",
+    "Numbered {} file(s) in {} series.": "Numbered {} file(s) in {} series.",
+    "Check these series:": "Check these series:",
+    "missing": "missing",
+    "duplicate": "duplicate",
+    "no number": "no number",
+    "files": "files",
+    "... and {} more": "... and {} more",
     "Convert Format": "Convert Format",
     "Customize Columns": "Customize Columns",
     "Usage Guide": "Usage Guide",
@@ -50,6 +69,7 @@ en_US = {
     "Convert to:": "Convert to:",
     "Conversion completed with errors.": "Conversion completed with errors.",
     "Saving... {:.1f}%": "Saving... {:.1f}%",
+    "{:.1f} MB/s, about {} remaining": "{:.1f} MB/s, about {} remaining",
     "Failed files:": "Failed files:",
     "Converted {} file(s) to {}": "Converted {} file(s) to {}",
     "No files needed conversion.": "No files needed conversion.",
@@ -72,6 +92,53 @@ en_US = {
     "Invalid token. Please check and try again.": "Invalid token. Please check and try again.",
     "Token test failed (HTTP {}).": "Token test failed (HTTP {}).",
     "Connection failed: {}": "Connection failed: {}",
+    "Save Settings": "Save Settings",
+    "Background Save I/O": "Background Save I/O",
+    "Limit disk bandwidth used by batch saves so media servers on the same disk stay responsive. 0 means unlimited.": "Limit disk bandwidth used by batch saves so media servers on the same disk stay responsive. 0 means unlimited.",
+    "Read limit:": "Read limit:",
+    "Write limit:": "Write limit:",
+    "Low I/O priority (Linux)": "Low I/O priority (Linux)",
+    "Network Storage": "Network Storage",
+    "Read archive directories in one request and use large sequential buffers. Recommended for libraries on SMB/NFS shares.": "Read archive directories in one request and use large sequential buffers. Recommended for libraries on SMB/NFS shares.",
+    "NAS-optimized I/O": "NAS-optimized I/O",
+    "Archive Output": "Archive Output",
+    "Keep page order and timestamps stable and write ComicInfo.xml and the cover last, so a metadata edit changes only the end of the archive. Helps rsync and deduplicating backups.": "Keep page order and timestamps stable and write ComicInfo.xml and the cover last, so a metadata edit changes only the end of the archive. Helps rsync and deduplicating backups.",
+    "Deterministic archive output": "Deterministic archive output",
+    "Offline Cache": "Offline Cache",
+    "Offline Index": "Offline Index",
+    "Import a Bangumi Archive dump to search and scrape from disk without rate limits. Newer subjects and covers still come from the online API.": "Import a Bangumi Archive dump to search and scrape from disk without rate limits. Newer subjects and covers still come from the online API.",
+    "Use the offline index when available": "Use the offline index when available",
+    "Import Dump...": "Import Dump...",
+    "Import Dump": "Import Dump",
+    "Importing dump...": "Importing dump...",
+    "{} subjects, {} relations": "{} subjects, {} relations",
+    "No dump imported": "No dump imported",
+    "Index unavailable: {}": "Index unavailable: {}",
+    "Imported {} subjects and {} relations.": "Imported {} subjects and {} relations.",
+    "Delete the imported offline index?": "Delete the imported offline index?",
+    "Bangumi responses and covers are kept on disk and revalidated when they expire, so re-scraping a library rarely needs the network.": "Bangumi responses and covers are kept on disk and revalidated when they expire, so re-scraping a library rarely needs the network.",
+    "Cache Bangumi responses on disk": "Cache Bangumi responses on disk",
+    "{} entries, {:.1f} MB": "{} entries, {:.1f} MB",
+    "Cache unavailable: {}": "Cache unavailable: {}",
+    "Export...": "Export...",
+    "Import...": "Import...",
+    "Clear": "Clear",
+    "Export Cache": "Export Cache",
+    "Import Cache": "Import Cache",
+    "Exported {} cache entries.": "Exported {} cache entries.",
+    "Imported {} cache entries.": "Imported {} cache entries.",
+    "Export failed: {}": "Export failed: {}",
+    "Import failed: {}": "Import failed: {}",
+    "Delete all cached Bangumi responses and covers?": "Delete all cached Bangumi responses and covers?",
+    "Restore Backup": "Restore Backup",
+    "Please select files to restore.": "Please select files to restore.",
+    "Restore the latest backup for {} file(s)? Unsaved changes will be lost.": "Restore the latest backup for {} file(s)? Unsaved changes will be lost.",
+    "Restored {} file(s).": "Restored {} file(s).",
+    "Backups": "Backups",
+    "Keep a copy of each archive before saving. Uses reflinks or hardlinks where the filesystem allows, so backups take almost no extra space.": "Keep a copy of each archive before saving. Uses reflinks or hardlinks where the filesystem allows, so backups take almost no extra space.",
+    "Back up files before saving": "Back up files before saving",
+    "Backups per file:": "Backups per file:",
+    "Delete after (days):": "Delete after (days):",
     "token_guide_html": "You need to <a href='https://bgm.tv/login'>log in to Bangumi</a> first, then <a href='https://next.bgm.tv/demo/access-token'>get your Access Token here</a>.",
     "Save": "Save",
     
@@ -173,6 +240,7 @@ en_US = {
     "Connection failed": "Connection failed",
     "Failed to load image: {}": "Failed to load image: {}",
     "Preparing search...": "Preparing search...",
+    "Search failed: {}": "Search failed: {}",
     "Loading volumes...": "Loading volumes...",
     
     # Column Settings Dialog
@@ -20,7 +20,26 @@ ja_JP = {
     "Deselect": "選択解除",
     "Invert Selection": "選択反転",
     "Scrape": "メタデータ取得",
+    "Auto-Scrape Library": "ライブラリを自動スクレイピング",
+    "Refresh from Bangumi": "Bangumi から更新",
+    "Auto-scraping {} series...": "{} シリーズを自動スクレイピング中...",
+    "Series matched": "一致したシリーズ",
+    "Needs review": "要確認",
+    "Failed": "失敗",
+    "Review Unmatched Series": "未一致シリーズの確認",
+    "{} series could not be matched confidently. Double-click one to search for it manually.": "{} シリーズは確実に一致しませんでした。ダブルクリックして手動で検索してください。",
+    "{} ({} files)": "{}（{} ファイル）",
+    "best guess: {} ({}%)": "最有力候補：{}（{}%）",
+    "no results": "結果なし",
     "Auto Number": "自動ナンバリング",
+    "Auto Number by Series": "シリーズ別自動ナンバリング",
+    "Numbered {} file(s) in {} series.": "{1} シリーズの {0} ファイルに番号を付けました。",
+    "Check these series:": "以下のシリーズを確認してください：",
+    "missing": "欠番",
+    "duplicate": "重複",
+    "no number": "番号なし",
+    "files": "ファイル",
+    "... and {} more": "…ほか {} 件",
     "Convert Format": "フォーマット変換",
     "Customize Columns": "列のカスタマイズ",
     "Usage Guide": "使用ガイド",
@@ -51,6 +70,7 @@ ja_JP = {
     "Convert to:": "変換先：",
     "Conversion completed with errors.": "変換が完了しましたが、エラーが発生しました。",
     "Saving... {:.1f}%": "保存中... {:.1f}%",
+    "{:.1f} MB/s, about {} remaining": "{:.1f} MB/s、残り約 {}",
     "Failed files:": "失敗したファイル：",
     "Converted {} file(s) to {}": "{} ファイルを {} に変換しました",
     "No files needed conversion.": "変換が必要なファイルはありません。",
@@ -73,6 +93,53 @@ ja_JP = {
     "Invalid token. Please check and try again.": "トークンが無効です。確認して再試行してください。",
     "Token test failed (HTTP {}).": "トークン・テストに失敗しました (HTTP {})。",
     "Connection failed: {}": "接続に失敗しました：{}",
+    "Save Settings": "保存設定",
+    "Background Save I/O": "バックグラウンド保存 I/O",
+    "Limit disk bandwidth used by batch saves so media servers on the same disk stay responsive. 0 means unlimited.": "一括保存が使用するディスク帯域を制限し、同じディスク上のメディアサーバーの応答性を保ちます。0 は無制限です。",
+    "Read limit:": "読み込み制限：",
+    "Write limit:": "書き込み制限：",
+    "Low I/O priority (Linux)": "低 I/O 優先度 (Linux)",
+    "Network Storage": "ネットワークストレージ",
+    "Read archive directories in one request and use large sequential buffers. Recommended for libraries on SMB/NFS shares.": "アーカイブのディレクトリを一度に読み込み、大きな連続バッファを使用します。SMB/NFS 共有上のライブラリに推奨。",
+    "NAS-optimized I/O": "NAS 最適化 I/O",
+    "Archive Output": "アーカイブ出力",
+    "Keep page order and timestamps stable and write ComicInfo.xml and the cover last, so a metadata edit changes only the end of the archive. Helps rsync and deduplicating backups.": "ページの順序とタイムスタンプを固定し、ComicInfo.xml と表紙を末尾に書き込みます。メタデータを編集してもアーカイブの末尾しか変わらないため、rsync や重複排除バックアップに有効です。",
+    "Deterministic archive output": "決定的なアーカイブ出力",
+    "Offline Cache": "オフラインキャッシュ",
+    "Offline Index": "オフラインインデックス",
+    "Import a Bangumi Archive dump to search and scrape from disk without rate limits. Newer subjects and covers still come from the online API.": "Bangumi Archive のダンプをインポートすると、レート制限なしでローカルから検索・スクレイピングできます。新しい作品と表紙は引き続きオンライン API から取得します。",
+    "Use the offline index when available": "利用可能な場合はオフラインインデックスを使用",
+    "Import Dump...": "ダンプをインポート...",
+    "Import Dump": "ダンプをインポート",
+    "Importing dump...": "ダンプをインポート中...",
+    "{} subjects, {} relations": "{} 作品、{} 関連",
+    "No dump imported": "ダンプ未インポート",
+    "Index unavailable: {}": "インデックスを利用できません：{}",
+    "Imported {} subjects and {} relations.": "{} 作品と {} 件の関連をインポートしました。",
+    "Delete the imported offline index?": "インポートしたオフラインインデックスを削除しますか？",
+    "Bangumi responses and covers are kept on disk and revalidated when they expire, so re-scraping a library rarely needs the network.": "Bangumi の応答と表紙をディスクに保存し、期限切れ時に再検証します。ライブラリを再取得する際にネットワークをほとんど使いません。",
+    "Cache Bangumi responses on disk": "Bangumi の応答をディスクにキャッシュ",
+    "{} entries, {:.1f} MB": "{} 件、{:.1f} MB",
+    "Cache unavailable: {}": "キャッシュを利用できません：{}",
+    "Export...": "エクスポート...",
+    "Import...": "インポート...",
+    "Clear": "クリア",
+    "Export Cache": "キャッシュをエクスポート",
+    "Import Cache": "キャッシュをインポート",
+    "Exported {} cache entries.": "{} 件のキャッシュをエクスポートしました。",
+    "Imported {} cache entries.": "{} 件のキャッシュをインポートしました。",
+    "Export failed: {}": "エクスポートに失敗しました：{}",
+    "Import failed: {}": "インポートに失敗しました：{}",
+    "Delete all cached Bangumi responses and covers?": "キャッシュされた Bangumi の応答と表紙をすべて削除しますか？",
+    "Restore Backup": "バックアップを復元",
+    "Please select files to restore.": "復元するファイルを選択してください。",
+    "Restore the latest backup for {} file(s)? Unsaved changes will be lost.": "{} 個のファイルの最新バックアップを復元しますか？未保存の変更は失われます。",
+    "Restored {} file(s).": "{} 個のファイルを復元しました。",
+    "Backups": "バックアップ",
+    "Keep a copy of each archive before saving. Uses reflinks or hardlinks where the filesystem allows, so backups take almost no extra space.": "保存前に各アーカイブのコピーを保持します。ファイルシステムが対応していれば reflink やハードリンクを使うため、追加容量はほとんど不要です。",
+    "Back up files before saving": "保存前にバックアップ",
+    "Backups per file:": "ファイルごとのバックアップ数：",
+    "Delete after (days):": "削除までの日数：",
     "token_guide_html": "まず<a href='https://bgm.tv/login'>Bangumiにログイン</a>してから、<a href='https://next.bgm.tv/demo/access-token'>こちらでアクセストークンを取得</a>してください。",
     "Save": "保存",
     
@@ -174,6 +241,7 @@ ja_JP = {
     "Connection failed": "接続失敗",
     "Failed to load image: {}": "画像の読み込みに失敗しました：{}",
     "Preparing search...": "検索を準備中...",
+    "Search failed: {}": "検索に失敗しました：{}",
     "Loading volumes...": "巻を読み込み中...",
     
     # Column Settings Dialog
@@ -20,7 +20,26 @@ zh_CN = {
     "Deselect": "取消选择",
     "Invert Selection": "反向选择",
     "Scrape": "刮削元数据",
+    "Auto-Scrape Library": "自动刮削整个库",
+    "Refresh from Bangumi": "从 Bangumi 刷新",
+    "Auto-scraping {} series...": "正在自动刮削 {} 个系列...",
+    "Series matched": "已匹配系列",
+    "Needs review": "待人工确认",
+    "Failed": "失败",
+    "Review Unmatched Series": "确认未匹配的系列",
+    "{} series could not be matched confidently. Double-click one to search for it manually.": "有 {} 个系列无法可靠匹配。双击条目可手动搜索。",
+    "{} ({} files)": "{}（{} 个文件）",
+    "best guess: {} ({}%)": "最佳猜测：{}（{}%）",
+    "no results": "无结果",
     "Auto Number": "自动编号",
+    "Auto Number by Series": "按系列自动编号",
+    "Numbered {} file(s) in {} series.": "已为 {1} 个系列中的 {0} 个文件编号。",
+    "Check these series:": "请检查以下系列：",
+    "missing": "缺少",
+    "duplicate": "重复",
+    "no number": "无编号",
+    "files": "个文件",
+    "... and {} more": "……以及其他 {} 项",
     "Convert Format": "转换格式",
     "Customize Columns": "自定义列",
     "Usage Guide": "使用指南",
@@ -51,6 +70,7 @@ zh_CN = {
     "Convert to:": "转换为：",
     "Conversion completed with errors.": "转换完成但有错误。",
     "Saving... {:.1f}%": "正在保存... {:.1f}%",
+    "{:.1f} MB/s, about {} remaining": "{:.1f} MB/s，预计剩余 {}",
     "Failed files:": "失败的文件：",
     "Converted {} file(s) to {}": "已将 {} 个文件转换为 {}",
     "No files needed conversion.": "没有文件需要转换。",
@@ -73,6 +93,53 @@ zh_CN = {
     "Invalid token. Please check and try again.": "令牌无效。请检查并重试。",
     "Token test failed (HTTP {}).": "令牌测试失败 (HTTP {})。",
     "Connection failed: {}": "连接失败：{}",
+    "Save Settings": "保存设置",
+    "Background Save I/O": "后台保存 I/O",
+    "Limit disk bandwidth used by batch saves so media servers on the same disk stay responsive. 0 means unlimited.": "限制批量保存占用的磁盘带宽，使同一磁盘上的媒体服务器保持响应。0 表示不限制。",
+    "Read limit:": "读取限制：",
+    "Write limit:": "写入限制：",
+    "Low I/O priority (Linux)": "低 I/O 优先级 (Linux)",
+    "Network Storage": "网络存储",
+    "Read archive directories in one request and use large sequential buffers. Recommended for libraries on SMB/NFS shares.": "一次性读取压缩包目录并使用大容量顺序缓冲。推荐用于 SMB/NFS 共享上的漫画库。",
+    "NAS-optimized I/O": "NAS 优化 I/O",
+    "Archive Output": "压缩包输出",
+    "Keep page order and timestamps stable and write ComicInfo.xml and the cover last, so a metadata edit changes only the end of the archive. Helps rsync and deduplicating backups.": "保持页面顺序和时间戳不变，并将 ComicInfo.xml 和封面写在末尾，修改元数据时只会改变压缩包的结尾部分。有利于 rsync 和去重备份。",
+    "Deterministic archive output": "确定性压缩包输出",
+    "Offline Cache": "离线缓存",
+    "Offline Index": "离线索引",
+    "Import a Bangumi Archive dump to search and scrape from disk without rate limits. Newer subjects and covers still come from the online API.": "导入 Bangumi Archive 数据包后，可直接从本地搜索和刮削，不受速率限制。较新的条目和封面仍从在线 API 获取。",
+    "Use the offline index when available": "可用时使用离线索引",
+    "Import Dump...": "导入数据包...",
+    "Import Dump": "导入数据包",
+    "Importing dump...": "正在导入数据包...",
+    "{} subjects, {} relations": "{} 个条目，{} 条关联",
+    "No dump imported": "尚未导入数据包",
+    "Index unavailable: {}": "索引不可用：{}",
+    "Imported {} subjects and {} relations.": "已导入 {} 个条目和 {} 条关联。",
+    "Delete the imported offline index?": "删除已导入的离线索引？",
+    "Bangumi responses and covers are kept on disk and revalidated when they expire, so re-scraping a library rarely needs the network.": "Bangumi 响应和封面会保存在磁盘上，过期后再重新验证，因此重新刮削书库时几乎不需要联网。",
+    "Cache Bangumi responses on disk": "在磁盘上缓存 Bangumi 响应",
+    "{} entries, {:.1f} MB": "{} 条记录，{:.1f} MB",
+    "Cache unavailable: {}": "缓存不可用：{}",
+    "Export...": "导出...",
+    "Import...": "导入...",
+    "Clear": "清空",
+    "Export Cache": "导出缓存",
+    "Import Cache": "导入缓存",
+    "Exported {} cache entries.": "已导出 {} 条缓存记录。",
+    "Imported {} cache entries.": "已导入 {} 条缓存记录。",
+    "Export failed: {}": "导出失败：{}",
+    "Import failed: {}": "导入失败：{}",
+    "Delete all cached Bangumi responses and covers?": "删除所有缓存的 Bangumi 响应和封面？",
+    "Restore Backup": "恢复备份",
+    "Please select files to restore.": "请选择要恢复的文件。",
+    "Restore the latest backup for {} file(s)? Unsaved changes will be lost.": "恢复 {} 个文件的最新备份？未保存的更改将丢失。",
+    "Restored {} file(s).": "已恢复 {} 个文件。",
+    "Backups": "备份",
+    "Keep a copy of each archive before saving. Uses reflinks or hardlinks where the filesystem allows, so backups take almost no extra space.": "保存前为每个压缩包保留一份副本。在文件系统支持时使用 reflink 或硬链接，备份几乎不占用额外空间。",
+    "Back up files before saving": "保存前备份文件",
+    "Backups per file:": "每个文件保留备份数：",
+    "Delete after (days):": "删除早于（天）：",
     "token_guide_html": "您需要先<a href='https://bgm.tv/login'>登录 Bangumi</a>，然后<a href='https://next.bgm.tv/demo/access-token'>在此页面获取 Access Token</a>。",
     "Save": "保存",
     
@@ -174,6 +241,7 @@ zh_CN = {
     "Connection failed": "连接失败",
     "Failed to load image: {}": "加载图片失败：{}",
     "Preparing search...": "正在准备搜索...",
+    "Search failed: {}": "搜索失败：{}",
     "Loading volumes...": "正在加载卷...",
     
     # Column Settings Dialog
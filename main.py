@@ -9,6 +9,7 @@ from PySide6.QtWidgets import QApplication, QMessageBox
 from PySide6.QtGui import QIcon
 from ui.main_window import MainWindow
 from utils.logger import logger
+from utils.text_normalizer import text_normalizer
 
 def exception_hook(exctype, value, tb):
     """Global exception handler."""
@@ -55,6 +56,9 @@ def main():
     if os.path.exists(icon_path):
         app.setWindowIcon(QIcon(icon_path))
     
+    # Load zhconv tables while the window is built, not on the first search
+    text_normalizer.warm_up()
+    
     window = MainWindow()
     window.show()
     
@@ -215,6 +215,12 @@ class ComicTableModel(QAbstractTableModel):
     def refresh_row(self, row):
         self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.visible_columns)-1))
 
+    def refresh_rows(self, rows):
+        """Refresh many rows with a single dataChanged spanning them."""
+        if not rows:
+            return
+        self.dataChanged.emit(self.index(min(rows), 0), self.index(max(rows), len(self.visible_columns)-1))
+
     def refresh_headers(self):
         """Force header update for translation."""
         self.headerDataChanged.emit(Qt.Horizontal, 0, len(self.visible_columns)-1)
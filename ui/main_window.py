@@ -12,6 +12,8 @@ from PySide6.QtCore import Qt, QSize, QItemSelectionModel, QThread, Signal
 
 from core.comic_file import ComicFile
 from core.command_manager import CommandManager
+from core.metadata import MetadataMapper
+from core.auto_scraper import ScrapeGroup, ALL_FIELDS
 from ui.file_table import FileTable, ComicTableModel
 from ui.editor_panel import EditorPanel
 from ui.scraper_dialog import ScraperDialog
@@ -19,6 +21,7 @@ from ui.styles import Styles
 from ui.workers.loader_worker import FileLoaderWorker
 from ui.workers.save_worker import BatchSaveManager
 from ui.workers.scrape_worker import BatchScrapeWorker
+from ui.workers.auto_scrape_worker import AutoScrapeWorker
 from core.translator import translator
 from config import Config
 from utils.logger import logger
@@ -132,14 +135,32 @@ class MainWindow(QMainWindow):
         self.scrape_act.triggered.connect(self.open_scraper)
         self.tools_menu.addAction(self.scrape_act)
         
+        self.auto_scrape_act = QAction("Auto-Scrape Library", self)
+        self.auto_scrape_act.triggered.connect(self.auto_scrape_library)
+        self.tools_menu.addAction(self.auto_scrape_act)
+        
+        self.refresh_meta_act = QAction("Refresh from Bangumi", self)
+        self.refresh_meta_act.triggered.connect(self.refresh_metadata)
+        self.tools_menu.addAction(self.refresh_meta_act)
+        
         self.autonum_act = QAction("Auto Number", self)
         self.autonum_act.triggered.connect(self.auto_number)
         self.tools_menu.addAction(self.autonum_act)
+
+        self.autonum_series_act = QAction("Auto Number by Series", self)
+        self.autonum_series_act.triggered.connect(self.auto_number_series)
+        self.tools_menu.addAction(self.autonum_series_act)
         
         self.convert_act = QAction("Convert Format", self)
         self.convert_act.triggered.connect(self.convert_format)
         self.tools_menu.addAction(self.convert_act)
         
+        self.tools_menu.addSeparator()
+        
+        self.restore_act = QAction("Restore Backup", self)
+        self.restore_act.triggered.connect(self.restore_backup)
+        self.tools_menu.addAction(self.restore_act)
+        
         # Settings Menu
         self.settings_menu = menubar.addMenu("Settings")
         
@@ -161,6 +182,10 @@ class MainWindow(QMainWindow):
         self.bangumi_settings_act.triggered.connect(self.show_bangumi_settings)
         self.settings_menu.addAction(self.bangumi_settings_act)
         
+        self.save_settings_act = QAction(translator.tr("Save Settings"), self)
+        self.save_settings_act.triggered.connect(self.show_save_settings)
+        self.settings_menu.addAction(self.save_settings_act)
+        
         self.settings_menu.addSeparator()
         
         # Check update on startup
@@ -287,12 +312,17 @@ class MainWindow(QMainWindow):
         self.invert_act.setText(translator.tr("Invert Selection"))
         
         self.scrape_act.setText(translator.tr("Scrape"))
+        self.auto_scrape_act.setText(translator.tr("Auto-Scrape Library"))
+        self.refresh_meta_act.setText(translator.tr("Refresh from Bangumi"))
         self.autonum_act.setText(translator.tr("Auto Number"))
+        self.autonum_series_act.setText(translator.tr("Auto Number by Series"))
         self.convert_act.setText(translator.tr("Convert Format"))
+        self.restore_act.setText(translator.tr("Restore Backup"))
         
         self.columns_act.setText(translator.tr("Customize Columns"))
         self.show_toolbar_act.setText(translator.tr("Toolbar"))
         self.bangumi_settings_act.setText(translator.tr("Bangumi Settings"))
+        self.save_settings_act.setText(translator.tr("Save Settings"))
         self.check_update_act.setText(translator.tr("Check for Updates on Startup"))
         
         self.guide_act.setText(translator.tr("Usage Guide"))
@@ -475,6 +505,142 @@ class MainWindow(QMainWindow):
         logger.error(f"Scraping failed with exception: {error_msg}")
         self.scrape_worker = None
 
+    def refresh_metadata(self):
+        """Re-fetch metadata for files already linked to a Bangumi subject (no search)."""
+        if not self.files:
+            QMessageBox.warning(self, translator.tr("Warning"), translator.tr("No files loaded. Please open a folder first."))
+            return
+
+        indexes = self.table.selectionModel().selectedRows()
+        if not indexes:
+            indexes = [self.model.index(i, 0) for i in range(len(self.files))]
+
+        logger.info(f"User started metadata refresh for {len(indexes)} files")
+        # Covers don't change between refreshes; re-downloading them would only force repacks
+        options = {"fields": [f for f in ALL_FIELDS if f != "Cover"]}
+        self.apply_scrape_result(None, 'refresh', indexes, options)
+
+    def auto_scrape_library(self):
+        if not self.files:
+            QMessageBox.warning(self, translator.tr("Warning"), translator.tr("No files loaded. Please open a folder first."))
+            return
+
+        indexes = self.table.selectionModel().selectedRows()
+        rows = [idx.row() for idx in indexes] or list(range(len(self.files)))
+
+        from core.settings_manager import settings_manager
+        token = settings_manager.get("bangumi_token")
+        self.auto_scrape_worker = AutoScrapeWorker(self.files, rows, access_token=token)
+        total_groups = self.auto_scrape_worker.group_count
+        logger.info(f"User started library auto-scrape: {len(rows)} files in {total_groups} series")
+
+        self.auto_scrape_progress = QProgressDialog(translator.tr("Auto-scraping {} series...").format(total_groups),
+                                                    translator.tr("Cancel"), 0, total_groups, self)
+        self.auto_scrape_progress.setWindowModality(Qt.WindowModal)
+        self.auto_scrape_progress.setMinimumDuration(0)
+        self.auto_scrape_progress.canceled.connect(self.auto_scrape_worker.cancel)
+
+        self.auto_scrape_worker.group_finished.connect(self.on_auto_scrape_group)
+        self.auto_scrape_worker.progress_updated.connect(self.on_auto_scrape_progress)
+        self.auto_scrape_worker.finished.connect(self.on_auto_scrape_finished)
+        self.auto_scrape_worker.error_occurred.connect(self.on_auto_scrape_error)
+
+        self.auto_scrape_worker.start()
+
+    def on_auto_scrape_group(self, group):
+        # Stream each applied series into the table as it lands
+        for row in group.rows:
+            self.model.refresh_row(row)
+
+    def on_auto_scrape_progress(self, current, total):
+        if hasattr(self, 'auto_scrape_progress'):
+            self.auto_scrape_progress.setMaximum(total)
+            self.auto_scrape_progress.setValue(current)
+
+    def on_auto_scrape_finished(self, groups):
+        if hasattr(self, 'auto_scrape_progress'):
+            self.auto_scrape_progress.close()
+
+        accepted = [g for g in groups if g.status == ScrapeGroup.ACCEPTED]
+        review = [g for g in groups if g.status in (ScrapeGroup.REVIEW, ScrapeGroup.NO_MATCH)]
+        failed = [g for g in groups if g.status == ScrapeGroup.FAILED]
+        success_count = sum(g.success_count for g in accepted)
+        failed_list = [item for g in accepted for item in g.failed_list]
+        failed_list += [(g.query, g.error) for g in failed]
+
+        msg = translator.tr("Applied metadata to {} files.").format(success_count) + "\n\n" \
+              f"{translator.tr('Series matched')}: {len(accepted)}/{len(groups)}\n" \
+              f"{translator.tr('Needs review')}: {len(review)}\n" \
+              f"{translator.tr('Failed')}: {len(failed)}"
+        if failed_list:
+            error_text = "\n".join(f"{name}: {err}" for name, err in failed_list[:10])
+            if len(failed_list) > 10:
+                error_text += f"\n... and {len(failed_list) - 10} more"
+            msg += f"\n\n{translator.tr('Failed files:')}\n{error_text}"
+            QMessageBox.warning(self, translator.tr("Scraping Completed"), msg)
+        else:
+            QMessageBox.information(self, translator.tr("Scraping Completed"), msg)
+        logger.info(f"Library auto-scrape finished: {len(accepted)} matched, {len(review)} for review, "
+                    f"{len(failed)} failed, {success_count} files updated")
+
+        self.auto_scrape_worker = None
+        self.on_selection_changed()
+        if review:
+            self.show_auto_scrape_review(review)
+
+    def on_auto_scrape_error(self, error_msg):
+        if hasattr(self, 'auto_scrape_progress'):
+            self.auto_scrape_progress.close()
+        QMessageBox.critical(self, translator.tr("Error"), translator.tr("Failed to apply metadata: {}").format(error_msg))
+        logger.error(f"Library auto-scrape failed with exception: {error_msg}")
+        self.auto_scrape_worker = None
+
+    def show_auto_scrape_review(self, groups):
+        """List series that were not applied automatically; each one opens the normal scraper."""
+        dialog = QDialog(self)
+        dialog.setWindowTitle(translator.tr("Review Unmatched Series"))
+        dialog.resize(600, 400)
+
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(translator.tr("{} series could not be matched confidently. "
+                                              "Double-click one to search for it manually.").format(len(groups))))
+
+        list_widget = QListWidget()
+        for group in groups:
+            text = translator.tr("{} ({} files)").format(group.query, len(group.rows))
+            if group.best:
+                text += " — " + translator.tr("best guess: {} ({}%)").format(group.best_name, group.confidence)
+            else:
+                text += " — " + translator.tr("no results")
+            list_widget.addItem(text)
+        layout.addWidget(list_widget)
+
+        def scrape_group(item):
+            row = list_widget.row(item)
+            group = groups[row]
+            selection_model = self.table.selectionModel()
+            selection_model.clearSelection()
+            for file_row in group.rows:
+                selection_model.select(self.model.index(file_row, 0),
+                                       QItemSelectionModel.Select | QItemSelectionModel.Rows)
+            self.table.scrollTo(self.model.index(group.rows[0], 0))
+            self.open_scraper()
+            # Handled (or skipped on purpose): take it off the queue
+            del groups[row]
+            list_widget.takeItem(row)
+            if not groups:
+                dialog.accept()
+
+        list_widget.itemDoubleClicked.connect(scrape_group)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        scrape_btn = button_box.addButton(translator.tr("Scrape"), QDialogButtonBox.ActionRole)
+        scrape_btn.clicked.connect(lambda: list_widget.currentItem() and scrape_group(list_widget.currentItem()))
+        button_box.rejected.connect(dialog.reject)
+        layout.addWidget(button_box)
+
+        dialog.exec()
+
     def auto_number(self):
         if not self.files:
             QMessageBox.warning(self, translator.tr("Warning"), translator.tr("No files loaded. Please open a folder first."))
@@ -492,12 +658,60 @@ class MainWindow(QMainWindow):
         modified_files = CommandManager.auto_number(self.files, indexes)
         
         # Refresh UI for modified rows
-        for idx in indexes:
-            self.model.refresh_row(idx.row())
+        self.model.refresh_rows([idx.row() for idx in indexes])
         
         logger.info(f"Auto-numbering completed for {len(modified_files)} files")
         self.on_selection_changed()
 
+    def auto_number_series(self):
+        if not self.files:
+            QMessageBox.warning(self, translator.tr("Warning"), translator.tr("No files loaded. Please open a folder first."))
+            return
+
+        indexes = self.table.selectionModel().selectedRows()
+        if not indexes:
+            indexes = [self.model.index(i, 0) for i in range(len(self.files))]
+
+        logger.info(f"User triggered series auto-numbering for {len(indexes)} files")
+        start = time.perf_counter()
+        modified_rows, groups = CommandManager.auto_number_series(self.files, indexes)
+        self.model.refresh_rows(modified_rows)
+        logger.info(f"Series auto-numbering updated {len(modified_rows)} files in {len(groups)} series "
+                    f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+        def fmt_ranges(nums):
+            """3, 7-9, 12"""
+            parts = []
+            for n in nums:
+                if parts and n == parts[-1][1] + 1:
+                    parts[-1][1] = n
+                else:
+                    parts.append([n, n])
+            return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in parts)
+
+        issues = []
+        for group in sorted(groups, key=lambda g: g.name.casefold()):
+            gaps = group.gaps
+            if gaps:
+                issues.append(f"{group.name}: {translator.tr('missing')} {fmt_ranges(gaps)}")
+            for num, rows in sorted(group.duplicates.items()):
+                names = ", ".join(self.files[r].file_path.name for r in rows)
+                issues.append(f"{group.name}: {translator.tr('duplicate')} {MetadataMapper._format_number(num)} ({names})")
+            if group.unnumbered:
+                issues.append(f"{group.name}: {translator.tr('no number')} "
+                              f"({len(group.unnumbered)} {translator.tr('files')})")
+
+        msg = translator.tr("Numbered {} file(s) in {} series.").format(len(modified_rows), len(groups))
+        if issues:
+            issue_text = "\n".join(issues[:20])
+            if len(issues) > 20:
+                issue_text += "\n" + translator.tr("... and {} more").format(len(issues) - 20)
+            msg += f"\n\n{translator.tr('Check these series:')}\n{issue_text}"
+            QMessageBox.warning(self, translator.tr("Auto Number by Series"), msg)
+        else:
+            QMessageBox.information(self, translator.tr("Auto Number by Series"), msg)
+        self.on_selection_changed()
+
     def convert_format(self):
         if not self.files:
             QMessageBox.warning(self, translator.tr("Warning"), translator.tr("No files loaded. Please open a folder first."))
@@ -543,6 +757,37 @@ class MainWindow(QMainWindow):
             
         self.on_selection_changed()
 
+    def restore_backup(self):
+        if not self.files:
+            QMessageBox.warning(self, translator.tr("Warning"), translator.tr("No files loaded. Please open a folder first."))
+            return
+
+        indexes = self.table.selectionModel().selectedRows()
+        if not indexes:
+            QMessageBox.warning(self, translator.tr("Warning"), translator.tr("Please select files to restore."))
+            return
+
+        reply = QMessageBox.question(self, translator.tr("Restore Backup"),
+                                     translator.tr("Restore the latest backup for {} file(s)? Unsaved changes will be lost.").format(len(indexes)))
+        if reply != QMessageBox.Yes:
+            return
+
+        logger.info(f"User restoring backups for {len(indexes)} files")
+        success_count, failed_list = CommandManager.restore_backups(self.files, indexes)
+
+        for idx in indexes:
+            self.model.refresh_row(idx.row())
+
+        if failed_list:
+            error_text = "\n".join(f"{name}: {err}" for name, err in failed_list)
+            QMessageBox.warning(self, translator.tr("Restore Backup"),
+                                translator.tr("Restored {} file(s).").format(success_count) +
+                                f"\n\n{translator.tr('Failed files:')}\n{error_text}")
+        else:
+            QMessageBox.information(self, translator.tr("Success"), translator.tr("Restored {} file(s).").format(success_count))
+
+        self.on_selection_changed()
+
     def confirm_save(self, files_to_save):
         dialog = QDialog(self)
         dialog.setWindowTitle(translator.tr("Confirm Save"))
@@ -574,6 +819,7 @@ class MainWindow(QMainWindow):
         self.progress_dialog.canceled.connect(self.save_manager.cancel)
         
         self.save_manager.progress_updated.connect(self.on_save_progress)
+        self.save_manager.throughput_updated.connect(self.on_save_throughput)
         self.save_manager.file_completed.connect(self.on_file_saved)
         self.save_manager.file_failed.connect(self.on_file_failed)
         self.save_manager.all_finished.connect(self.on_save_finished)
@@ -586,6 +832,16 @@ class MainWindow(QMainWindow):
         percent = (current / total) * 100 if total > 0 else 0
         self.status_label.setText(translator.tr("Saving... {:.1f}%").format(percent))
 
+    def on_save_throughput(self, bytes_per_second, eta_seconds):
+        if bytes_per_second <= 0 or eta_seconds < 0:
+            return
+        mb_per_second = bytes_per_second / 1024 / 1024
+        minutes, seconds = divmod(int(eta_seconds), 60)
+        eta = f"{minutes}:{seconds:02d}"
+        self.progress_dialog.setLabelText(
+            translator.tr("Saving files...") + "\n" +
+            translator.tr("{:.1f} MB/s, about {} remaining").format(mb_per_second, eta))
+
     def on_file_saved(self, comic_file):
         try:
             row = self.files.index(comic_file)
@@ -865,3 +1121,7 @@ del "%~f0"
         dialog = SettingsDialog(self)
         dialog.exec()
 
+    def show_save_settings(self):
+        from ui.save_settings_dialog import SaveSettingsDialog
+        dialog = SaveSettingsDialog(self)
+        dialog.exec()
@@ -0,0 +1,135 @@
+import sys
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                               QPushButton, QGroupBox, QFormLayout, QDoubleSpinBox,
+                               QSpinBox, QCheckBox)
+from core.settings_manager import settings_manager
+from core.translator import translator
+from config import Config
+
+class SaveSettingsDialog(QDialog):
+    """Options that control how archives are written to disk."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(translator.tr("Save Settings"))
+        self.setMinimumWidth(400)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 10, 10, 10)
+
+        # I/O Limits Group
+        io_group = QGroupBox(translator.tr("Background Save I/O"))
+        io_layout = QVBoxLayout(io_group)
+
+        help_label = QLabel(translator.tr("Limit disk bandwidth used by batch saves so media servers on the same disk stay responsive. 0 means unlimited."))
+        help_label.setWordWrap(True)
+        help_label.setStyleSheet("color: #a1a1aa; font-size: 12px;")
+        io_layout.addWidget(help_label)
+
+        form = QFormLayout()
+        self.read_limit_input = self._make_mbps_spinbox(
+            settings_manager.get("io_read_limit_mbps", Config.IO_READ_LIMIT_MBPS))
+        self.write_limit_input = self._make_mbps_spinbox(
+            settings_manager.get("io_write_limit_mbps", Config.IO_WRITE_LIMIT_MBPS))
+        form.addRow(translator.tr("Read limit:"), self.read_limit_input)
+        form.addRow(translator.tr("Write limit:"), self.write_limit_input)
+        io_layout.addLayout(form)
+
+        self.low_priority_cb = QCheckBox(translator.tr("Low I/O priority (Linux)"))
+        self.low_priority_cb.setChecked(settings_manager.get("io_low_priority", Config.IO_LOW_PRIORITY))
+        # Per-thread I/O priority is only applied on Linux
+        self.low_priority_cb.setEnabled(sys.platform.startswith("linux"))
+        io_layout.addWidget(self.low_priority_cb)
+
+        layout.addWidget(io_group)
+
+        # Network Storage Group
+        nas_group = QGroupBox(translator.tr("Network Storage"))
+        nas_layout = QVBoxLayout(nas_group)
+
+        nas_help = QLabel(translator.tr("Read archive directories in one request and use large sequential buffers. Recommended for libraries on SMB/NFS shares."))
+        nas_help.setWordWrap(True)
+        nas_help.setStyleSheet("color: #a1a1aa; font-size: 12px;")
+        nas_layout.addWidget(nas_help)
+
+        self.nas_mode_cb = QCheckBox(translator.tr("NAS-optimized I/O"))
+        self.nas_mode_cb.setChecked(settings_manager.get("nas_io_mode", Config.NAS_IO_MODE))
+        nas_layout.addWidget(self.nas_mode_cb)
+
+        layout.addWidget(nas_group)
+
+        # Output Group
+        output_group = QGroupBox(translator.tr("Archive Output"))
+        output_layout = QVBoxLayout(output_group)
+
+        output_help = QLabel(translator.tr("Keep page order and timestamps stable and write ComicInfo.xml and the cover last, so a metadata edit changes only the end of the archive. Helps rsync and deduplicating backups."))
+        output_help.setWordWrap(True)
+        output_help.setStyleSheet("color: #a1a1aa; font-size: 12px;")
+        output_layout.addWidget(output_help)
+
+        self.deterministic_cb = QCheckBox(translator.tr("Deterministic archive output"))
+        self.deterministic_cb.setChecked(settings_manager.get("deterministic_save", Config.DETERMINISTIC_SAVE))
+        output_layout.addWidget(self.deterministic_cb)
+
+        layout.addWidget(output_group)
+
+        # Backup Group
+        backup_group = QGroupBox(translator.tr("Backups"))
+        backup_layout = QVBoxLayout(backup_group)
+
+        backup_help = QLabel(translator.tr("Keep a copy of each archive before saving. Uses reflinks or hardlinks where the filesystem allows, so backups take almost no extra space."))
+        backup_help.setWordWrap(True)
+        backup_help.setStyleSheet("color: #a1a1aa; font-size: 12px;")
+        backup_layout.addWidget(backup_help)
+
+        self.backup_cb = QCheckBox(translator.tr("Back up files before saving"))
+        self.backup_cb.setChecked(settings_manager.get("backup_enabled", Config.BACKUP_ENABLED))
+        backup_layout.addWidget(self.backup_cb)
+
+        backup_form = QFormLayout()
+        self.backup_keep_input = QSpinBox()
+        self.backup_keep_input.setRange(0, 100)
+        self.backup_keep_input.setValue(settings_manager.get("backup_keep", Config.BACKUP_KEEP_PER_FILE))
+        self.backup_age_input = QSpinBox()
+        self.backup_age_input.setRange(0, 3650)
+        self.backup_age_input.setValue(settings_manager.get("backup_max_age_days", Config.BACKUP_MAX_AGE_DAYS))
+        backup_form.addRow(translator.tr("Backups per file:"), self.backup_keep_input)
+        backup_form.addRow(translator.tr("Delete after (days):"), self.backup_age_input)
+        backup_layout.addLayout(backup_form)
+
+        layout.addWidget(backup_group)
+
+        # Buttons
+        btn_layout = QHBoxLayout()
+        save_btn = QPushButton(translator.tr("Save"))
+        save_btn.clicked.connect(self.save_settings)
+        save_btn.setProperty("class", "primary")
+
+        cancel_btn = QPushButton(translator.tr("Cancel"))
+        cancel_btn.clicked.connect(self.reject)
+
+        btn_layout.addStretch()
+        btn_layout.addWidget(cancel_btn)
+        btn_layout.addWidget(save_btn)
+        layout.addLayout(btn_layout)
+
+    def _make_mbps_spinbox(self, value):
+        spin = QDoubleSpinBox()
+        spin.setRange(0, 10000)
+        spin.setDecimals(1)
+        spin.setSuffix(" MB/s")
+        spin.setValue(float(value or 0))
+        return spin
+
+    def save_settings(self):
+        settings_manager.set("io_read_limit_mbps", self.read_limit_input.value())
+        settings_manager.set("io_write_limit_mbps", self.write_limit_input.value())
+        settings_manager.set("io_low_priority", self.low_priority_cb.isChecked())
+        settings_manager.set("nas_io_mode", self.nas_mode_cb.isChecked())
+        settings_manager.set("deterministic_save", self.deterministic_cb.isChecked())
+        settings_manager.set("backup_enabled", self.backup_cb.isChecked())
+        settings_manager.set("backup_keep", self.backup_keep_input.value())
+        settings_manager.set("backup_max_age_days", self.backup_age_input.value())
+        self.accept()
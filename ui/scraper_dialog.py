@@ -1,16 +1,21 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, 
-                               QPushButton, QListWidget, QListWidgetItem, QLabel, 
+                               QPushButton, QLabel, 
                                QWidget, QMessageBox, QProgressBar, QStackedWidget,
                                QSplitter, QTextEdit, QCheckBox, QComboBox)
-from PySide6.QtCore import Qt, QThread, Signal, QSize
-from PySide6.QtGui import QPixmap, QImage
+from PySide6.QtCore import Qt, QThread, Signal, QTimer
+from PySide6.QtGui import QPixmap
 
-from core.scraper import BangumiScraper
-import requests
+from config import Config
+from core.local_index import create_scraper
+from core.rate_scheduler import CancelToken, RequestCancelled, request_scheduler
+from core.scraper import normalize_query
 from core.translator import translator
+from ui.workers.cover_loader import CoverLoader
+from ui.search_results import SearchResultModel, create_result_view, result_cover_url
 
 class SearchThread(QThread):
     resultsReady = Signal(list)
+    partialResults = Signal(list)  # Sorted matches so far, while candidates are enriched
     errorOccurred = Signal(str)
     statusUpdate = Signal(str)
 
@@ -19,23 +24,34 @@ class SearchThread(QThread):
         self.scraper = scraper
         self.query = query
         self._is_cancelled = False
+        self._cancel_token = CancelToken()
 
     def run(self):
         try:
             if self._is_cancelled:
                 return
             self.statusUpdate.emit(translator.tr("Connecting to Bangumi API..."))
-            results = self.scraper.search_subjects(self.query)
+            def on_partial(partial):
+                if not self._is_cancelled:
+                    self.partialResults.emit(partial)
+
+            with request_scheduler.cancellation(self._cancel_token):
+                results = self.scraper.search_subjects(self.query, on_partial=on_partial)
             if self._is_cancelled:
                 return
+            results = results or []
             self.statusUpdate.emit(translator.tr("Found {} results").format(len(results)))
             self.resultsReady.emit(results)
+        except RequestCancelled:
+            pass
         except Exception as e:
             if not self._is_cancelled:
                 self.errorOccurred.emit(str(e))
     
     def cancel(self):
+        """Stop emitting and drop this search's requests that haven't been sent yet."""
         self._is_cancelled = True
+        self._cancel_token.cancel()
 
 class VolumeThread(QThread):
     volumesReady = Signal(list)
@@ -73,348 +89,6 @@ class VolumeThread(QThread):
     def cancel(self):
         self._is_cancelled = True
 
-class ImageLoader(QThread):
-    imageLoaded = Signal(QPixmap)
-    errorOccurred = Signal(str)
-    
-    def __init__(self, url, timeout=10):
-        super().__init__()
-        self.url = url
-        self.timeout = timeout
-        self._is_cancelled = False
-        
-    def run(self):
-        try:
-            if not self.url or self._is_cancelled:
-                return
-            resp = requests.get(self.url, timeout=self.timeout)
-            if self._is_cancelled:
-                return
-            resp.raise_for_status()
-            img = QImage.fromData(resp.content)
-            if not img.isNull() and not self._is_cancelled:
-                self.imageLoaded.emit(QPixmap.fromImage(img))
-        except requests.exceptions.Timeout:
-            if not self._is_cancelled:
-                self.errorOccurred.emit(translator.tr("Image load timeout"))
-        except requests.exceptions.ConnectionError:
-            if not self._is_cancelled:
-                self.errorOccurred.emit(translator.tr("Connection failed"))
-        except Exception as e:
-            if not self._is_cancelled:
-                self.errorOccurred.emit(translator.tr("Failed to load image: {}").format(str(e)))
-    
-    def cancel(self):
-        self._is_cancelled = True
-
-# ==================== Helper Functions ====================
-
-def extract_infobox_value(infobox, key):
-    """
-    从 Bangumi infobox 中提取指定键的值
-    
-    Args:
-        infobox: infobox 数组
-        key: 要查找的键名
-        
-    Returns:
-        提取的值，如果未找到返回 None
-    """
-    if not infobox:
-        return None
-    
-    for item in infobox:
-        if item.get("key") == key:
-            val = item.get("value")
-            # 处理不同类型的值
-            if isinstance(val, list):
-                # 处理列表类型的值
-                result = []
-                for v in val:
-                    if isinstance(v, dict):
-                        result.append(v.get("v", ""))
-                    else:
-                        result.append(str(v))
-                return ", ".join(result) if result else None
-            elif isinstance(val, dict):
-                return val.get("v", str(val))
-            else:
-                return str(val) if val else None
-    return None
-
-def format_rating_info(data):
-    """
-    格式化评分信息显示
-    
-    Args:
-        data: 包含评分信息的数据字典
-        
-    Returns:
-        格式化的评分字符串
-    """
-    parts = []
-    
-    # 评分
-    if "rating" in data and isinstance(data["rating"], dict):
-        rating_data = data["rating"]
-        score = rating_data.get("score")
-        if score:
-            parts.append(f"⭐ {score}")
-            
-            # 评分人数
-            count = rating_data.get("total")
-            if count:
-                parts.append(f"({count} ratings)")
-            
-            # 排名
-            rank = rating_data.get("rank")
-            if rank:
-                parts.append(f"Rank #{rank}")
-    elif "score" in data:
-        # 兼容旧格式
-        parts.append(f"⭐ {data['score']}")
-    
-    return " ".join(parts) if parts else None
-
-def format_collection_info(data):
-    """
-    格式化收藏信息显示
-    
-    Args:
-        data: 包含收藏信息的数据字典
-        
-    Returns:
-        格式化的收藏字符串
-    """
-    if "collection" in data and isinstance(data["collection"], dict):
-        total = data["collection"].get("collect", 0)
-        if total > 0:
-            if total >= 10000:
-                return f"📚 {total/10000:.1f}万收藏"
-            else:
-                return f"📚 {total}收藏"
-    return None
-
-def extract_author_info(infobox):
-    """
-    从 infobox 提取作者信息
-    
-    Args:
-        infobox: infobox 数组
-        
-    Returns:
-        作者信息字符串
-    """
-    authors = []
-    
-    # 尝试多个可能的键名
-    for key in ["作者", "漫画", "著者", "原作", "作画"]:
-        value = extract_infobox_value(infobox, key)
-        if value and value not in authors:
-            authors.append(value)
-    
-    return " / ".join(authors[:2]) if authors else None  # 最多显示2个作者
-
-def extract_publisher_info(infobox):
-    """
-    从 infobox 提取出版社信息
-    
-    Args:
-        infobox: infobox 数组
-        
-    Returns:
-        出版社信息字符串
-    """
-    return extract_infobox_value(infobox, "出版社") or extract_infobox_value(infobox, "中文出版社")
-
-def extract_volume_count(infobox):
-    """
-    从 infobox 提取卷数信息
-    
-    Args:
-        infobox: infobox 数组
-        
-    Returns:
-        卷数字符串
-    """
-    count = extract_infobox_value(infobox, "话数") or extract_infobox_value(infobox, "卷数")
-    if count:
-        # 尝试提取数字
-        import re
-        match = re.search(r'\d+', str(count))
-        if match:
-            return f"{match.group()}卷"
-    return None
-
-def extract_status_info(data):
-    """
-    提取连载状态信息
-    
-    Args:
-        data: 元数据字典
-        
-    Returns:
-        状态字符串和颜色
-    """
-    # 从 tags 中查找状态
-    tags = data.get("tags", [])
-    if isinstance(tags, list):
-        for tag in tags:
-            if isinstance(tag, dict):
-                name = tag.get("name", "")
-                if "连载" in name:
-                    return ("连载中", "#10b981")
-                elif "完结" in name or "已完结" in name:
-                    return ("已完结", "#6b7280")
-    
-    # 从 infobox 查找
-    infobox = data.get("infobox", [])
-    status = extract_infobox_value(infobox, "连载状态") or extract_infobox_value(infobox, "状态")
-    if status:
-        if "连载" in status:
-            return (status, "#10b981")
-        elif "完结" in status:
-            return (status, "#6b7280")
-        return (status, "#71717a")
-    
-    return None
-
-class ResultItemWidget(QWidget):
-    def __init__(self, data, parent=None):
-        super().__init__(parent)
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(8, 8, 8, 8)
-        layout.setSpacing(10)
-        
-        self.image_loader = None  # Track image loader thread
-        
-        # Cover
-        self.cover_lbl = QLabel()
-        self.cover_lbl.setFixedSize(50, 75)
-        self.cover_lbl.setStyleSheet("background-color: #333; border: 1px solid #444; border-radius: 4px;")
-        self.cover_lbl.setScaledContents(True)
-        layout.addWidget(self.cover_lbl)
-        
-        # Load cover async
-        images = data.get("images") or data.get("image")
-        if images and isinstance(images, dict):
-            url = images.get("common") or images.get("medium") or images.get("grid")
-            if url:
-                if url.startswith("//"): url = "https:" + url
-                self.image_loader = ImageLoader(url)
-                self.image_loader.imageLoaded.connect(self.cover_lbl.setPixmap)
-                self.image_loader.finished.connect(self.image_loader.deleteLater)
-                self.image_loader.start()
-        
-        # Info Layout (右侧所有信息)
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(4)
-        
-        # ========== 第一行：标题 + 徽章 ==========
-        title_row = QHBoxLayout()
-        title_row.setSpacing(6)
-        
-        title_txt = data.get("name_cn") or data.get("name")
-        title = QLabel(title_txt)
-        title.setStyleSheet("font-weight: bold; font-size: 14px; color: #e4e4e7;")
-        title.setWordWrap(False)
-        title_row.addWidget(title, 1)
-        
-        # Type Badge (Series/Volume)
-        type_label = data.get("type_label", "Unknown")
-        badge_color = "#3b82f6" if type_label == "Series" else "#71717a"
-        badge = QLabel(f" {type_label} ")
-        badge.setStyleSheet(f"background-color: {badge_color}; color: white; border-radius: 3px; padding: 2px 6px; font-size: 10px; font-weight: bold;")
-        badge.setFixedHeight(18)
-        title_row.addWidget(badge)
-        
-        # Platform Badge (漫画/小说/画集)
-        platform = data.get("platform", "")
-        if platform:
-            platform_colors = {
-                "漫画": "#10b981",  # Green
-                "小说": "#f59e0b",  # Orange
-                "画集": "#8b5cf6",  # Purple
-            }
-            platform_color = platform_colors.get(platform, "#6b7280")
-            platform_badge = QLabel(f" {platform} ")
-            platform_badge.setStyleSheet(f"background-color: {platform_color}; color: white; border-radius: 3px; padding: 2px 6px; font-size: 10px; font-weight: bold;")
-            platform_badge.setFixedHeight(18)
-            title_row.addWidget(platform_badge)
-        
-        # Status Badge (连载中/已完结)
-        status_info = extract_status_info(data)
-        if status_info:
-            status_text, status_color = status_info
-            status_badge = QLabel(f" {status_text} ")
-            status_badge.setStyleSheet(f"background-color: {status_color}; color: white; border-radius: 3px; padding: 2px 6px; font-size: 10px;")
-            status_badge.setFixedHeight(18)
-            title_row.addWidget(status_badge)
-        
-        title_row.addStretch()
-        info_layout.addLayout(title_row)
-        
-        # ========== 第二行：原文标题 ==========
-        orig_name = data.get("name")
-        if orig_name and orig_name != title_txt:
-            orig_title = QLabel(orig_name)
-            orig_title.setStyleSheet("color: #a1a1aa; font-size: 12px;")
-            orig_title.setWordWrap(False)
-            info_layout.addWidget(orig_title)
-        
-        # ========== 第三行：作者 + 出版社 ==========
-        infobox = data.get("infobox", [])
-        author_publisher_parts = []
-        
-        author = extract_author_info(infobox)
-        if author:
-            author_publisher_parts.append(f"✍ {author}")
-        
-        publisher = extract_publisher_info(infobox)
-        if publisher:
-            author_publisher_parts.append(f"📖 {publisher}")
-        
-        if author_publisher_parts:
-            author_publisher_label = QLabel(" · ".join(author_publisher_parts))
-            author_publisher_label.setStyleSheet("color: #a1a1aa; font-size: 11px;")
-            author_publisher_label.setWordWrap(False)
-            info_layout.addWidget(author_publisher_label)
-        
-        # ========== 第四行：评分 + 收藏 + 日期 + ID ==========
-        details_parts = []
-        
-        # 评分信息
-        rating_str = format_rating_info(data)
-        if rating_str:
-            details_parts.append(rating_str)
-        
-        # 收藏数
-        collection_str = format_collection_info(data)
-        if collection_str:
-            details_parts.append(collection_str)
-        
-        # 卷数（仅 Series）
-        if data.get("type_label") == "Series":
-            volume_count = extract_volume_count(infobox)
-            if volume_count:
-                details_parts.append(f"📚 {volume_count}")
-        
-        # 日期
-        if "date" in data and data["date"]:
-            details_parts.append(f"📅 {data['date']}")
-        
-        # ID
-        if "id" in data:
-            details_parts.append(f"ID: {data['id']}")
-        
-        if details_parts:
-            details = QLabel(" · ".join(details_parts))
-            details.setStyleSheet("color: #71717a; font-size: 11px;")
-            details.setWordWrap(True)
-            info_layout.addWidget(details)
-        
-        layout.addLayout(info_layout, 1)
-
 class ScraperDialog(QDialog):
     metadataSelected = Signal(dict, str, dict) # metadata, type, options
 
@@ -425,13 +99,21 @@ class ScraperDialog(QDialog):
         
         from core.settings_manager import settings_manager
         token = settings_manager.get("bangumi_token")
-        self.scraper = BangumiScraper(access_token=token)
+        self.scraper = create_scraper(access_token=token)
         
         self.initial_query = initial_query
         self._threads = []
         self._current_search_thread = None
         self._current_volume_thread = None
-        self._image_loaders = []  # Track image loader threads
+        self._search_key = None  # Normalized query of the search shown or running
+        self._search_explicit = True  # Started with Enter/Search rather than by typing
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(Config.SCRAPER_SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self.search_as_typed)
+        self.cover_loader = CoverLoader(self)
+        self.result_model = SearchResultModel(self.cover_loader, self)
+        self.volume_model = SearchResultModel(self.cover_loader, self)
         self.field_checkboxes = {}
         self.init_ui()
 
@@ -449,15 +131,19 @@ class ScraperDialog(QDialog):
             "fields": fields
         }
 
+    @staticmethod
+    def _selected_result(view):
+        """Result dict of the selected row in a result view, or None."""
+        indexes = view.selectionModel().selectedRows()
+        return indexes[0].data(Qt.UserRole) if indexes else None
+
     def apply_selection(self, mode):
         if mode == 'series':
-            items = self.result_list.selectedItems()
+            data = self._selected_result(self.result_list)
         else:
-            items = self.volume_list.selectedItems()
+            data = self._selected_result(self.volume_list)
             
-        if not items: return
-        
-        data = items[0].data(Qt.UserRole)
+        if not data: return
         
         # 如果是从搜索结果页面应用，根据实际类型决定mode
         if mode == 'series':
@@ -555,6 +241,7 @@ class ScraperDialog(QDialog):
         self.search_input = QLineEdit(self.initial_query)
         self.search_input.setPlaceholderText(translator.tr("Enter series name..."))
         self.search_input.returnPressed.connect(self.start_search)
+        self.search_input.textChanged.connect(self.on_query_edited)
         
         self.search_btn = QPushButton(translator.tr("Search"))
         self.search_btn.clicked.connect(self.start_search)
@@ -577,12 +264,9 @@ class ScraperDialog(QDialog):
         layout.addWidget(self.search_progress)
         
         # Results List
-        self.result_list = QListWidget()
-        self.result_list.setStyleSheet("QListWidget::item { border-bottom: 1px solid #27272a; }")
-        self.result_list.setVerticalScrollMode(QListWidget.ScrollPerPixel)
-        self.result_list.setHorizontalScrollMode(QListWidget.ScrollPerPixel)
-        self.result_list.itemSelectionChanged.connect(self.on_search_selection)
-        self.result_list.itemDoubleClicked.connect(self.view_volumes)
+        self.result_list = create_result_view(self.result_model)
+        self.result_list.selectionModel().selectionChanged.connect(self.on_search_selection)
+        self.result_list.doubleClicked.connect(self.view_volumes)
         layout.addWidget(self.result_list)
         
         # Buttons
@@ -659,15 +343,10 @@ class ScraperDialog(QDialog):
         self.vol_progress.hide()
         right_layout.addWidget(self.vol_progress)
         
-        self.volume_list = QListWidget()
-        self.volume_list.setStyleSheet("""
-            QListWidget { background-color: #18181b; border: 1px solid #27272a; border-radius: 4px; }
-            QListWidget::item { border-bottom: 1px solid #27272a; padding: 5px; }
-            QListWidget::item:selected { background-color: #27272a; }
-        """)
-        self.volume_list.setVerticalScrollMode(QListWidget.ScrollPerPixel)
-        self.volume_list.setHorizontalScrollMode(QListWidget.ScrollPerPixel)
-        self.volume_list.itemSelectionChanged.connect(self.on_volume_selection)
+        self.volume_list = create_result_view(self.volume_model)
+        self.volume_list.setStyleSheet(
+            "QListView { background-color: #18181b; border: 1px solid #27272a; border-radius: 4px; }")
+        self.volume_list.selectionModel().selectionChanged.connect(self.on_volume_selection)
         right_layout.addWidget(self.volume_list)
         
         content_layout.addLayout(right_layout)
@@ -684,71 +363,119 @@ class ScraperDialog(QDialog):
         btn_layout.addWidget(self.apply_vol_btn)
         layout.addLayout(btn_layout)
 
+    def on_query_edited(self, text):
+        """Search once typing pauses (Enter searches at once, whatever the length)."""
+        if len(text.strip()) >= Config.SCRAPER_SEARCH_MIN_CHARS:
+            self._search_timer.start()
+        else:
+            self._search_timer.stop()
+
+    def search_as_typed(self):
+        self._run_search(self.search_input.text().strip(), explicit=False)
+
     def start_search(self):
-        query = self.search_input.text().strip()
+        self._search_timer.stop()
+        self._run_search(self.search_input.text().strip(), explicit=True)
+
+    def _run_search(self, query, explicit):
         if not query:
             return
-        
-        # Cancel any running search thread
-        if self._current_search_thread and self._current_search_thread.isRunning():
+        key = normalize_query(query)
+        if not explicit and key == self._search_key:
+            return  # Only whitespace/case changed; keep what is shown or running
+        self._search_key = key
+        self._search_explicit = explicit
+        
+        # Superseded search: its queued requests leave the rate limiter queue
+        # now, and anything it still emits is ignored (see _from_current_search)
+        if self._current_search_thread is not None:
             self._current_search_thread.cancel()
-            self._current_search_thread.wait(1000)  # Wait up to 1 second
-            if self._current_search_thread.isRunning():
-                self._current_search_thread.terminate()
-                self._current_search_thread.wait()
         
         self.search_status.setText(translator.tr("Preparing search..."))
         self.search_status.show()
         self.search_progress.show()
-        self.result_list.clear()
+        self.result_model.clear()
         self.apply_series_btn.setEnabled(False)
         self.view_vols_btn.setEnabled(False)
-        self.search_btn.setEnabled(False)  # Disable search button
         
         thread = SearchThread(self.scraper, query)
         thread.resultsReady.connect(self.on_search_results)
-        thread.errorOccurred.connect(self.on_error)
+        thread.partialResults.connect(self.on_search_partial)
+        thread.errorOccurred.connect(self.on_search_error)
         thread.statusUpdate.connect(self.on_search_status)
         thread.finished.connect(lambda: self.on_search_finished(thread))
         self._threads.append(thread)
         self._current_search_thread = thread
         thread.start()
 
+    def _from_current_search(self):
+        """False while handling a signal from a superseded search thread."""
+        sender = self.sender()
+        return sender is None or sender is self._current_search_thread
+
     def on_search_status(self, status):
-        self.search_status.setText(status)
+        if self._from_current_search():
+            self.search_status.setText(status)
     
     def on_search_finished(self, thread):
         """Called when search thread finishes"""
-        self.search_btn.setEnabled(True)  # Re-enable search button
         self.cleanup_thread(thread)
         if thread == self._current_search_thread:
             self._current_search_thread = None
 
+    def on_search_error(self, msg):
+        if not self._from_current_search():
+            return
+        self._search_key = None  # Let the same query be retried by typing
+        if self._search_explicit:
+            self.on_error(msg)
+            return
+        # Don't interrupt typing with a dialog
+        self.search_progress.hide()
+        self.search_status.setText(translator.tr("Search failed: {}").format(msg))
+        self.search_status.show()
+
+    def on_search_partial(self, results):
+        """Show candidates as they arrive; final order is applied in on_search_results."""
+        if self._from_current_search():
+            self.result_model.update_results(results)
+
     def on_search_results(self, results):
+        if not self._from_current_search():
+            return
         self.search_progress.hide()
         self.search_status.hide()
         if not results:
-            QMessageBox.information(self, translator.tr("No Results"), translator.tr("No matches found. Try a different search term."))
+            # Drop preliminary rows that enrichment filtered out
+            self.result_model.clear()
+            if self._search_explicit:
+                QMessageBox.information(self, translator.tr("No Results"), translator.tr("No matches found. Try a different search term."))
+            else:
+                self.search_status.setText(translator.tr("No matches found. Try a different search term."))
+                self.search_status.show()
             return
-            
-        for res in results:
-            item = QListWidgetItem(self.result_list)
-            item.setSizeHint(QSize(0, 110))  # 增加高度以容纳更多信息
-            item.setData(Qt.UserRole, res)
-            widget = ResultItemWidget(res)
-            self.result_list.setItemWidget(item, widget)
-            # Track image loader if it exists
-            if widget.image_loader:
-                self._image_loaders.append(widget.image_loader)
+        
+        # Partial results arrive in completion order; reorder only if the final order differs
+        if [res.get("id") for res in results] == self.result_model.ids():
+            self.result_model.update_results(results)
+            return
+        
+        selected = self._selected_result(self.result_list)
+        selected_id = selected.get("id") if selected else None
+        self.result_model.set_results(results)
+        
+        if selected_id is not None:
+            row = self.result_model.row_of(selected_id)
+            if row >= 0:
+                self.result_list.setCurrentIndex(self.result_model.index(row))
 
     def on_search_selection(self):
-        items = self.result_list.selectedItems()
-        if not items:
+        data = self._selected_result(self.result_list)
+        if not data:
             self.apply_series_btn.setEnabled(False)
             self.view_vols_btn.setEnabled(False)
             return
             
-        data = items[0].data(Qt.UserRole)
         is_series = data.get("type_label") == "Series"
         
         # 根据类型调整按钮
@@ -761,11 +488,8 @@ class ScraperDialog(QDialog):
             self.view_vols_btn.setEnabled(False)
 
     def view_volumes(self):
-        items = self.result_list.selectedItems()
-        if not items: return
-        
-        data = items[0].data(Qt.UserRole)
-        if data.get("type_label") != "Series":
+        data = self._selected_result(self.result_list)
+        if not data or data.get("type_label") != "Series":
             return
             
         self.current_series = data
@@ -773,14 +497,13 @@ class ScraperDialog(QDialog):
         self.series_summary.setText(data.get("summary", translator.tr("No summary available.")))
         
         # Load large cover
-        images = data.get("images") or data.get("image")
-        if images and isinstance(images, dict):
-            url = images.get("large") or images.get("common")
-            if url:
-                if url.startswith("//"): url = "https:" + url
-                self.loader = ImageLoader(url)
-                self.loader.imageLoaded.connect(lambda p: self.series_cover_large.setPixmap(p.scaled(self.series_cover_large.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)))
-                self.loader.start()
+        self.cover_loader.cancel(self.series_cover_large)
+        self.series_cover_large.clear()
+        url = result_cover_url(data, ("large", "common"))
+        if url:
+            self.cover_loader.load(url, self.series_cover_large.size(),
+                                   lambda image: self.series_cover_large.setPixmap(QPixmap.fromImage(image)),
+                                   owner=self.series_cover_large)
         else:
             self.series_cover_large.setText("No Cover")
         
@@ -793,7 +516,7 @@ class ScraperDialog(QDialog):
                 self._current_volume_thread.wait()
         
         self.stack.setCurrentWidget(self.page_volumes)
-        self.volume_list.clear()
+        self.volume_model.clear()
         self.vol_status.setText(translator.tr("Loading volumes..."))
         self.vol_status.show()
         self.vol_progress.show()
@@ -824,19 +547,10 @@ class ScraperDialog(QDialog):
             self.vol_status.show()
             return
             
-        for vol in volumes:
-            item = QListWidgetItem(self.volume_list)
-            item.setSizeHint(QSize(0, 110))  # 增加高度以容纳更多信息
-            item.setData(Qt.UserRole, vol)
-            widget = ResultItemWidget(vol)
-            self.volume_list.setItemWidget(item, widget)
-            # Track image loader if it exists
-            if widget.image_loader:
-                self._image_loaders.append(widget.image_loader)
+        self.volume_model.set_results(volumes)
 
     def on_volume_selection(self):
-        items = self.volume_list.selectedItems()
-        self.apply_vol_btn.setEnabled(len(items) > 0)
+        self.apply_vol_btn.setEnabled(self._selected_result(self.volume_list) is not None)
 
     def back_to_search(self):
         self.stack.setCurrentWidget(self.page_search)
@@ -871,18 +585,9 @@ class ScraperDialog(QDialog):
 
     def closeEvent(self, event):
         """Properly clean up all threads before closing"""
-        # Cancel all image loaders first
-        for loader in self._image_loaders[:]:
-            try:
-                if loader and loader.isRunning():
-                    if hasattr(loader, 'cancel'):
-                        loader.cancel()
-                    loader.wait(500)  # Wait briefly
-                    if loader.isRunning():
-                        loader.terminate()
-            except RuntimeError:
-                # C++ object already deleted
-                continue
+        # Drop pending cover downloads and typed searches first
+        self.cover_loader.cancel_all()
+        self._search_timer.stop()
         
         # Cancel and wait for all main threads to finish
         for t in self._threads[:]:
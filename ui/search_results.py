@@ -0,0 +1,473 @@
+"""
+Search result list for the scraper dialog: a list model with a painting
+delegate instead of one widget tree per result.
+"""
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PySide6.QtGui import QColor, QFont, QPainter, QPixmap
+from PySide6.QtWidgets import QListView, QStyle, QStyledItemDelegate
+
+# ==================== Helper Functions ====================
+
+def result_cover_url(data, sizes=("common", "medium", "grid")):
+    """First available cover URL of a search result, in order of `sizes`."""
+    images = data.get("images") or data.get("image")
+    if not images or not isinstance(images, dict):
+        return None
+    return next((images[size] for size in sizes if images.get(size)), None)
+
+def extract_infobox_value(infobox, key):
+    """
+    从 Bangumi infobox 中提取指定键的值
+    
+    Args:
+        infobox: infobox 数组
+        key: 要查找的键名
+        
+    Returns:
+        提取的值，如果未找到返回 None
+    """
+    if not infobox:
+        return None
+    
+    for item in infobox:
+        if item.get("key") == key:
+            val = item.get("value")
+            # 处理不同类型的值
+            if isinstance(val, list):
+                # 处理列表类型的值
+                result = []
+                for v in val:
+                    if isinstance(v, dict):
+                        result.append(v.get("v", ""))
+                    else:
+                        result.append(str(v))
+                return ", ".join(result) if result else None
+            elif isinstance(val, dict):
+                return val.get("v", str(val))
+            else:
+                return str(val) if val else None
+    return None
+
+def format_rating_info(data):
+    """
+    格式化评分信息显示
+    
+    Args:
+        data: 包含评分信息的数据字典
+        
+    Returns:
+        格式化的评分字符串
+    """
+    parts = []
+    
+    # 评分
+    if "rating" in data and isinstance(data["rating"], dict):
+        rating_data = data["rating"]
+        score = rating_data.get("score")
+        if score:
+            parts.append(f"⭐ {score}")
+            
+            # 评分人数
+            count = rating_data.get("total")
+            if count:
+                parts.append(f"({count} ratings)")
+            
+            # 排名
+            rank = rating_data.get("rank")
+            if rank:
+                parts.append(f"Rank #{rank}")
+    elif "score" in data:
+        # 兼容旧格式
+        parts.append(f"⭐ {data['score']}")
+    
+    return " ".join(parts) if parts else None
+
+def format_collection_info(data):
+    """
+    格式化收藏信息显示
+    
+    Args:
+        data: 包含收藏信息的数据字典
+        
+    Returns:
+        格式化的收藏字符串
+    """
+    if "collection" in data and isinstance(data["collection"], dict):
+        total = data["collection"].get("collect", 0)
+        if total > 0:
+            if total >= 10000:
+                return f"📚 {total/10000:.1f}万收藏"
+            else:
+                return f"📚 {total}收藏"
+    return None
+
+def extract_author_info(infobox):
+    """
+    从 infobox 提取作者信息
+    
+    Args:
+        infobox: infobox 数组
+        
+    Returns:
+        作者信息字符串
+    """
+    authors = []
+    
+    # 尝试多个可能的键名
+    for key in ["作者", "漫画", "著者", "原作", "作画"]:
+        value = extract_infobox_value(infobox, key)
+        if value and value not in authors:
+            authors.append(value)
+    
+    return " / ".join(authors[:2]) if authors else None  # 最多显示2个作者
+
+def extract_publisher_info(infobox):
+    """
+    从 infobox 提取出版社信息
+    
+    Args:
+        infobox: infobox 数组
+        
+    Returns:
+        出版社信息字符串
+    """
+    return extract_infobox_value(infobox, "出版社") or extract_infobox_value(infobox, "中文出版社")
+
+def extract_volume_count(infobox):
+    """
+    从 infobox 提取卷数信息
+    
+    Args:
+        infobox: infobox 数组
+        
+    Returns:
+        卷数字符串
+    """
+    count = extract_infobox_value(infobox, "话数") or extract_infobox_value(infobox, "卷数")
+    if count:
+        # 尝试提取数字
+        import re
+        match = re.search(r'\d+', str(count))
+        if match:
+            return f"{match.group()}卷"
+    return None
+
+def extract_status_info(data):
+    """
+    提取连载状态信息
+    
+    Args:
+        data: 元数据字典
+        
+    Returns:
+        状态字符串和颜色
+    """
+    # 从 tags 中查找状态
+    tags = data.get("tags", [])
+    if isinstance(tags, list):
+        for tag in tags:
+            if isinstance(tag, dict):
+                name = tag.get("name", "")
+                if "连载" in name:
+                    return ("连载中", "#10b981")
+                elif "完结" in name or "已完结" in name:
+                    return ("已完结", "#6b7280")
+    
+    # 从 infobox 查找
+    infobox = data.get("infobox", [])
+    status = extract_infobox_value(infobox, "连载状态") or extract_infobox_value(infobox, "状态")
+    if status:
+        if "连载" in status:
+            return (status, "#10b981")
+        elif "完结" in status:
+            return (status, "#6b7280")
+        return (status, "#71717a")
+    
+    return None
+
+
+# ==================== Model ====================
+
+PLATFORM_COLORS = {
+    "漫画": "#10b981",  # Green
+    "小说": "#f59e0b",  # Orange
+    "画集": "#8b5cf6",  # Purple
+}
+
+
+class _ResultRow:
+    """A search result with its display strings worked out once, not on every paint."""
+    __slots__ = ("data", "title", "orig_name", "badges", "credits", "details", "cover_url", "cover", "cover_requested")
+
+    def __init__(self, data):
+        self.data = data
+        self.title = data.get("name_cn") or data.get("name") or ""
+        orig_name = data.get("name")
+        self.orig_name = orig_name if orig_name and orig_name != self.title else ""
+
+        # Badges: (text, color)
+        type_label = data.get("type_label", "Unknown")
+        self.badges = [(type_label, "#3b82f6" if type_label == "Series" else "#71717a")]
+        platform = data.get("platform", "")
+        if platform:
+            self.badges.append((platform, PLATFORM_COLORS.get(platform, "#6b7280")))
+        status_info = extract_status_info(data)
+        if status_info:
+            self.badges.append(status_info)
+
+        infobox = data.get("infobox", [])
+        credit_parts = []
+        author = extract_author_info(infobox)
+        if author:
+            credit_parts.append(f"✍ {author}")
+        publisher = extract_publisher_info(infobox)
+        if publisher:
+            credit_parts.append(f"📖 {publisher}")
+        self.credits = " · ".join(credit_parts)
+
+        details_parts = []
+        rating_str = format_rating_info(data)
+        if rating_str:
+            details_parts.append(rating_str)
+        collection_str = format_collection_info(data)
+        if collection_str:
+            details_parts.append(collection_str)
+        if type_label == "Series":
+            volume_count = extract_volume_count(infobox)
+            if volume_count:
+                details_parts.append(f"📚 {volume_count}")
+        if data.get("date"):
+            details_parts.append(f"📅 {data['date']}")
+        if "id" in data:
+            details_parts.append(f"ID: {data['id']}")
+        self.details = " · ".join(details_parts)
+
+        self.cover_url = result_cover_url(data)
+        self.cover = None
+        self.cover_requested = False
+
+
+class SearchResultModel(QAbstractListModel):
+    """
+    Search results / volumes for the scraper dialog.
+
+    Qt.UserRole holds the result dict, COVER_ROLE the cover pixmap (None
+    until loaded). Covers are requested the first time a row is painted,
+    so only rows that scroll into view are ever downloaded.
+    """
+    COVER_ROLE = Qt.UserRole + 1
+    ROW_ROLE = Qt.UserRole + 2
+    COVER_SIZE = QSize(50, 75)
+
+    def __init__(self, cover_loader, parent=None):
+        super().__init__(parent)
+        self.cover_loader = cover_loader
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return row.title
+        if role == Qt.UserRole:
+            return row.data
+        if role == self.COVER_ROLE:
+            return row.cover
+        if role == self.ROW_ROLE:
+            return row
+        return None
+
+    # ==================== Contents ====================
+
+    def ids(self) -> list:
+        return [row.data.get("id") for row in self._rows]
+
+    def result(self, row: int):
+        return self._rows[row].data if 0 <= row < len(self._rows) else None
+
+    def row_of(self, subject_id) -> int:
+        return next((i for i, row in enumerate(self._rows) if row.data.get("id") == subject_id), -1)
+
+    def append_results(self, results):
+        """Add results at the end (e.g. partial search results as they arrive)."""
+        if not results:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(results) - 1)
+        self._rows.extend(_ResultRow(res) for res in results)
+        self.endInsertRows()
+
+    def update_results(self, results):
+        """Refresh rows already shown (matched by id) and append new ones, keeping the shown order."""
+        positions = {row.data.get("id"): i for i, row in enumerate(self._rows)}
+        new = []
+        for res in results:
+            i = positions.get(res.get("id"))
+            if i is None:
+                new.append(res)
+                continue
+            old = self._rows[i]
+            if old.data is res:
+                continue
+            row = _ResultRow(res)
+            row.cover = old.cover
+            # A pending load would land on the old row; the next paint asks again (same download)
+            row.cover_requested = old.cover is not None
+            self._rows[i] = row
+            index = self.index(i)
+            self.dataChanged.emit(index, index)
+        self.append_results(new)
+
+    def set_results(self, results):
+        """Replace the contents; rows already shown keep their loaded covers."""
+        previous = {row.data.get("id"): row for row in self._rows}
+        rows = []
+        for res in results:
+            old = previous.get(res.get("id"))
+            row = old if old is not None and old.data is res else _ResultRow(res)
+            if old is not None:
+                row.cover = old.cover
+            # Pending loads are cancelled below; the next paint asks again
+            row.cover_requested = row.cover is not None
+            rows.append(row)
+        self.cover_loader.cancel(self)
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def clear(self):
+        self.set_results([])
+
+    # ==================== Covers ====================
+
+    def request_cover(self, index):
+        """Start loading a row's cover (called when the row is painted)."""
+        row = self._rows[index.row()]
+        if row.cover_requested or not row.cover_url:
+            return
+        row.cover_requested = True
+        self.cover_loader.load(row.cover_url, self.COVER_SIZE,
+                               lambda image, row=row: self._set_cover(row, image), owner=self)
+
+    def _set_cover(self, row, image):
+        row.cover = QPixmap.fromImage(image)
+        try:
+            i = self._rows.index(row)
+        except ValueError:
+            return  # Removed meanwhile
+        index = self.index(i)
+        self.dataChanged.emit(index, index, [self.COVER_ROLE])
+
+
+# ==================== Delegate ====================
+
+class SearchResultDelegate(QStyledItemDelegate):
+    """Paints a result row: cover, title with badges, original title, credits and details."""
+    ROW_HEIGHT = 110
+    MARGIN = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.title_font = QFont()
+        self.title_font.setPixelSize(14)
+        self.title_font.setBold(True)
+        self.text_font = QFont()
+        self.text_font.setPixelSize(12)
+        self.small_font = QFont()
+        self.small_font.setPixelSize(11)
+        self.badge_font = QFont()
+        self.badge_font.setPixelSize(10)
+        self.badge_font.setBold(True)
+
+    def sizeHint(self, option, index):
+        return QSize(0, self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        row = index.data(SearchResultModel.ROW_ROLE)
+        if row is None:
+            return super().paint(painter, option, index)
+        index.model().request_cover(index)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = option.rect
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(rect, QColor("#27272a"))
+        elif option.state & QStyle.State_MouseOver:
+            painter.fillRect(rect, QColor("#1f1f23"))
+        painter.setPen(QColor("#27272a"))
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+
+        # Cover
+        cover_size = SearchResultModel.COVER_SIZE
+        cover_rect = QRect(rect.left() + self.MARGIN, rect.top() + self.MARGIN, cover_size.width(), cover_size.height())
+        painter.setPen(QColor("#444"))
+        painter.setBrush(QColor("#333"))
+        painter.drawRoundedRect(cover_rect, 4, 4)
+        if row.cover is not None:
+            # Drawn at its own (aspect-preserving) size, centred in the slot
+            target = QStyle.alignedRect(Qt.LeftToRight, Qt.AlignCenter,
+                                        row.cover.deviceIndependentSize().toSize(), cover_rect)
+            painter.drawPixmap(target, row.cover)
+
+        # Text column
+        x = cover_rect.right() + 11
+        width = rect.right() - self.MARGIN - x
+        y = rect.top() + self.MARGIN
+
+        # Title + badges
+        painter.setFont(self.badge_font)
+        badge_metrics = painter.fontMetrics()
+        badge_widths = [badge_metrics.horizontalAdvance(text) + 12 for text, _ in row.badges]
+        badges_width = sum(w + 6 for w in badge_widths)
+        painter.setFont(self.title_font)
+        metrics = painter.fontMetrics()
+        title = metrics.elidedText(row.title, Qt.ElideRight, max(0, width - badges_width))
+        line_height = max(metrics.height(), 18)
+        painter.setPen(QColor("#e4e4e7"))
+        painter.drawText(QRect(x, y, width, line_height), Qt.AlignLeft | Qt.AlignVCenter, title)
+
+        bx = x + metrics.horizontalAdvance(title) + 6
+        painter.setFont(self.badge_font)
+        for (text, color), badge_width in zip(row.badges, badge_widths):
+            badge_rect = QRect(bx, y + (line_height - 18) // 2, badge_width, 18)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(badge_rect, 3, 3)
+            painter.setPen(QColor("white"))
+            painter.drawText(badge_rect, Qt.AlignCenter, text)
+            bx += badge_width + 6
+        y += line_height + 4
+
+        # Original title, credits, details
+        for text, font, color in ((row.orig_name, self.text_font, "#a1a1aa"),
+                                  (row.credits, self.small_font, "#a1a1aa"),
+                                  (row.details, self.small_font, "#71717a")):
+            if not text:
+                continue
+            painter.setFont(font)
+            metrics = painter.fontMetrics()
+            painter.setPen(QColor(color))
+            painter.drawText(QRect(x, y, width, metrics.height()), Qt.AlignLeft | Qt.AlignVCenter,
+                             metrics.elidedText(text, Qt.ElideRight, width))
+            y += metrics.height() + 4
+
+        painter.restore()
+
+
+def create_result_view(model, parent=None) -> QListView:
+    """List view for a SearchResultModel with the result delegate."""
+    view = QListView(parent)
+    view.setModel(model)
+    view.setItemDelegate(SearchResultDelegate(view))
+    view.setUniformItemSizes(True)
+    view.setMouseTracking(True)
+    view.setSelectionMode(QListView.SingleSelection)
+    view.setVerticalScrollMode(QListView.ScrollPerPixel)
+    view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+    return view
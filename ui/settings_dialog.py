@@ -1,8 +1,13 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                               QLineEdit, QPushButton, QGroupBox, QMessageBox)
+                               QLineEdit, QPushButton, QGroupBox, QMessageBox,
+                               QCheckBox, QFileDialog, QProgressDialog)
 from PySide6.QtCore import Qt
 from core.settings_manager import settings_manager
 from core.translator import translator
+from core.http_cache import http_cache
+from core.local_index import local_index
+from ui.workers.index_import_worker import IndexImportWorker
+from config import Config
 
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
@@ -65,6 +70,67 @@ class SettingsDialog(QDialog):
         
         layout.addWidget(group)
         
+        # Offline Cache Group
+        cache_group = QGroupBox(translator.tr("Offline Cache"))
+        cache_layout = QVBoxLayout(cache_group)
+        
+        cache_help = QLabel(translator.tr("Bangumi responses and covers are kept on disk and revalidated when they expire, so re-scraping a library rarely needs the network."))
+        cache_help.setWordWrap(True)
+        cache_help.setStyleSheet("color: #a1a1aa; font-size: 12px;")
+        cache_layout.addWidget(cache_help)
+        
+        self.cache_cb = QCheckBox(translator.tr("Cache Bangumi responses on disk"))
+        self.cache_cb.setChecked(settings_manager.get("http_cache_enabled", Config.HTTP_CACHE_ENABLED))
+        cache_layout.addWidget(self.cache_cb)
+        
+        self.cache_stats_label = QLabel()
+        self.cache_stats_label.setStyleSheet("color: #71717a; font-size: 11px;")
+        cache_layout.addWidget(self.cache_stats_label)
+        self.update_cache_stats()
+        
+        btn_row_cache = QHBoxLayout()
+        export_cache_btn = QPushButton(translator.tr("Export..."))
+        export_cache_btn.clicked.connect(self.export_cache)
+        import_cache_btn = QPushButton(translator.tr("Import..."))
+        import_cache_btn.clicked.connect(self.import_cache)
+        clear_cache_btn = QPushButton(translator.tr("Clear"))
+        clear_cache_btn.clicked.connect(self.clear_cache)
+        btn_row_cache.addWidget(export_cache_btn)
+        btn_row_cache.addWidget(import_cache_btn)
+        btn_row_cache.addWidget(clear_cache_btn)
+        cache_layout.addLayout(btn_row_cache)
+        
+        layout.addWidget(cache_group)
+        
+        # Offline Index Group
+        index_group = QGroupBox(translator.tr("Offline Index"))
+        index_layout = QVBoxLayout(index_group)
+        
+        index_help = QLabel(translator.tr("Import a Bangumi Archive dump to search and scrape from disk without rate limits. Newer subjects and covers still come from the online API."))
+        index_help.setWordWrap(True)
+        index_help.setStyleSheet("color: #a1a1aa; font-size: 12px;")
+        index_layout.addWidget(index_help)
+        
+        self.index_cb = QCheckBox(translator.tr("Use the offline index when available"))
+        self.index_cb.setChecked(settings_manager.get("local_index_enabled", Config.LOCAL_INDEX_ENABLED))
+        index_layout.addWidget(self.index_cb)
+        
+        self.index_stats_label = QLabel()
+        self.index_stats_label.setStyleSheet("color: #71717a; font-size: 11px;")
+        index_layout.addWidget(self.index_stats_label)
+        self.update_index_stats()
+        
+        btn_row_index = QHBoxLayout()
+        import_dump_btn = QPushButton(translator.tr("Import Dump..."))
+        import_dump_btn.clicked.connect(self.import_dump)
+        clear_index_btn = QPushButton(translator.tr("Clear"))
+        clear_index_btn.clicked.connect(self.clear_index)
+        btn_row_index.addWidget(import_dump_btn)
+        btn_row_index.addWidget(clear_index_btn)
+        index_layout.addLayout(btn_row_index)
+        
+        layout.addWidget(index_group)
+        
         # Buttons
         btn_layout = QHBoxLayout()
         save_btn = QPushButton(translator.tr("Save"))
@@ -123,7 +189,99 @@ class SettingsDialog(QDialog):
             self.test_token_btn.setEnabled(True)
             self.test_token_btn.setText(translator.tr("Test Token"))
             
+    def update_cache_stats(self):
+        try:
+            stats = http_cache.stats()
+            self.cache_stats_label.setText(translator.tr("{} entries, {:.1f} MB").format(
+                stats["entries"], stats["bytes"] / 1024 / 1024))
+        except Exception as e:
+            self.cache_stats_label.setText(translator.tr("Cache unavailable: {}").format(str(e)))
+
+    def export_cache(self):
+        path, _ = QFileDialog.getSaveFileName(self, translator.tr("Export Cache"),
+                                              "bangumi_cache.sqlite", "SQLite (*.sqlite)")
+        if not path:
+            return
+        try:
+            count = http_cache.export_bundle(path)
+            QMessageBox.information(self, translator.tr("Success"),
+                                    translator.tr("Exported {} cache entries.").format(count))
+        except Exception as e:
+            QMessageBox.critical(self, translator.tr("Error"), translator.tr("Export failed: {}").format(str(e)))
+
+    def import_cache(self):
+        path, _ = QFileDialog.getOpenFileName(self, translator.tr("Import Cache"), "", "SQLite (*.sqlite)")
+        if not path:
+            return
+        try:
+            count = http_cache.import_bundle(path)
+            QMessageBox.information(self, translator.tr("Success"),
+                                    translator.tr("Imported {} cache entries.").format(count))
+        except Exception as e:
+            QMessageBox.critical(self, translator.tr("Error"), translator.tr("Import failed: {}").format(str(e)))
+        self.update_cache_stats()
+
+    def clear_cache(self):
+        reply = QMessageBox.question(self, translator.tr("Clear"),
+                                     translator.tr("Delete all cached Bangumi responses and covers?"))
+        if reply != QMessageBox.Yes:
+            return
+        http_cache.clear()
+        self.update_cache_stats()
+
+    def update_index_stats(self):
+        try:
+            if local_index.has_data():
+                stats = local_index.stats()
+                self.index_stats_label.setText(translator.tr("{} subjects, {} relations").format(
+                    stats["subjects"], stats["relations"]))
+            else:
+                self.index_stats_label.setText(translator.tr("No dump imported"))
+        except Exception as e:
+            self.index_stats_label.setText(translator.tr("Index unavailable: {}").format(str(e)))
+
+    def import_dump(self):
+        path, _ = QFileDialog.getOpenFileName(self, translator.tr("Import Dump"), "",
+                                              "Bangumi Archive (*.zip *.jsonlines)")
+        if not path:
+            return
+
+        self.index_worker = IndexImportWorker(path)
+        self.index_progress = QProgressDialog(translator.tr("Importing dump..."), translator.tr("Cancel"), 0, 0, self)
+        self.index_progress.setWindowModality(Qt.WindowModal)
+        self.index_progress.setMinimumDuration(0)
+        self.index_progress.canceled.connect(self.index_worker.cancel)
+
+        self.index_worker.progress_updated.connect(
+            lambda subjects, relations: self.index_progress.setLabelText(
+                translator.tr("Importing dump...") + "\n" +
+                translator.tr("{} subjects, {} relations").format(subjects, relations)))
+        self.index_worker.finished.connect(self.on_dump_imported)
+        self.index_worker.error_occurred.connect(self.on_dump_import_error)
+        self.index_worker.finished.connect(self.index_progress.close)
+        self.index_worker.error_occurred.connect(self.index_progress.close)
+        self.index_worker.start()
+
+    def on_dump_imported(self, subjects, relations):
+        QMessageBox.information(self, translator.tr("Success"),
+                                translator.tr("Imported {} subjects and {} relations.").format(subjects, relations))
+        self.update_index_stats()
+
+    def on_dump_import_error(self, error_msg):
+        QMessageBox.critical(self, translator.tr("Error"), translator.tr("Import failed: {}").format(error_msg))
+        self.update_index_stats()
+
+    def clear_index(self):
+        reply = QMessageBox.question(self, translator.tr("Clear"),
+                                     translator.tr("Delete the imported offline index?"))
+        if reply != QMessageBox.Yes:
+            return
+        local_index.clear()
+        self.update_index_stats()
+
     def save_settings(self):
         token = self.token_input.text().strip()
         settings_manager.set("bangumi_token", token)
+        settings_manager.set("http_cache_enabled", self.cache_cb.isChecked())
+        settings_manager.set("local_index_enabled", self.index_cb.isChecked())
         self.accept()
@@ -0,0 +1,42 @@
+from PySide6.QtCore import QThread, Signal
+from core.auto_scraper import LibraryAutoScraper
+from core.local_index import create_scraper
+from core.rate_scheduler import RequestPriority
+
+class AutoScrapeWorker(QThread):
+    """
+    Worker thread for whole-library auto-scrape.
+    Emits each series group as it finishes so the table can update live.
+    """
+    group_finished = Signal(object)      # ScrapeGroup
+    progress_updated = Signal(int, int)  # groups done, total groups
+    finished = Signal(list)              # list[ScrapeGroup]
+    error_occurred = Signal(str)         # error message
+
+    def __init__(self, files, rows, options=None, access_token=None):
+        super().__init__()
+        self.scraper = create_scraper(access_token=access_token, priority=RequestPriority.BATCH)
+        self.engine = LibraryAutoScraper(files, rows, self.scraper, options,
+                                         on_group_done=self._on_group_done)
+        self._done = 0
+        self._is_cancelled = False
+
+    @property
+    def group_count(self):
+        return len(self.engine.groups)
+
+    def _on_group_done(self, group):
+        self._done += 1
+        self.group_finished.emit(group)
+        self.progress_updated.emit(self._done, self.group_count)
+
+    def run(self):
+        try:
+            groups = self.engine.run(lambda: self._is_cancelled)
+            if not self._is_cancelled:
+                self.finished.emit(groups)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
+    def cancel(self):
+        self._is_cancelled = True
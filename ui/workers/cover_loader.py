@@ -0,0 +1,73 @@
+from PySide6.QtCore import QObject, Qt, QSize, Signal
+from PySide6.QtGui import QImage
+
+from core.image_fetcher import image_fetcher, normalize_image_url
+
+
+class CoverLoader(QObject):
+    """
+    Qt front end for the shared image fetcher.
+
+    Covers are downloaded on the fetcher's pool, decoded and scaled there,
+    and handed to callbacks on the GUI thread. Each load is registered under
+    an owner (a list, a label...) so everything an owner asked for can be
+    dropped at once when it is cleared or closed; downloads nobody waits
+    for any more are cancelled.
+    """
+    _decoded = Signal(str, QImage)  # "<width>x<height> <url>", image
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._waiters = {}   # key -> [(owner, callback)]
+        self._requests = {}  # key -> ImageRequest
+        self._decoded.connect(self._deliver, Qt.QueuedConnection)
+
+    def load(self, url, size: QSize, callback, owner=None):
+        """Call `callback(QImage)` on the GUI thread once the cover is ready (not called on failure)."""
+        url = normalize_image_url(url)
+        if not url:
+            return
+        key = f"{size.width()}x{size.height()} {url}"
+        waiters = self._waiters.setdefault(key, [])
+        waiters.append((owner, callback))
+        if key in self._requests:
+            return
+        self._requests[key] = image_fetcher.fetch(url, lambda data: self._decode(key, data))
+
+    def _decode(self, key, data):
+        """Runs on a fetch worker (or inline on a memory cache hit)."""
+        image = QImage.fromData(data) if data else QImage()
+        width, height = (int(n) for n in key.split(" ", 1)[0].split("x"))
+        if not image.isNull() and width > 0 and height > 0:
+            image = image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self._decoded.emit(key, image)
+
+    def _deliver(self, key, image):
+        self._requests.pop(key, None)
+        waiters = self._waiters.pop(key, [])
+        if image.isNull():
+            return
+        for _owner, callback in waiters:
+            try:
+                callback(image)
+            except RuntimeError:
+                # Target widget already deleted
+                continue
+
+    def cancel(self, owner):
+        """Forget everything `owner` asked for; cancel downloads no one else waits for."""
+        for key in list(self._waiters):
+            remaining = [w for w in self._waiters[key] if w[0] is not owner]
+            if remaining:
+                self._waiters[key] = remaining
+                continue
+            del self._waiters[key]
+            request = self._requests.pop(key, None)
+            if request is not None:
+                request.cancel()
+
+    def cancel_all(self):
+        for request in self._requests.values():
+            request.cancel()
+        self._requests.clear()
+        self._waiters.clear()
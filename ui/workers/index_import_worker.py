@@ -0,0 +1,32 @@
+from PySide6.QtCore import QThread, Signal
+from core.local_index import local_index
+
+class IndexImportWorker(QThread):
+    """
+    Worker thread for importing a Bangumi Archive dump into the local index.
+    A full dump takes a while to parse and index.
+    """
+    progress_updated = Signal(int, int)  # subjects, relations imported so far
+    finished = Signal(int, int)          # subject_count, relation_count
+    error_occurred = Signal(str)         # error message
+
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+        self._is_cancelled = False
+
+    def run(self):
+        def progress_callback(subjects, relations):
+            self.progress_updated.emit(subjects, relations)
+            return self._is_cancelled
+
+        try:
+            subjects, relations = local_index.import_dump(self.source, progress_callback)
+            self.finished.emit(subjects, relations)
+        except InterruptedError:
+            pass
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
+    def cancel(self):
+        self._is_cancelled = True
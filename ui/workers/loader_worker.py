@@ -2,6 +2,7 @@ from PySide6.QtCore import QThread, Signal
 from pathlib import Path
 from core.file_loader import FileLoader
 from utils.logger import logger
+from utils.text_normalizer import text_normalizer
 
 class FileLoaderWorker(QThread):
     """
@@ -33,6 +34,9 @@ class FileLoaderWorker(QThread):
         total = len(paths)
         loaded_files = []
 
+        # Parse every filename's number in one batch; each load then hits the cache
+        text_normalizer.numbers([p.stem for p in paths])
+
         # 2. Load each file
         for i, path in enumerate(paths):
             if self.is_cancelled:
@@ -1,6 +1,12 @@
 from PySide6.QtCore import QObject, Signal, QRunnable, Slot, QThreadPool
+import json
+import os
 import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
 from config import Config
+from core.io_qos import io_throttle
 from utils.logger import logger
 
 class SaveWorkerSignals(QObject):
@@ -8,6 +14,7 @@ class SaveWorkerSignals(QObject):
     finished = Signal(object) # ComicFile (success)
     error = Signal(object, str) # ComicFile, error message
     file_progress = Signal(object, int) # ComicFile, percent (0-100)
+    file_timing = Signal(object, str, float) # ComicFile, plan ('append'/'repack'/'error'), seconds
 
 class SaveRunnable(QRunnable):
     """Runnable for saving a single file."""
@@ -18,22 +25,33 @@ class SaveRunnable(QRunnable):
 
     @Slot()
     def run(self):
+        io_throttle.apply_thread_priority()
+        start = time.perf_counter()
         try:
             def progress_callback(percent):
                 self.signals.file_progress.emit(self.comic_file, percent)
-                
-            self.comic_file.save(progress_callback=progress_callback)
+
+            plan = self.comic_file.save(progress_callback=progress_callback)
+            self.signals.file_timing.emit(self.comic_file, plan or "skipped", time.perf_counter() - start)
             self.signals.finished.emit(self.comic_file)
         except Exception as e:
+            self.signals.file_timing.emit(self.comic_file, "error", time.perf_counter() - start)
             self.signals.error.emit(self.comic_file, str(e))
 
 class BatchSaveManager(QObject):
-    """Manages the batch saving process using QThreadPool."""
+    """
+    Manages the batch saving process using QThreadPool.
+
+    Progress is weighted by file size: each file contributes its on-disk
+    byte count, and a per-file progress update only adjusts the running
+    total by the delta, so aggregating is O(1) per event.
+    """
     progress_updated = Signal(int, int) # current, total
+    throughput_updated = Signal(float, float) # bytes per second, ETA seconds (-1 if unknown)
     file_completed = Signal(object) # ComicFile
     file_failed = Signal(object, str) # ComicFile, error
     all_finished = Signal()
-    
+
     def __init__(self, files_to_save):
         super().__init__()
         self.files = files_to_save
@@ -42,24 +60,52 @@ class BatchSaveManager(QObject):
         self.failed_count = 0
         self.is_cancelled = False
         self.thread_pool = QThreadPool()
-        
-        # Track progress of each file (0-100)
-        self.file_progress_map = {f: 0 for f in files_to_save}
-        
+
+        # Byte size of each file (stat once up front)
+        self.file_sizes = {f: self._get_file_size(f) for f in files_to_save}
+        self.total_bytes = sum(self.file_sizes.values())
+
+        # Bytes processed so far for each file, plus the running aggregate
+        self.file_bytes_done = {f: 0 for f in files_to_save}
+        self.done_bytes = 0
+
+        # Moving-average throughput: (timestamp, done_bytes) samples
+        self._samples = deque()
+        self._throughput_window = Config.SAVE_THROUGHPUT_WINDOW
+        self.bytes_per_second = 0.0
+
+        # Per-file timing report entries
+        self.timing_report = []
+        self._start_time = None
+
         # Progress throttling to prevent UI freezing
         self._last_progress_time = 0
         self._progress_throttle = Config.PROGRESS_UPDATE_THROTTLE
 
+    @staticmethod
+    def _get_file_size(comic_file):
+        try:
+            return comic_file.file_path.stat().st_size
+        except OSError:
+            return 0
+
     def start(self):
         if not self.files:
             self.all_finished.emit()
             return
 
+        # Shared read/write budget for every worker in this batch
+        io_throttle.configure_from_settings()
+
+        self._start_time = time.perf_counter()
+        self._samples.append((self._start_time, 0))
+
         for cf in self.files:
             worker = SaveRunnable(cf)
             worker.signals.finished.connect(self.on_worker_finished)
             worker.signals.error.connect(self.on_worker_error)
             worker.signals.file_progress.connect(self.on_worker_file_progress)
+            worker.signals.file_timing.connect(self.on_worker_file_timing)
             self.thread_pool.start(worker)
 
     def cancel(self):
@@ -67,15 +113,31 @@ class BatchSaveManager(QObject):
         self.thread_pool.clear() # Remove queued tasks
         # Cannot stop running tasks easily in QThreadPool
 
+    def _set_file_bytes(self, comic_file, done):
+        """Update one file's processed bytes and adjust the aggregate by the delta."""
+        previous = self.file_bytes_done.get(comic_file, 0)
+        if done != previous:
+            self.file_bytes_done[comic_file] = done
+            self.done_bytes += done - previous
+
     def on_worker_file_progress(self, comic_file, percent):
         if self.is_cancelled: return
-        self.file_progress_map[comic_file] = percent
+        size = self.file_sizes.get(comic_file, 0)
+        self._set_file_bytes(comic_file, size * percent // 100)
         self._emit_aggregate_progress()
 
+    def on_worker_file_timing(self, comic_file, plan, seconds):
+        self.timing_report.append({
+            "file": str(comic_file.file_path),
+            "plan": plan,
+            "bytes": self.file_sizes.get(comic_file, 0),
+            "seconds": round(seconds, 4),
+        })
+
     def on_worker_finished(self, comic_file):
         if self.is_cancelled: return
         self.completed_count += 1
-        self.file_progress_map[comic_file] = 100
+        self._set_file_bytes(comic_file, self.file_sizes.get(comic_file, 0))
         self.file_completed.emit(comic_file)
         self._emit_aggregate_progress(force=True)
         self._check_finished()
@@ -84,30 +146,88 @@ class BatchSaveManager(QObject):
         if self.is_cancelled: return
         logger.error(f"Error saving {comic_file.file_path}: {error_msg}")
         self.failed_count += 1
-        self.file_progress_map[comic_file] = 100 # Treat failed as done for progress
+        # Treat failed as done for progress
+        self._set_file_bytes(comic_file, self.file_sizes.get(comic_file, 0))
         self.file_failed.emit(comic_file, error_msg)
         self._emit_aggregate_progress(force=True)
         self._check_finished()
 
     def _check_finished(self):
         if self.completed_count + self.failed_count >= self.total:
+            self._finish_report()
             self.all_finished.emit()
 
+    def _update_throughput(self, now):
+        """Moving average over the last SAVE_THROUGHPUT_WINDOW seconds."""
+        self._samples.append((now, self.done_bytes))
+        while len(self._samples) > 2 and now - self._samples[0][0] > self._throughput_window:
+            self._samples.popleft()
+
+        oldest_time, oldest_bytes = self._samples[0]
+        elapsed = now - oldest_time
+        if elapsed > 0:
+            self.bytes_per_second = (self.done_bytes - oldest_bytes) / elapsed
+
+    def get_eta_seconds(self):
+        """Estimated seconds remaining, or -1 if throughput is not known yet."""
+        if self.bytes_per_second <= 0:
+            return -1.0
+        return max(0, self.total_bytes - self.done_bytes) / self.bytes_per_second
+
     def _emit_aggregate_progress(self, force=False):
-        """Calculate total progress across all files and emit."""
+        """Emit total byte-weighted progress across all files."""
         current_time = time.time()
         if not force and (current_time - self._last_progress_time < self._progress_throttle):
             return
-            
+
         self._last_progress_time = current_time
-        
-        # Calculate total progress (0 to 100 * total)
-        total_progress_points = sum(self.file_progress_map.values())
+        self._update_throughput(time.perf_counter())
+
         # Scale to 0-10000 for progress bar (allows for float precision)
-        max_points = self.total * 100
-        if max_points == 0:
-            scaled_progress = 0
+        if self.total_bytes > 0:
+            scaled_progress = int((self.done_bytes / self.total_bytes) * 10000)
+        elif self.total > 0:
+            scaled_progress = int(((self.completed_count + self.failed_count) / self.total) * 10000)
         else:
-            scaled_progress = int((total_progress_points / max_points) * 10000)
-            
+            scaled_progress = 0
+
         self.progress_updated.emit(scaled_progress, 10000)
+        self.throughput_updated.emit(self.bytes_per_second, self.get_eta_seconds())
+
+    def _finish_report(self):
+        """Log the slowest files and export the per-file timing report."""
+        if not self.timing_report:
+            return
+
+        elapsed = time.perf_counter() - self._start_time if self._start_time else 0
+        self.timing_report.sort(key=lambda r: r["seconds"], reverse=True)
+
+        logger.info(f"Batch save took {elapsed:.2f}s for {self.total_bytes / 1024 / 1024:.1f} MB")
+        for entry in self.timing_report[:5]:
+            logger.info(f"  {entry['seconds']:.2f}s [{entry['plan']}] {entry['bytes'] / 1024 / 1024:.1f} MB - {Path(entry['file']).name}")
+
+        if Config.SAVE_REPORT_ENABLED:
+            report_path = Path(Config.LOG_DIR) / f"save_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            self.export_timing_report(report_path, elapsed)
+
+    def export_timing_report(self, path, elapsed=None):
+        """
+        Write the per-file timing report as JSON.
+
+        Args:
+            path: Destination file path
+            elapsed: Total wall-clock seconds for the batch (optional)
+        """
+        report = {
+            "total_files": self.total,
+            "total_bytes": self.total_bytes,
+            "elapsed_seconds": round(elapsed, 4) if elapsed is not None else None,
+            "files": self.timing_report,
+        }
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            logger.info(f"Save timing report written to {path}")
+        except Exception as e:
+            logger.error(f"Failed to write save timing report: {e}")
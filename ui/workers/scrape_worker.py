@@ -1,6 +1,7 @@
 from PySide6.QtCore import QThread, Signal
 from core.command_manager import CommandManager
-from core.scraper import BangumiScraper
+from core.local_index import create_scraper
+from core.rate_scheduler import RequestPriority
 
 class BatchScrapeWorker(QThread):
     """
@@ -18,7 +19,8 @@ class BatchScrapeWorker(QThread):
         self.bangumi_data = bangumi_data
         self.mode = mode
         self.options = options
-        self.scraper = BangumiScraper(access_token=access_token)
+        # Batch traffic yields to interactive searches in other windows
+        self.scraper = create_scraper(access_token=access_token, priority=RequestPriority.BATCH)
         self._is_cancelled = False
 
 
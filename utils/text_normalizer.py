@@ -0,0 +1,139 @@
+"""
+Shared, memoized text normalization.
+
+Queries, titles and filenames are normalized over and over during load,
+auto-number, search and scoring. TextNormalizer keeps one bounded LRU
+cache per transformation so each distinct string is processed once, and
+loads the zhconv dictionaries (a few hundred milliseconds on first use)
+on a background thread at startup instead of during the first search.
+"""
+
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from zhconv import convert
+
+from config import Config
+from utils.logger import logger
+from utils.text_utils import NumberMatch, extract_number
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class TextNormalizer:
+    """
+    Memoized normalization steps. All methods are thread-safe.
+
+    - to_simplified / to_traditional: zh-Hans / zh-Hant conversion
+    - fold_width: NFKC (full-width letters, digits and punctuation to ASCII)
+    - strip_punctuation: punctuation and symbols to spaces, collapsed
+    - for_search: width-folded simplified Chinese, as sent to the API
+    - for_compare: for_search, case-folded (fuzzy matching)
+    - for_key: for_compare without punctuation (grouping and dedup keys)
+    - number_match / number: volume/chapter number of a title or filename
+    """
+
+    def __init__(self, cache_size: int = None):
+        size = cache_size or Config.TEXT_NORMALIZE_CACHE_SIZE
+        self._loaded_locales = set()
+        self._load_lock = threading.Lock()
+        self._warm_thread = None
+
+        self.to_simplified = lru_cache(maxsize=size)(self._to_simplified)
+        self.to_traditional = lru_cache(maxsize=size)(self._to_traditional)
+        self.fold_width = lru_cache(maxsize=size)(self._fold_width)
+        self.strip_punctuation = lru_cache(maxsize=size)(self._strip_punctuation)
+        self.for_search = lru_cache(maxsize=size)(self._for_search)
+        self.for_compare = lru_cache(maxsize=size)(self._for_compare)
+        self.for_key = lru_cache(maxsize=size)(self._for_key)
+        self.number_match = lru_cache(maxsize=size)(self._number_match)
+        self._caches = [self.to_simplified, self.to_traditional, self.fold_width, self.strip_punctuation,
+                        self.for_search, self.for_compare, self.for_key, self.number_match]
+
+    # ==================== Dictionary Loading ====================
+
+    def _ensure_loaded(self, locale: str):
+        """Load zhconv's tables for `locale` once; zhconv builds them unsynchronized."""
+        if locale in self._loaded_locales:
+            return
+        with self._load_lock:
+            if locale not in self._loaded_locales:
+                convert("漢", locale)
+                self._loaded_locales.add(locale)
+
+    def warm_up(self):
+        """Load the zh-cn tables on a background thread (returns immediately)."""
+        if self._warm_thread is not None:
+            return
+
+        def load():
+            try:
+                self._ensure_loaded("zh-cn")
+                logger.info("Text normalization dictionaries loaded")
+            except Exception as e:
+                logger.warning(f"Failed to preload zhconv dictionaries: {e}")
+
+        self._warm_thread = threading.Thread(target=load, name="zhconv-warmup", daemon=True)
+        self._warm_thread.start()
+
+    # ==================== Steps ====================
+
+    def _to_simplified(self, text: str) -> str:
+        if not text:
+            return ""
+        self._ensure_loaded("zh-cn")
+        return convert(text, "zh-cn")
+
+    def _to_traditional(self, text: str) -> str:
+        if not text:
+            return ""
+        self._ensure_loaded("zh-tw")
+        return convert(text, "zh-tw")
+
+    def _fold_width(self, text: str) -> str:
+        return unicodedata.normalize("NFKC", text) if text else ""
+
+    def _strip_punctuation(self, text: str) -> str:
+        if not text:
+            return ""
+        chars = (" " if unicodedata.category(c)[0] in "PS" else c for c in text)
+        return _WHITESPACE_RE.sub(" ", "".join(chars)).strip()
+
+    def _for_search(self, text: str) -> str:
+        return self.to_simplified(self.fold_width(text)).strip()
+
+    def _for_compare(self, text: str) -> str:
+        return self.for_search(text).casefold()
+
+    def _for_key(self, text: str) -> str:
+        return self.strip_punctuation(self.for_compare(text))
+
+    def _number_match(self, text: str) -> NumberMatch:
+        return extract_number(text or "")
+
+    def number(self, text: str) -> Tuple[Optional[float], str]:
+        """(number, type) like text_utils.get_number, memoized."""
+        match = self.number_match(text)
+        return match.number, match.type
+
+    def numbers(self, texts) -> List[NumberMatch]:
+        """number_match() for a batch (e.g. a folder's stems); also primes the cache for later lookups."""
+        matches = {text: self.number_match(text) for text in dict.fromkeys(texts)}
+        return [matches[text] for text in texts]
+
+    # ==================== Maintenance ====================
+
+    def cache_info(self) -> dict:
+        """Hits/misses per step, for profiling."""
+        return {fn.__wrapped__.__name__.lstrip("_"): fn.cache_info() for fn in self._caches}
+
+    def clear(self):
+        for fn in self._caches:
+            fn.cache_clear()
+
+
+# Global instance
+text_normalizer = TextNormalizer()
@@ -1,5 +1,6 @@
 import re
-from typing import Tuple, Optional
+import unicodedata
+from typing import NamedTuple, Tuple, Optional
 
 class NumberType:
     """Constants for different types of numbers found in comic filenames."""
@@ -8,15 +9,161 @@ class NumberType:
     NORMAL = "normal"
     NONE = "none"
 
+class NumberMatch(NamedTuple):
+    """A number found in a title or filename."""
+    number: Optional[float]
+    type: str
+    confidence: float  # 0-1: explicit markers score high, bare or bracketed numbers lower
+
+
+_NUM = r"(\d+(?:\.\d+)?|[〇零一二两兩三四五六七八九十百千]+)"
+_ROMAN = r"(M{0,3}(?:CM|CD|D?C{0,3})(?:XC|XL|L?X{0,3})(?:IX|IV|V?I{0,3}))"
+
+# (pattern, type, confidence), tried in order
+_MARKER_PATTERNS = [
+    (re.compile(r"第\s*" + _NUM + r"\s*[巻卷册冊集部]"), NumberType.VOLUME, 0.95),
+    (re.compile(r"[巻卷]\s*" + _NUM), NumberType.VOLUME, 0.95),
+    (re.compile(r"\bvol(?:ume)?\.?\s*(\d+(?:\.\d+)?)", re.IGNORECASE), NumberType.VOLUME, 0.95),
+    (re.compile(r"\bvol(?:ume)?\.?\s*" + _ROMAN + r"\b", re.IGNORECASE), NumberType.VOLUME, 0.9),
+    (re.compile(r"(?<![a-z])v(\d+(?:\.\d+)?)\b", re.IGNORECASE), NumberType.VOLUME, 0.9),
+    (re.compile(r"第\s*" + _NUM + r"\s*[话話回章]"), NumberType.CHAPTER, 0.9),
+    (re.compile(r"\bch(?:ap(?:ter)?)?\.?\s*(\d+(?:\.\d+)?)", re.IGNORECASE), NumberType.CHAPTER, 0.9),
+    (re.compile(r"#(\d+(?:\.\d+)?)"), NumberType.CHAPTER, 0.85),
+]
+_BRACKETED_RE = re.compile(r"[\[【(（{][^\]】)）}]*[\]】)）}]")
+_BRACKETED_NUMBER_RE = re.compile(r"[\[【(（]\s*(\d{1,3}(?:\.\d+)?)\s*[\]】)）]")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_TRAILING_RE = re.compile(r"(\d+(?:\.\d+)?)[\s\W_]*$")
+# "Title 1_5" / "Title 1-5": decimal written with a separator (as get_number always read it)
+_TRAILING_PAIR_RE = re.compile(r"(?<![\d.])(\d+)[-_](\d+)[\s\W_]*$")
+# Bare trailing numerals only up to XXIX: uppercase tags like "DX", "DC" or "CD" also parse as roman
+_TRAILING_ROMAN_RE = re.compile(r"\s(X{0,2}(?:IX|IV|V?I{0,3}))[\s\W_]*$")
+_YEAR_RE = re.compile(r"(?:19|20)\d\d")
+
+_CJK_DIGITS = {"〇": 0, "零": 0, "一": 1, "二": 2, "两": 2, "兩": 2, "三": 3,
+               "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+_CJK_UNITS = {"十": 10, "百": 100, "千": 1000}
+_ROMAN_VALUES = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100, "D": 500, "M": 1000}
+
+
+def _cjk_to_int(s: str) -> Optional[int]:
+    """十二 -> 12, 二十 -> 20, 一〇二 -> 102."""
+    if not any(ch in _CJK_UNITS for ch in s):
+        # Positional digits
+        return int("".join(str(_CJK_DIGITS[ch]) for ch in s)) if s else None
+    total, current = 0, 0
+    for ch in s:
+        if ch in _CJK_DIGITS:
+            current = _CJK_DIGITS[ch]
+        else:
+            total += (current or 1) * _CJK_UNITS[ch]
+            current = 0
+    return total + current
+
+
+def _roman_to_int(s: str) -> Optional[int]:
+    s = s.upper()
+    total = 0
+    for i, ch in enumerate(s):
+        value = _ROMAN_VALUES[ch]
+        if i + 1 < len(s) and _ROMAN_VALUES[s[i + 1]] > value:
+            total -= value
+        else:
+            total += value
+    return total or None
+
+
+def _to_number(token: str) -> Optional[float]:
+    if not token:
+        return None
+    if token[0].isdigit():
+        return float(token)
+    if token[0] in _CJK_DIGITS or token[0] in _CJK_UNITS:
+        value = _cjk_to_int(token)
+    else:
+        value = _roman_to_int(token)
+    return float(value) if value is not None else None
+
+
+def extract_number(s: str) -> NumberMatch:
+    """
+    Extract the volume/chapter number from a string (e.g., filename).
+
+    Tried in order:
+    - Volume markers: "Vol.03", "vol3.5", "Volume III", "v01", "第12巻", "卷十二"
+    - Chapter markers: "Chapter 12.5", "ch.5", "#7", "第5话"
+    - The last number outside brackets: "Series Name 007", "(2023) 07";
+      a trailing "1_5" or "1-5" pair reads as 1.5
+    - A small number in brackets: "ONE PIECE (1)"
+    - A trailing roman numeral up to XXIX: "Series II"
+    - Any other number (years, tags in brackets), with low confidence
+
+    Examples:
+        >>> extract_number("第12巻")
+        NumberMatch(number=12.0, type='volume', confidence=0.95)
+    """
+    if not s:
+        return NumberMatch(None, NumberType.NONE, 0.0)
+    s = unicodedata.normalize("NFKC", s)
+
+    # 1. Explicit markers
+    for pattern, number_type, confidence in _MARKER_PATTERNS:
+        match = pattern.search(s)
+        if match and match.group(1):
+            number = _to_number(match.group(1))
+            if number is not None:
+                return NumberMatch(number, number_type, confidence)
+
+    # 2. Plain numbers outside brackets; usually the last one is the volume
+    #    ("Series Name 12"), and release years are skipped when possible
+    outside = _BRACKETED_RE.sub(" ", s)
+    numbers = _NUMBER_RE.findall(outside)
+    if numbers:
+        pair = _TRAILING_PAIR_RE.search(outside)
+        if pair and not _YEAR_RE.fullmatch(pair.group(1)):
+            return NumberMatch(float(f"{pair.group(1)}.{pair.group(2)}"), NumberType.NORMAL, 0.8)
+        candidates = [n for n in numbers if not _YEAR_RE.fullmatch(n)] or numbers
+        last = candidates[-1]
+        trailing = _TRAILING_RE.search(outside)
+        confidence = 0.8 if trailing and trailing.group(1) == last else 0.7
+        if _YEAR_RE.fullmatch(last):
+            confidence = 0.4
+        return NumberMatch(float(last), NumberType.NORMAL, confidence)
+
+    # 3. "Title (3)"
+    match = _BRACKETED_NUMBER_RE.search(s)
+    if match:
+        return NumberMatch(float(match.group(1)), NumberType.NORMAL, 0.75)
+
+    # 4. "Title II"
+    match = _TRAILING_ROMAN_RE.search(outside)
+    if match and match.group(1) and len(match.group(1)) > 1:
+        return NumberMatch(float(_roman_to_int(match.group(1))), NumberType.NORMAL, 0.5)
+
+    # 5. Anything left (bracketed years, resolutions, group tags)
+    numbers = _NUMBER_RE.findall(s)
+    if numbers:
+        return NumberMatch(float(numbers[-1]), NumberType.NORMAL, 0.2)
+
+    return NumberMatch(None, NumberType.NONE, 0.0)
+
+
+def extract_numbers(strings) -> list[NumberMatch]:
+    """extract_number() for many strings at once (e.g. a folder's stems); duplicates are parsed once."""
+    seen = {}
+    results = []
+    for s in strings:
+        match = seen.get(s)
+        if match is None:
+            match = seen[s] = extract_number(s)
+        results.append(match)
+    return results
+
+
 def get_number(s: str) -> Tuple[Optional[float], str]:
     """
     Extract the volume/chapter number from a string (e.g., filename).
     
-    Supports various formats:
-    - Prefix match: "vol.1", "vol1", "chap.5", "chapter05"
-    - Normal number: "Series Name 12" -> 12
-    - Decimal numbers: "3.5" or "vol.3.5"
-    
     Args:
         s: String to extract number from (typically a filename)
         
@@ -33,29 +180,24 @@ def get_number(s: str) -> Tuple[Optional[float], str]:
         >>> get_number("Series Name 007")
         (7.0, 'normal')
     """
-    s = s.replace("-", ".").replace("_", ".")
-    
-    # 1. Prefix match (vol.1, chap.1)
-    pattern = r"vol\.?(\d+(\.\d+)?)|chap\.?(\d+(\.\d+)?)"
-    match = re.search(pattern, s, re.IGNORECASE)
-    if match:
-        if match.group(1):
-            return float(match.group(1)), NumberType.VOLUME
-        elif match.group(3):
-            return float(match.group(3)), NumberType.CHAPTER
-
-    # 2. Roman Numerals support (Future enhancement)
-    # Currently not implemented. Can be added if needed:
-    # - Pattern: r"(?<![A-Z])[IVXLCDM]+(?![A-Z])"
-    # - Would require roman_to_int() conversion function
-
-    # 3. Normal number at the end or standalone
-    # Find all numbers
-    decimal_pattern = r"\d+\.\d+|\d+"
-    matches = re.findall(decimal_pattern, s)
-    
-    if matches:
-        # Usually the last number is the volume number in titles like "Series Name 12"
-        return float(matches[-1]), NumberType.NORMAL
+    match = extract_number(s)
+    return match.number, match.type
 
-    return None, NumberType.NONE
+def clean_series_query(name: str) -> str:
+    """
+    Turn a folder or series name into a search query.
+
+    Removes bracketed release tags such as "[Author]", "(2019)" or
+    "【汉化】", trailing volume ranges like "Vol.01-12", and collapses
+    separators.
+
+    Examples:
+        >>> clean_series_query("[Oda Eiichiro] One Piece (Digital) Vol.01-100")
+        'One Piece'
+    """
+    s = re.sub(r"[\[【(（{].*?[\]】)）}]", " ", name)
+    # Dots only act as separators in names without spaces ("One.Piece", not "Dr. Stone")
+    s = re.sub(r"[_.]+" if " " not in s.strip() else r"_+", " ", s)
+    s = re.sub(r"\b(vol|v|chap|ch)\.?\s*\d+(\s*[-~]\s*\d+)?\b", " ", s, flags=re.IGNORECASE)
+    s = re.sub(r"\s+", " ", s).strip(" -~")
+    return s or name.strip()